@@ -24,8 +24,33 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(prog="PLSimulator", description="Train an agent to propulsively land.")
     parser.add_argument('-env', choices=env_choices, help="choose the environment", default='earth')
     parser.add_argument('-agent', choices=agent_choices, help="choose the agent", default='manual')
-    parser.add_argument('-load', action='store', dest='load', help="load model checkpoint (n or latest)", default="")
-    parser.add_argument('-save_video', action='store_true', dest='save', help="store run as a gif", default=False)
+    parser.add_argument('-load', action='store', dest='load', help="load checkpoint (n, last or best)", default="")
+    parser.add_argument('-resume', action='store_true', help="resume training from the last checkpoint", default=False)
+    parser.add_argument('-export', action='store_true', help="export the loaded policy to a .npz file", default=False)
+    parser.add_argument('-save_video', action='store_true', dest='save', help="store run as a video", default=False)
+    parser.add_argument('-video_format', choices=['gif', 'mp4'], help="choose the video format", default='gif')
+    parser.add_argument('-fps', type=int, help="frame rate cap, 0 runs uncapped", default=30)
+    parser.add_argument('-headless', action='store_true', help="render off-screen without a display", default=False)
+    parser.add_argument('-record', action='store_true', help="record every step of the run", default=False)
+    parser.add_argument('-replay', action='store', help="replay a recorded episode directory", default="")
+    parser.add_argument('-plot', action='store', help="plot the metrics of a training run directory", default="")
+    parser.add_argument('-seed', type=int, help="seed for the starting conditions", default=None)
+    parser.add_argument('-action_repeat', type=int, help="physics ticks to apply each action for", default=None)
+    parser.add_argument('-evaluate', type=int, help="evaluate the agent over N seeded episodes", default=0)
+    parser.add_argument('-tournament', type=int, help="score every checkpoint not scored on N episodes", default=0)
+    parser.add_argument('-processes', type=int, help="number of processes to evaluate with", default=1)
+    parser.add_argument('-batch', type=int, help="environments stepped in lockstep when evaluating", default=16)
+    parser.add_argument('-train_config', help="JSON file with the training profile", default="")
+    parser.add_argument('-iterations', type=int, help="number of training iterations", default=None)
+    parser.add_argument('-num_workers', type=int, help="number of rollout workers", default=None)
+    parser.add_argument('-envs_per_worker', type=int, help="number of environments per rollout worker", default=None)
+    parser.add_argument('-rollout_fragment_length', type=int, help="steps per rollout fragment", default=None)
+    parser.add_argument('-train_batch_size', type=int, help="steps per training batch", default=None)
+    parser.add_argument('-framework', choices=['tf', 'tf2', 'torch'], help="choose the framework", default=None)
+    parser.add_argument('-vector_env', action='store_true', help="step each worker's environments with NumPy",
+                        default=None)
+    parser.add_argument('-threads', type=int, help="threads per process for tensor operations", default=None)
+    parser.add_argument('-profile', action='store_true', help="profile the run into the model directory", default=False)
     parser.add_argument('-verbose', action='store_true', dest='verbose', help="show extra output", default=False)
     parser.add_argument('-version', action='version', version='%(prog)s@dev')
 
@@ -37,4 +62,7 @@ if __name__ == '__main__':
         Log.verboseness = 1
 
     # Process arguments and run module
-    app.main(args)
+    if args.profile:
+        app.profile(args)
+    else:
+        app.main(args)
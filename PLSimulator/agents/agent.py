@@ -1,8 +1,8 @@
 import os
 from abc import abstractmethod
-import matplotlib.pyplot as plt
 
 from PLSimulator.constants import MODEL_DATA_DIRECTORY
+from PLSimulator.agents.manifest import Manifest
 
 
 class Agent:
@@ -27,6 +27,16 @@ class Agent:
         if not os.path.exists(self._model_dir):
             os.makedirs(self._model_dir)
 
+        # Whether actions are sampled, evaluation turns this off so episodes are reproducible
+        self.explore = True
+
+        # Directory of the training run that checkpoints are saved into, and of the checkpoint last loaded
+        self._run_dir = None
+        self._loaded = None
+
+        # Index of the checkpoints with their metrics and scores
+        self.manifest = Manifest(os.path.join(self._model_dir, 'manifest.json'))
+
     @abstractmethod
     def reset(self) -> None:
         '''
@@ -63,13 +73,25 @@ class Agent:
                 action: Action of the agent in environment
         '''
 
+    def step_batch(self, states: list) -> list:
+        '''
+            Get the actions of the agent given the states of several environments
+
+            Parameters:
+                states: State of each environment
+
+            Returns
+                actions: Action of the agent in each environment
+        '''
+        return [self.step(state) for state in states]
+
     @abstractmethod
-    def save(self) -> None:
+    def save(self, metrics: dict = None) -> None:
         '''
             Save the model to a local folder
 
             Parameters:
-                None
+                metrics: Training metrics to index the checkpoint with
 
             Returns
                 None
@@ -87,9 +109,9 @@ class Agent:
                 None
         '''
 
-    def clear(self, dir: str = '') -> None:
+    def wait(self) -> None:
         '''
-            Clear the saved model from local storage
+            Wait for any checkpoints still being written
 
             Parameters:
                 None
@@ -97,31 +119,101 @@ class Agent:
             Returns
                 None
         '''
-        path = os.path.join(self._model_dir, dir)
-        for f in os.listdir(path):
-            a = os.path.join(path, f)
-            if os.path.isdir(a):
-                self.clear(a)
-                os.removedirs(a)
-            else:
-                os.remove(a)
 
-    def graph(self, episode_data: dict) -> None:
+    def new_run(self) -> str:
         '''
-            Save the episode data as a graph
+            Create the directory of a new training run, numbered after the highest existing run
 
             Parameters:
-                episode_data: The data from the training run
+                None
 
-            Returns:
+            Returns
+                path: The directory of the run
+        '''
+        # Number after the highest run, so pruning old runs never reuses a number
+        runs = [int(r[4:]) for r in os.listdir(self._model_dir) if r.startswith("run_") and r[4:].isdigit()]
+        self._run_dir = os.path.join(self._model_dir, f"run_{max(runs, default=0) + 1:03d}")
+        os.makedirs(self._run_dir)
+        return self._run_dir
+
+    def checkpoints(self, filename: str = None) -> list:
+        '''
+            Find the complete checkpoints of every training run
+
+            Parameters:
+                filename: Only include checkpoints containing this file
+
+            Returns
+                checkpoints: Directory of each checkpoint, by run and then by iteration
+        '''
+        # Checkpoints saved before runs were versioned sit directly in the model directory
+        dirs = [self._model_dir] + [
+            os.path.join(self._model_dir, r) for r in sorted(os.listdir(self._model_dir)) if r.startswith("run_")
+        ]
+
+        checkpoints = []
+        for d in dirs:
+            for c in sorted(os.listdir(d)):
+                path = os.path.join(d, c)
+
+                # A checkpoint is complete once its main file has been written
+                if c.startswith("checkpoint_") and os.path.exists(os.path.join(path, f"checkpoint-{int(c[11:])}")):
+                    if filename is None or os.path.exists(os.path.join(path, filename)):
+                        checkpoints.append(path)
+
+        return checkpoints
+
+    def find_checkpoint(self, number, filename: str = None) -> str:
+        '''
+            Find a checkpoint by number, from the latest run that has it
+
+            Parameters:
+                number: Iteration of the checkpoint, 'last' for the latest checkpoint,
+                        'best' for the best checkpoint in the manifest or the directory of a checkpoint
+                filename: Only include checkpoints containing this file
+
+            Returns
+                path: The directory of the checkpoint
+        '''
+        if os.sep in str(number) and os.path.isdir(number):
+            return number
+
+        # Resolve through the manifest, only checkpoints saved before it existed need the directory listed
+        path = self.manifest.best() if number == 'best' else self.manifest.last() if number == 'last' else None
+        if path is not None and (filename is None or os.path.exists(os.path.join(path, filename))):
+            return path
+        if number == 'best':
+            raise FileNotFoundError(f"No checkpoint indexed in '{self.manifest.path}'.")
+
+        checkpoints = self.checkpoints(filename)
+        if number != 'last':
+            checkpoints = [c for c in checkpoints if os.path.basename(c) == f"checkpoint_{str(number).zfill(6)}"]
+
+        if not checkpoints:
+            raise FileNotFoundError(f"No checkpoint '{number}' found in '{self._model_dir}'.")
+
+        return checkpoints[-1]
+
+    def fingerprint(self) -> str:
+        '''
+            Identify the loaded model, so results of evaluating it can be cached
+
+            Parameters:
+                None
+
+            Returns
+                fingerprint: Hash of the loaded checkpoint, or None if nothing has been loaded
+        '''
+        return None
+
+    @abstractmethod
+    def export(self) -> str:
+        '''
+            Export the loaded policy so it can be run without the training framework
+
+            Parameters:
                 None
+
+            Returns
+                path: The file the policy was written to
         '''
-        plt.plot(figsize=(5, 2.7), layout='constrained')
-        plt.plot([e['min'] for e in episode_data], label='min')
-        plt.plot([e['mean'] for e in episode_data], label='mean')
-        plt.plot([e['max'] for e in episode_data], label='max')
-        plt.xlabel('episode')
-        plt.ylabel('reward')
-        plt.title("Rewards per episode")
-        plt.legend()
-        plt.savefig(os.path.join(self._model_dir, 'rewards_per_episode.png'))
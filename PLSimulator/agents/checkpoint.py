@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CheckpointWriter:
+    '''
+        CheckpointWriter
+
+        This writes checkpoints on a background thread, one at a time and in order,
+        so training carries on while the previous checkpoint is written to disk.
+    '''
+
+    def __init__(self) -> None:
+        '''
+            Start the background thread
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending = []
+
+    def submit(self, write: callable, *args) -> None:
+        '''
+            Queue a write, raising the error of any earlier write that failed
+
+            Parameters:
+                write: Function that writes the checkpoint
+                args: Arguments to call the function with
+
+            Returns:
+                None
+        '''
+        for future in [f for f in self._pending if f.done()]:
+            self._pending.remove(future)
+            future.result()
+
+        self._pending.append(self._executor.submit(write, *args))
+
+    def wait(self) -> None:
+        '''
+            Block until every queued write has finished
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
@@ -0,0 +1,158 @@
+import os
+import json
+
+
+def setting(seed: int, episodes: int) -> str:
+    # Scores are only comparable between evaluations of the same seeded episodes
+    return f"seed={seed},episodes={episodes}"
+
+
+class Manifest:
+    '''
+        Manifest
+
+        This indexes the checkpoints of an agent with their training metrics and evaluation scores,
+        so the last or best checkpoint is found without listing the model directory.
+    '''
+
+    def __init__(self, path: str) -> None:
+        '''
+            Load the index if it has been written before
+
+            Parameters:
+                path: The JSON file the index is stored in, checkpoints are stored relative to its directory
+
+            Returns:
+                None
+        '''
+        self.path = path
+        self._dir = os.path.dirname(path)
+        self.entries = {}
+
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def key(self, checkpoint: str) -> str:
+        return os.path.relpath(checkpoint, self._dir)
+
+    def add(self, checkpoint: str, iteration: int, metrics: dict = None) -> None:
+        '''
+            Index a checkpoint that has been written
+
+            Parameters:
+                checkpoint: Directory of the checkpoint
+                iteration: Training iteration the checkpoint was taken at
+                metrics: Training metrics at the time of the checkpoint
+
+            Returns:
+                None
+        '''
+        self.entries[self.key(checkpoint)] = {'iteration': iteration, 'metrics': metrics or {}, 'scores': {}}
+
+    def score(self, checkpoint: str, scores: dict, seed: int, episodes: int) -> bool:
+        '''
+            Store the evaluation scores of an indexed checkpoint
+
+            Parameters:
+                checkpoint: Directory of the checkpoint
+                scores: Summary of the evaluation
+                seed: Seed of the first evaluated episode
+                episodes: Number of evaluated episodes
+
+            Returns:
+                indexed: Whether the checkpoint is in the index
+        '''
+        entry = self.entries.get(self.key(checkpoint))
+        if entry is not None:
+            entry['scores'][setting(seed, episodes)] = scores
+        return entry is not None
+
+    def unscored(self, seed: int, episodes: int) -> list:
+        '''
+            Find the checkpoints that have not been evaluated on the same seeded episodes
+
+            Parameters:
+                seed: Seed of the first evaluated episode
+                episodes: Number of evaluated episodes
+
+            Returns:
+                checkpoints: Directory of each checkpoint without scores for these episodes
+        '''
+        key = setting(seed, episodes)
+        return [os.path.join(self._dir, k) for k in sorted(self.entries) if key not in self.entries[k]['scores']]
+
+    def last(self) -> str:
+        '''
+            Find the latest checkpoint of the latest run
+
+            Parameters:
+                None
+
+            Returns:
+                checkpoint: Directory of the checkpoint, or None if nothing is indexed
+        '''
+        # Run and checkpoint directories are zero padded, so their names sort in order
+        return os.path.join(self._dir, max(self.entries)) if self.entries else None
+
+    def best(self, seed: int = None, episodes: int = None) -> str:
+        '''
+            Find the checkpoint with the highest success rate and then mean reward when evaluated,
+            or the highest mean training reward if no checkpoint has been evaluated
+
+            Parameters:
+                seed: Seed of the first evaluated episode of the scores to compare
+                episodes: Number of evaluated episodes of the scores to compare,
+                          by default the seed and episodes the most checkpoints were evaluated on
+
+            Returns:
+                checkpoint: Directory of the checkpoint, or None if nothing is indexed
+        '''
+        if seed is None or episodes is None:
+            key = self.common_setting()
+        else:
+            key = setting(seed, episodes)
+
+        scored = {k: e['scores'][key] for k, e in self.entries.items() if key in e['scores']}
+        if scored:
+            key = max(scored, key=lambda k: (scored[k]['success_rate'], scored[k]['reward_mean']))
+        elif self.entries:
+            # Iterations where no episode ended have no mean reward
+            rewards = {k: e['metrics'].get('reward_mean') for k, e in self.entries.items()}
+            key = max(rewards, key=lambda k: float('-inf') if rewards[k] is None else rewards[k])
+        else:
+            return None
+
+        return os.path.join(self._dir, key)
+
+    def common_setting(self) -> str:
+        '''
+            Find the evaluation setting the most checkpoints were scored on
+
+            Parameters:
+                None
+
+            Returns:
+                setting: Seed and number of episodes of the evaluation, or None if nothing has been evaluated
+        '''
+        # Ties go to the evaluation over more episodes
+        counts = {}
+        for entry in self.entries.values():
+            for key, scores in entry['scores'].items():
+                counts[key] = (counts.get(key, (0,))[0] + 1, scores['episodes'])
+        return max(counts, key=counts.get) if counts else None
+
+    def save(self) -> None:
+        '''
+            Write the index to disk
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        # Write to a temporary file first so an interrupted save keeps the old index
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(self.entries, f, indent=4)
+        os.replace(self.path + '.tmp', self.path)
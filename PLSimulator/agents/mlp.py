@@ -0,0 +1,153 @@
+import os
+import numpy as np
+
+from PLSimulator.agents.agent import Agent
+from PLSimulator.agents.results import fingerprint
+from PLSimulator.constants import TRAIN_CONFIG
+from PLSimulator.log import Log
+
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0),
+    'linear': lambda x: x,
+}
+
+
+def policy_layers(weights: dict) -> list:
+    '''
+        Pick the layers of the policy network out of the weights of an RLlib fully connected model
+
+        Parameters:
+            weights: Weights of the policy by variable name, as returned by policy.get_weights()
+
+        Returns:
+            layers: Weight matrix of shape (inputs, outputs) and bias of each layer, from input to output
+    '''
+    # The value branch is only used in training, and sorting the names puts the layers in order
+    names = sorted(n for n in weights if 'value' not in n)
+
+    kernels = [n for n in names if n.endswith('kernel') or n.endswith('kernel:0') or n.endswith('weight')]
+    biases = [n for n in names if n.endswith('bias') or n.endswith('bias:0')]
+    if not kernels or len(kernels) != len(biases):
+        raise ValueError(f"Could not find the layers of the policy in the weights {names}.")
+
+    layers = []
+    for kernel, bias in zip(kernels, biases):
+        w = np.asarray(weights[kernel], dtype=np.float32)
+
+        # Torch stores weights as (outputs, inputs)
+        if kernel.endswith('weight'):
+            w = w.T
+        layers.append((w, np.asarray(weights[bias], dtype=np.float32)))
+
+    return layers
+
+
+def export_policy(
+        path: str,
+        layers: list,
+        low: np.ndarray,
+        high: np.ndarray,
+        activation: str = 'tanh',
+        normalize_actions: bool = True,
+        action_mode: str = 'box') -> str:
+    '''
+        Write the policy network to a small .npz file
+
+        Parameters:
+            path: The file to write
+            layers: Weight matrix and bias of each layer, as returned by policy_layers
+            low: Lower bound of the action space
+            high: Upper bound of the action space
+            activation: Name of the activation of the hidden layers in ACTIVATIONS
+            normalize_actions: Whether the policy outputs actions in [-1, 1] that are scaled to the bounds
+            action_mode: Action mode of the environment the policy was trained in
+
+        Returns:
+            path: The file written
+    '''
+    arrays = {}
+    for i, (w, b) in enumerate(layers):
+        arrays[f'w{i}'], arrays[f'b{i}'] = w, b
+
+    np.savez(
+        path,
+        layers=len(layers),
+        low=np.asarray(low, dtype=np.float32),
+        high=np.asarray(high, dtype=np.float32),
+        activation=activation,
+        normalize_actions=normalize_actions,
+        action_mode=action_mode,
+        **arrays
+    )
+    return path
+
+
+class NumpyAgent(Agent):
+    '''
+        NumpyAgent
+
+        This agent runs a policy exported from a trained PPO agent with a NumPy forward pass,
+        so controlling the lander needs neither Ray nor a deep learning framework.
+    '''
+
+    def __init__(self, env_config, train_config=None):
+        # Policies are exported next to the checkpoints of the PPO agent
+        super().__init__("ppo", env_config["name"])
+        self.train_config = dict(TRAIN_CONFIG, **(train_config or {}))
+        self._fingerprint = None
+
+    def train(self):
+        Log.error("The NumPy agent only runs exported policies, train the PPO agent instead.")
+
+    def step(self, state: list) -> list:
+        return self.step_batch([state])[0]
+
+    def step_batch(self, states: list) -> list:
+        x = np.asarray(states, dtype=np.float32)
+        for w, b in self._layers[:-1]:
+            x = self._activation(x @ w + b)
+        w, b = self._layers[-1]
+        x = x @ w + b
+
+        # Discrete policies output logits, of the eight actions or of the two choices of each flag
+        if self._action_mode == 'discrete':
+            return list(np.argmax(x, axis=1))
+        if self._action_mode == 'multibinary':
+            return list(np.argmax(x.reshape(len(x), 3, 2), axis=2))
+
+        # The first half of the outputs is the mean of the action distribution, the deterministic action
+        action = x[:, :x.shape[1] // 2]
+        if self._normalize_actions:
+            action = self._low + (np.clip(action, -1, 1) + 1) * 0.5 * (self._high - self._low)
+        return list(np.clip(action, self._low, self._high))
+
+    def save(self, metrics: dict = None):
+        Log.error("The NumPy agent only runs exported policies, save the PPO agent instead.")
+
+    def export(self, path: str = None) -> str:
+        Log.error("The NumPy agent already runs an exported policy, export the PPO agent instead.")
+
+    def load(self, number):
+        # Accept either a path to an exported policy or a checkpoint number of the PPO agent
+        if str(number).endswith('.npz'):
+            path = number
+        else:
+            path = os.path.join(self.find_checkpoint(number, 'policy.npz'), 'policy.npz')
+
+        # The policy exported with a checkpoint stands for the checkpoint, any other file only for itself
+        path = os.path.abspath(path)
+        self._loaded = os.path.dirname(path) if os.path.basename(path) == 'policy.npz' else path
+
+        with np.load(path) as data:
+            self._layers = [(data[f'w{i}'], data[f'b{i}']) for i in range(int(data['layers']))]
+            self._low, self._high = data['low'], data['high']
+            self._activation = ACTIVATIONS[str(data['activation'])]
+            self._normalize_actions = bool(data['normalize_actions'])
+            self._action_mode = str(data['action_mode']) if 'action_mode' in data else 'box'
+
+        self._fingerprint = fingerprint(path)
+
+    def fingerprint(self) -> str:
+        return self._fingerprint
@@ -1,7 +1,34 @@
 import os
-from ray.rllib.agents import ppo
+import pickle
 
 from PLSimulator.agents.agent import Agent
+from PLSimulator.constants import TRAIN_CONFIG
+from PLSimulator.agents.results import fingerprint
+from PLSimulator.agents.checkpoint import CheckpointWriter
+from PLSimulator.agents.mlp import export_policy, policy_layers
+from PLSimulator.environments.recorder import OUTCOMES
+
+
+def outcome_callbacks() -> type:
+    '''
+        Build the callbacks that report how each training episode ended as custom metrics
+
+        Parameters:
+            None
+
+        Returns:
+            callbacks: Callbacks class for the trainer config
+    '''
+    from ray.rllib.agents.callbacks import DefaultCallbacks
+
+    class OutcomeCallbacks(DefaultCallbacks):
+        def on_episode_end(self, *, worker, base_env, policies, episode, env_index=None, **kwargs):
+            # RLlib averages custom metrics, giving the fraction of episodes with each outcome
+            outcome = (episode.last_info_for() or {}).get("outcome", "none")
+            for o in OUTCOMES:
+                episode.custom_metrics[o] = float(outcome == o)
+
+    return OutcomeCallbacks
 
 
 class PPOAgent(Agent):
@@ -11,34 +38,134 @@ class PPOAgent(Agent):
         This agent uses a PPO model for training and controlling the agent
     '''
 
-    def __init__(self, env_config):
+    def __init__(self, env_config, train_config=TRAIN_CONFIG):
+        # Ray is only imported once a PPO agent is created
+        from ray.rllib.agents import ppo
+        from ray.tune.registry import register_env
+        from PLSimulator.environments.wrappers import make_environment
+
         super().__init__("ppo", env_config["name"])
+        self.train_config = dict(TRAIN_CONFIG, **train_config)
+        self._action_mode = env_config["agent"].get("action_mode", "box")
 
         config = ppo.DEFAULT_CONFIG.copy()
         config["log_level"] = "WARN"
-        config["num_workers"] = 1
-        config["num_sgd_iter"] = 10
-        config["sgd_minibatch_size"] = 250
         config["env_config"] = env_config
+        config["callbacks"] = outcome_callbacks()
+        for key in [
+                "num_workers", "num_envs_per_worker", "rollout_fragment_length",
+                "train_batch_size", "num_sgd_iter", "sgd_minibatch_size", "framework"]:
+            config[key] = self.train_config[key]
+
+        # Limit the threads each process uses for tensor operations, 0 keeps the library default
+        threads = self.train_config["num_threads"]
+        if threads > 0:
+            for key in ["tf_session_args", "local_tf_session_args"]:
+                config[key] = dict(
+                    config[key],
+                    intra_op_parallelism_threads=threads,
+                    inter_op_parallelism_threads=threads
+                )
+            config["extra_python_environs_for_driver"] = {"OMP_NUM_THREADS": str(threads)}
+            config["extra_python_environs_for_worker"] = {"OMP_NUM_THREADS": str(threads)}
+
+        # Step all the environments of a rollout worker at once with NumPy instead of one after another
+        if self.train_config["vector_env"]:
+            from PLSimulator.environments.vector import VectorEnvironment
+
+            if env_config["agent"].get("action_repeat", 1) > 1:
+                raise ValueError("The vector environment does not repeat actions, set action_repeat to 1.")
+            num_envs = self.train_config["num_envs_per_worker"]
+            register_env(env_config["name"], lambda config: VectorEnvironment(config, num_envs=num_envs))
+        else:
+            register_env(env_config["name"], lambda config: make_environment(config))
         self.model = ppo.PPOTrainer(config, env_config["name"])
+        self._checkpoint = None
+        self._fingerprint = None
+        self._writer = CheckpointWriter()
 
     def train(self):
         return self.model.train()
 
     def step(self, state: list) -> list:
-        return self.model.compute_single_action(state)
+        return self.model.compute_single_action(state, explore=self.explore)
 
-    def save(self):
-        self.model.save(self._model_dir)
+    def step_batch(self, states: list) -> list:
+        actions = self.model.compute_actions(dict(enumerate(states)), explore=self.explore)
+        return [actions[i] for i in range(len(states))]
 
-    def load(self, number):
-        if number == 'last':
-            number = max([int(c[11:]) for c in os.listdir(self._model_dir) if c.startswith("checkpoint")])
-
-        self.model.restore(
-            os.path.join(
-                self._model_dir,
-                f"checkpoint_{str(number).zfill(6)}",
-                f"checkpoint-{number}"
-            )
+    def save(self, metrics: dict = None):
+        if self._run_dir is None:
+            self.new_run()
+
+        # Only take the state of the trainer and the policy weights in memory here,
+        # pickling and writing them to disk happens in the background
+        number = self.model.iteration
+        path = os.path.join(self._run_dir, f"checkpoint_{str(number).zfill(6)}")
+        policy = self.model.get_policy()
+        self._writer.submit(
+            self._write,
+            path,
+            number,
+            self.model.__getstate__(),
+            self.model.get_state(),
+            self._policy_args(policy),
+            metrics
         )
+        return path
+
+    def _write(self, path: str, number: int, state: dict, metadata: dict, policy_args: tuple, metrics: dict) -> None:
+        os.makedirs(path, exist_ok=True)
+        export_policy(os.path.join(path, 'policy.npz'), *policy_args)
+
+        # Write the same files as the trainer's own save, so restore reads them back,
+        # with the checkpoint last under a temporary name so it only appears once complete
+        checkpoint = os.path.join(path, f"checkpoint-{number}")
+        with open(checkpoint + ".tune_metadata", 'wb') as f:
+            pickle.dump(dict(metadata, saved_as_dict=False), f)
+        with open(checkpoint + ".tmp", 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(checkpoint + ".tmp", checkpoint)
+
+        # Only index the checkpoint once it is complete, writes run one at a time so the index is not shared
+        self.manifest.add(path, number, metrics)
+        self.manifest.save()
+
+    def wait(self):
+        self._writer.wait()
+
+    def _policy_args(self, policy) -> tuple:
+        # Discrete action spaces have no bounds, their policies output logits instead
+        space = policy.action_space
+        return (
+            policy_layers(policy.get_weights()),
+            getattr(space, 'low', [0, 0, 0]),
+            getattr(space, 'high', [1, 1, 1]),
+            policy.config["model"]["fcnet_activation"],
+            policy.config.get("normalize_actions", False),
+            self._action_mode
+        )
+
+    def export(self, path: str = None) -> str:
+        if path is None:
+            path = os.path.join(os.path.dirname(self._checkpoint), 'policy.npz')
+
+        return export_policy(path, *self._policy_args(self.model.get_policy()))
+
+    def load(self, number):
+        path = self.find_checkpoint(number)
+        number = int(os.path.basename(path)[11:])
+
+        self._checkpoint = os.path.join(path, f"checkpoint-{number}")
+        self._fingerprint = None
+        self._loaded = path
+        self.model.restore(self._checkpoint)
+
+        # Carry on saving into the run the checkpoint came from
+        run_dir = os.path.dirname(path)
+        self._run_dir = run_dir if os.path.basename(run_dir).startswith("run_") else None
+
+    def fingerprint(self) -> str:
+        if self._checkpoint is not None and self._fingerprint is None:
+            self._fingerprint = fingerprint(self._checkpoint)
+        return self._fingerprint
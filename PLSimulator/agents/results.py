@@ -0,0 +1,121 @@
+import os
+import json
+import hashlib
+
+
+def fingerprint(path: str) -> str:
+    '''
+        Hash the contents of a checkpoint file or directory
+
+        Parameters:
+            path: The checkpoint file or directory
+
+        Returns:
+            fingerprint: Hex digest that changes whenever any file of the checkpoint changes
+    '''
+    files = [path]
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, f) for root, _, names in os.walk(path) for f in names)
+
+    digest = hashlib.sha1()
+    for f in files:
+        digest.update(os.path.relpath(f, path).encode())
+        with open(f, 'rb') as data:
+            for chunk in iter(lambda: data.read(1 << 20), b''):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def config_fingerprint(config: dict) -> str:
+    '''
+        Hash an environment config
+
+        Parameters:
+            config: The parameters used to initialise the environment
+
+        Returns:
+            fingerprint: Hex digest of the config
+    '''
+    return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache:
+    '''
+        ResultCache
+
+        This stores the result of evaluating a checkpoint on a seeded episode,
+        so evaluating an unchanged checkpoint again is read from disk.
+    '''
+
+    def __init__(self, path: str) -> None:
+        '''
+            Load any results already stored
+
+            Parameters:
+                path: The JSON file the results are stored in
+
+            Returns:
+                None
+        '''
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+
+        if os.path.exists(path):
+            with open(path) as f:
+                self._results = json.load(f)
+
+    @staticmethod
+    def key(checkpoint: str, config: dict, seed: int) -> str:
+        return f"{checkpoint}/{config_fingerprint(config)}/{seed}"
+
+    def get(self, checkpoint: str, config: dict, seed: int) -> dict:
+        '''
+            Look up the result of an episode
+
+            Parameters:
+                checkpoint: Fingerprint of the checkpoint evaluated
+                config: The parameters used to initialise the environment
+                seed: Seed of the episode
+
+            Returns:
+                result: The stored result, or None if the episode has not been evaluated
+        '''
+        result = self._results.get(self.key(checkpoint, config, seed))
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, checkpoint: str, config: dict, seed: int, result: dict) -> None:
+        '''
+            Store the result of an episode
+
+            Parameters:
+                checkpoint: Fingerprint of the checkpoint evaluated
+                config: The parameters used to initialise the environment
+                seed: Seed of the episode
+                result: Result of the episode
+
+            Returns:
+                None
+        '''
+        self._results[self.key(checkpoint, config, seed)] = result
+
+    def save(self) -> None:
+        '''
+            Write the results to disk
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        # Write to a temporary file first so an interrupted save keeps the old results
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(self._results, f)
+        os.replace(self.path + '.tmp', self.path)
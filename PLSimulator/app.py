@@ -1,32 +1,56 @@
-import ray
-import pygame
-from ray.tune.registry import register_env
+import os
+import json
+import time
+import multiprocessing
+import numpy as np
 
 from PLSimulator.log import Log
+from PLSimulator.profiling import PhaseTimer
+from PLSimulator.metrics import MetricsLog, iteration_metrics, plot_metrics
 from PLSimulator.agents.agent import Agent
+from PLSimulator.agents.manifest import setting
 from PLSimulator.agents.ppo import PPOAgent
-from PLSimulator.constants import ENV_CONFIG, MODEL_DATA_DIRECTORY
+from PLSimulator.agents.mlp import NumpyAgent
+from PLSimulator.agents.results import ResultCache
+from PLSimulator.constants import ENV_CONFIG, MODEL_DATA_DIRECTORY, TRAIN_CONFIG
 from PLSimulator.environments.environment import Environment
+from PLSimulator.environments.wrappers import make_environment
+from PLSimulator.environments.actions import encode_action
+from PLSimulator.environments.recorder import TrajectoryRecorder, load_episode, OUTCOMES
 
 
 AGENT_OBJCECTS_DICT = {
     'manual': Agent,
     'ppo': PPOAgent,
+    'numpy': NumpyAgent,
 }
 
 
-def manual(environment: Environment, fps: int = 30, save_video: bool = False) -> None:
+def manual(
+        environment: Environment,
+        fps: int = 30,
+        save_video: bool = False,
+        video_format: str = 'gif',
+        recorder: TrajectoryRecorder = None,
+        seed: int = None) -> None:
     '''
         Let the user control the landing in the environment given
 
         Parameters:
             environment: The environment to run the game in
-            fps: Frame rate for rendering the environment
+            fps: Frame rate for rendering the environment, or 0 to run uncapped
+            save_video: Whether to save simulation as a video
+            video_format: Format of the saved video ('gif' or 'mp4')
+            recorder: Recorder to write every step of the episode to
+            seed: Seed for the starting conditions of the episode
 
         Returns:
             None
     '''
-    state = environment.reset()
+    import pygame
+    from PLSimulator.entities.assets import rotation_cache_stats
+
+    state = environment.reset(seed=seed)
     done, quit = False, False
 
     action = [0, 0, 0]
@@ -35,6 +59,10 @@ def manual(environment: Environment, fps: int = 30, save_video: bool = False) ->
     # Render environment once so pygame events can be collected
     environment.render()
 
+    # Encode frames into a video as they are rendered
+    if save_video:
+        environment.start_video(MODEL_DATA_DIRECTORY, fps if fps > 0 else 30, video_format)
+
     Log.info("User has started the simulation.")
     while not done and not quit:
         # Process pygame events
@@ -62,129 +90,573 @@ def manual(environment: Environment, fps: int = 30, save_video: bool = False) ->
         for i in range(len(keys)):
             action[i] = 1 if keys[i] else 0
 
-        # Update the environment with the action
-        state, reward, done, info = environment.step(action)
+        # Update the environment with the key presses, in the space of its action mode
+        state, reward, done, info = environment.step(encode_action(environment.action_mode, action))
+
+        # Record the step along with the flags applied and where the pencil ended up
+        if recorder is not None:
+            recorder.record(
+                state, info["action"], reward, info, environment.pencil.position + [environment.pencil.angle]
+            )
 
-        # Render environment at N fps
+        # Render environment, capped at N fps unless running uncapped
+        environment.render(save_video=save_video)
         if fps > 0:
-            environment.render(save_video=save_video)
             environment.clock.tick(fps)
 
         Log.info(f"State: {state}, Action: {action}, Reward: {reward}, Done: {done}, Info: {info}.")
     Log.info(f"Total reward: {environment.total_reward}.")
 
-    # Save frames as a video
+    # Finish the video and recording
     if save_video:
-        Log.info(f"Saving simulation as gif in '{MODEL_DATA_DIRECTORY}'.")
-        environment.save_video(MODEL_DATA_DIRECTORY, fps)
-
+        Log.info(f"Saved simulation as '{environment.save_video()}'.")
+    if recorder is not None:
+        Log.info(f"Recorded simulation to '{recorder.end_episode()}'.")
+
+    stats = rotation_cache_stats()
+    Log.info(f"Rotation cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+             f"{stats['images']} images using {stats['bytes'] / 1024 / 1024:.1f}MB.")
+    if environment.timer is not None:
+        log_phases(environment.timer)
     Log.success("User has finished the simulation.")
 
 
-def simulate(agent: Agent, environment: Environment, fps: int = 30, save_video: bool = False) -> None:
+def simulate(
+        agent: Agent,
+        environment: Environment,
+        fps: int = 30,
+        save_video: bool = False,
+        video_format: str = 'gif',
+        headless: bool = False,
+        recorder: TrajectoryRecorder = None,
+        seed: int = None) -> None:
     '''
         Let the agent control the landing in the environment given
 
         Parameters:
             agent: The agent to put in the environment
             environment: The environment to run the game in
-            fps: Frame rate for rendering the environment
+            fps: Frame rate for rendering the environment, or 0 to run uncapped
             save_video: Whether to save simulation as a video
+            video_format: Format of the saved video ('gif' or 'mp4')
+            headless: Whether to render off-screen instead of to a window
+            recorder: Recorder to write every step of the episode to
+            seed: Seed for the starting conditions of the episode
 
         Returns:
             None
     '''
-    state = environment.reset()
+    state = environment.reset(seed=seed)
     done = False
 
+    # Headless runs only render when frames are needed for a video
+    mode = 'rgb_array' if headless else 'human'
+    render = save_video or not headless
+
     # Render environment once to create window
-    if fps > 0:
-        environment.render()
+    if render:
+        environment.render(mode)
+
+    # Encode frames into a video as they are rendered
+    if save_video:
+        environment.start_video(agent._model_dir, fps if fps > 0 else 30, video_format)
 
     Log.info("Agent has started the simulation.")
     while not done:
         # Receive action from agent
+        start = time.perf_counter()
         action = agent.step(state)
+        if environment.timer is not None:
+            environment.timer.record("agent", time.perf_counter() - start)
 
         # Update the environment with the action
         state, reward, done, info = environment.step(action)
 
-        # Render environment at N fps
-        if fps > 0:
-            environment.render(save_video=save_video)
-            environment.clock.tick(fps)
+        # Record the step along with the flags applied and where the pencil ended up
+        if recorder is not None:
+            recorder.record(
+                state, info["action"], reward, info, environment.pencil.position + [environment.pencil.angle]
+            )
+
+        # Render environment, capped at N fps unless running uncapped
+        if render:
+            environment.render(mode, save_video=save_video)
+            if fps > 0:
+                environment.clock.tick(fps)
 
         Log.info(f"State: {state}, Action: {action}, Reward: {reward}, Done: {done}, Info: {info}.")
     Log.info(f"Total reward: {environment.total_reward}.")
 
-    # Save frames as a video
+    # Finish the video and recording
     if save_video:
-        Log.info(f"Saving simulation as gif in '{agent._model_dir}'.")
-        environment.save_video(agent._model_dir, fps)
-
+        Log.info(f"Saved simulation as '{environment.save_video()}'.")
+    if recorder is not None:
+        Log.info(f"Recorded simulation to '{recorder.end_episode()}'.")
+
+    if render:
+        from PLSimulator.entities.assets import rotation_cache_stats
+
+        stats = rotation_cache_stats()
+        Log.info(f"Rotation cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+                 f"{stats['images']} images using {stats['bytes'] / 1024 / 1024:.1f}MB.")
+    if environment.timer is not None:
+        log_phases(environment.timer)
     Log.success("Agent has finished the simulation.")
 
 
-def train(agent: Agent, episode_length: int = 1) -> Agent:
+def log_phases(timer: PhaseTimer) -> None:
+    '''
+        Log how the time of each step was split between its phases
+
+        Parameters:
+            timer: The timer the phases were recorded with
+
+        Returns:
+            None
+    '''
+    for phase, stats in sorted(timer.summary().items(), key=lambda item: -item[1]['seconds']):
+        Log.info(f"Phase {phase}: {stats['share']:.1%} of the time, {stats['count']} calls, "
+                 f"mean {stats['mean_us']:.1f}us, p50 < {stats['p50_us']}us, p99 < {stats['p99_us']}us.")
+
+
+def run_episodes(agent: Agent, environments: list, seeds: list) -> tuple:
+    '''
+        Run seeded episodes without rendering, stepping every environment in lockstep
+        so the agent chooses the actions of all of them in one batch
+
+        Parameters:
+            agent: The agent to put in the environments
+            environments: The environments to run the episodes in, each starting the next seed when it finishes
+            seeds: Seed for the starting conditions of each episode
+
+        Returns:
+            results: Outcome, total reward, fuel left and physics ticks of each episode, in the order they finished
+            inference: Number of batches, actions and seconds spent choosing actions
+    '''
+    pending = list(reversed(seeds))
+    active = {}
+    for i, environment in enumerate(environments[:len(pending)]):
+        s = pending.pop()
+        active[i] = [s, environment.reset(seed=s), 0]
+
+    results = []
+    inference = {'batches': 0, 'actions': 0, 'seconds': 0.0}
+    while active:
+        indices = list(active)
+
+        # Receive the actions of every running episode at once
+        start = time.perf_counter()
+        actions = agent.step_batch([active[i][1] for i in indices])
+        inference['seconds'] += time.perf_counter() - start
+        inference['batches'] += 1
+        inference['actions'] += len(indices)
+
+        for i, action in zip(indices, actions):
+            environment = environments[i]
+            state, reward, done, info = environment.step(action)
+            active[i][1] = state
+            active[i][2] += info['ticks']
+
+            if done:
+                results.append({
+                    'seed': active[i][0],
+                    'outcome': info['outcome'],
+                    'reward': float(environment.total_reward),
+                    'fuel': environment.pencil.fuel_mass,
+                    'steps': active[i][2],
+                })
+
+                # Start the next episode in its place
+                if pending:
+                    s = pending.pop()
+                    active[i] = [s, environment.reset(seed=s), 0]
+                else:
+                    del active[i]
+
+    return results, inference
+
+
+# Agent and environments of an evaluation worker process, loaded once by _init_worker
+_WORKER = {}
+
+
+def _init_worker(agent_class: type, env_config: dict, train_config: dict, load: str, batch: int) -> None:
+    # Every worker process loads its own copy of the policy
+    agent = agent_class(env_config, train_config)
+    agent.load(load)
+    agent.explore = False
+
+    _WORKER['agent'] = agent
+    _WORKER['environments'] = [make_environment(env_config) for _ in range(batch)]
+
+
+def _evaluate_seeds(seeds: list) -> tuple:
+    start = time.perf_counter()
+    results, inference = run_episodes(_WORKER['agent'], _WORKER['environments'], seeds)
+    return results, inference, os.getpid(), time.perf_counter() - start
+
+
+def evaluate(
+        agent: Agent,
+        env_config: dict,
+        episodes: int = 100,
+        seed: int = 0,
+        workers: int = 1,
+        batch: int = 16) -> list:
+    '''
+        Evaluate the agent on a fixed set of seeded episodes, reusing cached results of the loaded checkpoint
+
+        Parameters:
+            agent: The agent to evaluate
+            env_config: The parameters used to initialise the environment
+            episodes: Number of episodes to run
+            seed: Seed of the first episode, the others follow on from it
+            workers: Number of processes to spread the episodes over, each loading the checkpoint the agent has loaded
+            batch: Number of environments each process steps in lockstep
+
+        Returns:
+            results: Result of each episode
+    '''
+    if batch < 1:
+        raise ValueError(f"Evaluation needs at least one environment per batch, not {batch}.")
+
+    # Actions must not be sampled for a checkpoint and seed to always give the same result
+    agent.explore = False
+    checkpoint = agent.fingerprint()
+    cache = ResultCache(os.path.join(agent._model_dir, 'results.json'))
+
+    results = {}
+    for s in range(seed, seed + episodes):
+        result = cache.get(checkpoint, env_config, s) if checkpoint is not None else None
+        if result is not None:
+            results[s] = result
+    pending = [s for s in range(seed, seed + episodes) if s not in results]
+
+    # Worker processes can only run the policy if it was loaded from a checkpoint, not just trained
+    if workers > 1 and len(pending) > batch and agent._loaded is None:
+        Log.info("The policy was not loaded from a checkpoint for the worker processes to load, "
+                 "evaluating it in this process.")
+        workers = 1
+
+    start = time.perf_counter()
+    busy = {}
+    inference = {'batches': 0, 'actions': 0, 'seconds': 0.0}
+    if workers > 1 and len(pending) > batch:
+        # Spawn fresh processes rather than forking one that has already started ray,
+        # each builds its agent without rollout workers as it only computes actions
+        context = multiprocessing.get_context('spawn')
+        chunks = [pending[i:i + batch] for i in range(0, len(pending), batch)]
+        initargs = (type(agent), env_config, dict(agent.train_config, num_workers=0), agent._loaded, batch)
+        with context.Pool(workers, _init_worker, initargs) as pool:
+            for chunk_results, chunk_inference, pid, seconds in pool.imap_unordered(_evaluate_seeds, chunks):
+                results.update((r['seed'], r) for r in chunk_results)
+                inference = {k: inference[k] + chunk_inference[k] for k in inference}
+                busy[pid] = busy.get(pid, 0) + seconds
+    elif pending:
+        environments = [make_environment(env_config) for _ in range(min(batch, len(pending)))]
+        pending_results, inference = run_episodes(agent, environments, pending)
+        results.update((r['seed'], r) for r in pending_results)
+        busy[os.getpid()] = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+
+    if checkpoint is not None:
+        for s in pending:
+            cache.put(checkpoint, env_config, s, results[s])
+        cache.save()
+
+    results = [results[s] for s in range(seed, seed + episodes)]
+    Log.info(f"Result cache: {cache.hits} hits, {cache.misses} misses.")
+    if pending:
+        Log.info(f"Ran {len(pending)} episodes in {elapsed:.1f}s, {len(pending) / elapsed:.1f} episodes/sec.")
+        for pid, seconds in sorted(busy.items()):
+            Log.info(f"Worker {pid}: {seconds / elapsed:.0%} utilisation.")
+        Log.info(f"Inference: {inference['seconds'] / inference['batches'] * 1000:.2f}ms per batch "
+                 f"of {inference['actions'] / inference['batches']:.1f} actions on average.")
+
+    summary = summarise(results)
+    Log.info(f"Success rate: {summary['success_rate']:.1%}, failure rate: {summary['failure_rate']:.1%} "
+             f"over {episodes} episodes.")
+    Log.info(f"Reward min: {summary['reward_min']:.1f}, median: {summary['reward_median']:.1f}, "
+             f"mean: {summary['reward_mean']:.1f}, max: {summary['reward_max']:.1f}.")
+    Log.info(f"Mean fuel left at landing: {summary['fuel_landed']:.2f}, "
+             f"mean length: {summary['steps_mean']:.1f} steps.")
+
+    # Score the loaded checkpoint in the manifest
+    if agent._loaded is not None and agent.manifest.score(agent._loaded, summary, seed, episodes):
+        agent.manifest.save()
+    return results
+
+
+def _score_checkpoint(args: tuple) -> tuple:
+    agent, env_config, checkpoint, episodes, seed, batch = args
+
+    # Worker processes are given the agent class and training profile and build their own copy,
+    # without rollout workers as it only computes actions
+    if isinstance(agent, tuple):
+        agent_class, train_config = agent
+        agent = agent_class(env_config, dict(train_config, num_workers=0))
+    agent.load(checkpoint)
+    agent.explore = False
+
+    environments = [make_environment(env_config) for _ in range(min(batch, episodes))]
+    results, _ = run_episodes(agent, environments, list(range(seed, seed + episodes)))
+    return checkpoint, summarise(results)
+
+
+def tournament(
+        agent: Agent,
+        env_config: dict,
+        episodes: int = 100,
+        seed: int = 0,
+        workers: int = 1,
+        batch: int = 16) -> str:
+    '''
+        Evaluate every checkpoint without scores on these seeded episodes and store the scores in the manifest
+
+        Parameters:
+            agent: The agent whose checkpoints are evaluated
+            env_config: The parameters used to initialise the environment
+            episodes: Number of episodes to run for each checkpoint
+            seed: Seed of the first episode, the others follow on from it
+            workers: Number of processes evaluating checkpoints at the same time
+            batch: Number of environments each process steps in lockstep
+
+        Returns:
+            best: Directory of the best checkpoint
+    '''
+    if batch < 1:
+        raise ValueError(f"Evaluation needs at least one environment per batch, not {batch}.")
+
+    manifest = agent.manifest
+
+    # Index checkpoints saved before the manifest existed, without training metrics
+    for checkpoint in agent.checkpoints():
+        if manifest.key(checkpoint) not in manifest.entries:
+            manifest.add(checkpoint, int(os.path.basename(checkpoint)[11:]))
+
+    # Checkpoints scored on other seeds or numbers of episodes are scored again so all are compared alike
+    pending = manifest.unscored(seed, episodes)
+    Log.info(f"Scoring {len(pending)} of {len(manifest.entries)} checkpoints over {episodes} episodes each.")
+
+    def record(checkpoint: str, summary: dict) -> None:
+        # Save after every checkpoint so an interrupted tournament keeps its scores
+        manifest.score(checkpoint, summary, seed, episodes)
+        manifest.save()
+        Log.info(f"'{manifest.key(checkpoint)}': success rate {summary['success_rate']:.1%}, "
+                 f"mean reward {summary['reward_mean']:.1f}.")
+
+    start = time.perf_counter()
+    if workers > 1 and len(pending) > 1:
+        # Spawn fresh processes rather than forking one that has already started ray
+        context = multiprocessing.get_context('spawn')
+        jobs = [((type(agent), agent.train_config), env_config, c, episodes, seed, batch) for c in pending]
+        with context.Pool(min(workers, len(pending))) as pool:
+            for checkpoint, summary in pool.imap_unordered(_score_checkpoint, jobs):
+                record(checkpoint, summary)
+    else:
+        for c in pending:
+            record(*_score_checkpoint((agent, env_config, c, episodes, seed, batch)))
+    manifest.save()
+
+    if pending:
+        Log.info(f"Scored {len(pending)} checkpoints in {time.perf_counter() - start:.1f}s.")
+
+    best = manifest.best(seed, episodes)
+    if best is not None:
+        scores = manifest.entries[manifest.key(best)]['scores'][setting(seed, episodes)]
+        Log.info(f"Best checkpoint '{manifest.key(best)}' with a success rate of {scores['success_rate']:.1%}.")
+    return best
+
+
+def summarise(results: list) -> dict:
+    '''
+        Aggregate the results of evaluated episodes
+
+        Parameters:
+            results: Result of each episode, as returned by episode
+
+        Returns:
+            summary: Outcome rates, reward distribution, mean fuel left on successful landings and mean length
+    '''
+    rewards = np.array([r['reward'] for r in results])
+    landed = [r['fuel'] for r in results if r['outcome'] == 'success']
+
+    return {
+        'episodes': len(results),
+        'success_rate': len(landed) / len(results),
+        'failure_rate': sum(r['outcome'] == 'failed' for r in results) / len(results),
+        'reward_min': float(rewards.min()),
+        'reward_median': float(np.median(rewards)),
+        'reward_mean': float(rewards.mean()),
+        'reward_max': float(rewards.max()),
+        'fuel_landed': float(np.mean(landed)) if landed else 0.0,
+        'steps_mean': float(np.mean([r['steps'] for r in results])),
+    }
+
+
+def replay(
+        path: str,
+        fps: int = 30,
+        save_video: bool = False,
+        video_format: str = 'gif',
+        headless: bool = False) -> None:
+    '''
+        Render a recorded episode again without running the agent or the physics
+
+        Parameters:
+            path: The directory of the recorded episode
+            fps: Frame rate for rendering the environment, or 0 to run uncapped
+            save_video: Whether to save the replay as a video, stored next to the recording
+            video_format: Format of the saved video ('gif' or 'mp4')
+            headless: Whether to render off-screen instead of to a window
+
+        Returns:
+            None
+    '''
+    import pygame
+
+    # Build the environment from the config the episode was recorded with
+    episode = load_episode(path)
+    environment = make_environment(episode['config'])
+    mode = 'rgb_array' if headless else 'human'
+
+    if save_video:
+        environment.start_video(path, fps if fps > 0 else 30, video_format)
+
+    Log.info(f"Replaying {len(episode['pose'])} steps from '{path}'.")
+    for pose, action in zip(episode['pose'], episode['action']):
+        # Place the pencil where it was recorded
+        environment.pencil.position = [float(pose[0]), float(pose[1])]
+        environment.pencil.angle = float(pose[2])
+        environment.pencil.update_entities(action.tolist())
+
+        environment.render(mode, save_video=save_video)
+        if fps > 0:
+            environment.clock.tick(fps)
+
+        # Keep the window responsive
+        if not headless:
+            pygame.event.pump()
+
+    if len(episode['outcome']) > 0:
+        Log.info(f"Outcome: {OUTCOMES[episode['outcome'][-1]]}, Total reward: {float(episode['reward'].sum()):.1f}.")
+
+    if save_video:
+        Log.info(f"Saved replay as '{environment.save_video()}'.")
+
+    Log.success("Finished the replay.")
+
+
+def train_profile(path: str = "", **overrides) -> dict:
+    '''
+        Build the training profile from the defaults, an optional JSON file and any overrides
+
+        Parameters:
+            path: JSON file with any of the keys of TRAIN_CONFIG
+            overrides: Values that take precedence over the file, None values are ignored
+
+        Returns:
+            profile: Complete training profile
+    '''
+    profile = dict(TRAIN_CONFIG)
+
+    if path:
+        with open(path) as f:
+            profile.update(json.load(f))
+
+    profile.update({k: v for k, v in overrides.items() if v is not None})
+
+    unknown = set(profile) - set(TRAIN_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown training settings {sorted(unknown)}, choose from {list(TRAIN_CONFIG)}.")
+
+    return profile
+
+
+def train(agent: Agent, episode_length: int = 1, resume: bool = False) -> Agent:
     '''
         Train the agent in the environment given
 
         Parameters:
             agent: The agent to train in the environment
             episode_length: Number of episodes to train agent
+            resume: Whether to continue from the latest checkpoint instead of starting a new run
 
         Returns:
             None
     '''
     # Set up Ray
     Log.info("Loading Ray...")
+    import ray
     ray.init(ignore_reinit_error=True)
 
-    # Set up agent
-    Log.info("Clearing previous training...")
-    agent.clear()
+    # Set up agent, keeping the checkpoints of previous runs
+    if resume:
+        try:
+            agent.load('last')
+            Log.info(f"Resuming training from '{agent._checkpoint}'.")
+        except FileNotFoundError as e:
+            Log.info(f"{e} Nothing to resume, training from scratch.")
 
-    # Set up episode history
-    episodes = []
+    # Start a new run, unless resuming one saved since runs were versioned
+    if agent._run_dir is None:
+        Log.info(f"Starting a new training run in '{agent.new_run()}'.")
+
+    # Stream the metrics of every iteration to the run directory as they arrive
+    metrics_log = MetricsLog(os.path.join(agent._run_dir, 'metrics.jsonl'))
     save_frequency = max(1, round(episode_length / 10))
+    total_steps, total_time = 0, 0.0
 
     # Start agent training
-    Log.info(f"Starting training for {episode_length} episodes...")
+    Log.info(f"Starting training for {episode_length} episodes, streaming metrics to '{metrics_log.path}'...")
     for n in range(1, episode_length + 1):
         # Train the agent for this episode
-        result = agent.train()
-
-        # Store results
-        episode = {
-            'min': round(result['episode_reward_min'], 1),
-            'mean': round(result['episode_reward_mean'], 1),
-            'max': round(result['episode_reward_max'], 1),
-        }
-        episodes.append(episode)
-        Log.info(f"Episode {n} -> {episode}.")
-
-        # Save current model to local folder
+        metrics = iteration_metrics(agent.train())
+        metrics_log.write(metrics)
+
+        # Rewards are None when no episode ended this iteration
+        rewards = {k: metrics[f'reward_{k}'] for k in ['min', 'mean', 'max']}
+        episode = {k: None if r is None else round(r, 1) for k, r in rewards.items()}
+        Log.info(f"Episode {n} -> {episode}, outcomes {metrics['outcomes']}.")
+
+        # Report how quickly environment steps are sampled and learnt from
+        total_steps, total_time = total_steps + metrics['steps'], total_time + metrics['seconds']
+        Log.info(f"Throughput {metrics['steps_per_sec']:.0f} steps/sec, "
+                 f"sample {metrics['sample_ms']:.0f}ms, learn {metrics['learn_ms']:.0f}ms.")
+
+        # Save current model to local folder, indexed with its metrics
         if n % save_frequency == 0 or n == 1:
-            agent.save()
+            agent.save(metrics)
             Log.info(f"Saving episode {n}.")
 
     # Save last model if not saved already
     if episode_length % 10 != 0:
-        agent.save()
+        agent.save(metrics)
         Log.info(f"Saving episode {n}.")
 
-    # Generate analysis graphs
-    Log.info("Generating graphs for training.")
-    agent.graph(episodes)
+    metrics_log.close()
+
+    # Finish writing checkpoints in the background
+    agent.wait()
+
+    # Record the throughput of this profile, so runs with different settings can be compared
+    profile = getattr(agent, 'train_config', {})
+    throughput = dict(profile, steps=total_steps, seconds=round(total_time, 2), steps_per_sec=total_steps / total_time)
+    with open(os.path.join(agent._model_dir, 'throughput.json'), 'w') as f:
+        json.dump(throughput, f, indent=4)
+    Log.info(f"Trained on {total_steps} steps at {throughput['steps_per_sec']:.0f} steps/sec "
+             f"with {profile.get('num_workers')} workers of {profile.get('num_envs_per_worker')} environments.")
+
+    Log.info(f"Plot the metrics of this run with '-plot {agent._run_dir}'.")
 
     # Shutting down Ray
     Log.info("Closing Ray...")
     ray.shutdown()
 
 
-def main(args: dict) -> None:
+def profile(args: dict) -> None:
     '''
-        Process the arguments and determine the top-level functions to execute
+        Run the application under cProfile with phase timers on, and write a sorted report into the model directory
 
         Parameters:
             args: Dict of arguments input from the user
@@ -192,25 +664,106 @@ def main(args: dict) -> None:
         Returns:
             None
     '''
+    import pstats
+    import cProfile
+
+    profiler = cProfile.Profile()
+    model_dir = profiler.runcall(main, args)
+
+    path = os.path.join(model_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.txt")
+    with open(path, 'w') as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats('cumulative').print_stats(50)
+        stats.sort_stats('tottime').print_stats(50)
+    Log.info(f"Saved profile to '{path}'.")
+
+
+def main(args: dict) -> str:
+    '''
+        Process the arguments and determine the top-level functions to execute
+
+        Parameters:
+            args: Dict of arguments input from the user
+
+        Returns:
+            model_dir: The directory the run stored its output in
+    '''
     agent = AGENT_OBJCECTS_DICT[args.agent]
-    environment = Environment
+    environment = make_environment
     env_config = ENV_CONFIG[args.env]
-
-    if args.agent == 'manual':
+    model_dir = MODEL_DATA_DIRECTORY
+
+    # Apply each action for several physics ticks
+    if args.action_repeat is not None:
+        env_config = dict(env_config, agent=dict(env_config["agent"], action_repeat=args.action_repeat))
+
+    # Time the phases of every step when profiling
+    if args.profile:
+        env_config = dict(env_config, profile=dict(env_config.get("profile", {}), phases=True))
+
+    # Use the SDL dummy video driver so nothing needs a display
+    if args.headless:
+        if args.agent == 'manual' and not args.replay:
+            Log.error("Manual mode needs a display, run it without the headless flag.")
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    if args.plot:
+        Log.info("Plotting the metrics of a training run.")
+        try:
+            Log.info(f"Saved graphs as '{plot_metrics(args.plot)}'.")
+        except (OSError, ValueError) as e:
+            Log.error(str(e))
+    elif args.replay:
+        Log.info("Replaying a recorded episode.")
+        replay(args.replay, fps=args.fps, save_video=args.save, video_format=args.video_format, headless=args.headless)
+    elif args.agent == 'manual':
         Log.info("Rendering the environment in manual mode.")
-        manual(environment(env_config), save_video=args.save)
+        recorder = None
+        if args.record:
+            recorder = TrajectoryRecorder(os.path.join(MODEL_DATA_DIRECTORY, 'recordings'), args.env, env_config)
+        manual(
+            environment(env_config),
+            fps=args.fps,
+            save_video=args.save,
+            video_format=args.video_format,
+            recorder=recorder,
+            seed=args.seed
+        )
     else:
-        Log.info("Registering RL environment.")
-        register_env(env_config["name"], lambda config: environment(config))
-        Log.success("Finished registering RL environment.")
+        if args.agent == 'numpy' and args.load == "":
+            Log.error("The numpy agent runs an exported policy, choose one with the load flag.")
+        if args.batch < 1:
+            Log.error(f"Evaluation needs at least one environment per batch, not {args.batch}.")
 
         Log.info("Initialise RL agent.")
-        agent = agent(env_config)
+        try:
+            train_config = train_profile(
+                args.train_config,
+                iterations=args.iterations,
+                num_workers=args.num_workers,
+                num_envs_per_worker=args.envs_per_worker,
+                rollout_fragment_length=args.rollout_fragment_length,
+                train_batch_size=args.train_batch_size,
+                framework=args.framework,
+                num_threads=args.threads,
+                vector_env=args.vector_env
+            )
+        except (OSError, ValueError) as e:
+            Log.error(str(e))
+        agent = agent(env_config, train_config)
+        model_dir = agent._model_dir
         Log.success("Finished initialising RL agent.")
 
-        if args.load == "":
+        if args.tournament > 0:
+            Log.info("Score every checkpoint of the RL agent.")
+            best = tournament(agent, env_config, args.tournament, seed=args.seed or 0, workers=args.processes,
+                              batch=args.batch)
+            args.load = best or 'best'
+            Log.success("Finished scoring the checkpoints.")
+
+        if (args.load == "" or args.resume) and args.tournament == 0:
             Log.info("Train RL agent.")
-            train(agent, episode_length=100)
+            train(agent, episode_length=train_config['iterations'], resume=args.resume)
             Log.success("Finished training RL agent.")
         else:
             Log.info("Load RL agent.")
@@ -220,7 +773,36 @@ def main(args: dict) -> None:
                 Log.error(str(e))
             Log.success("Finished loading RL agent.")
 
-        Log.info("Rendering the environment in agent mode.")
-        simulate(agent, environment(env_config), save_video=args.save)
+        if args.export:
+            Log.info(f"Exported the policy to '{agent.export()}'.")
+
+        if args.evaluate > 0:
+            Log.info(f"Evaluating the agent over {args.evaluate} episodes.")
+            evaluate(
+                agent,
+                env_config,
+                args.evaluate,
+                seed=args.seed or 0,
+                workers=args.processes,
+                batch=args.batch
+            )
+            Log.success("Finished evaluating the agent.")
+        else:
+            recorder = None
+            if args.record:
+                recorder = TrajectoryRecorder(os.path.join(agent._model_dir, 'recordings'), args.env, env_config)
+
+            Log.info("Rendering the environment in agent mode.")
+            simulate(
+                agent,
+                environment(env_config),
+                fps=args.fps,
+                save_video=args.save,
+                video_format=args.video_format,
+                headless=args.headless,
+                recorder=recorder,
+                seed=args.seed
+            )
 
     Log.info("Exiting application.")
+    return model_dir
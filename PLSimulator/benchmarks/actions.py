@@ -0,0 +1,67 @@
+import sys
+import ray
+import argparse
+import numpy as np
+
+from PLSimulator.agents.ppo import PPOAgent
+from PLSimulator.constants import ENV_CONFIG, TRAIN_CONFIG
+from PLSimulator.environments.actions import ACTION_MODES
+
+
+def samples_to_first_landing(env_config: dict, train_config: dict, max_iterations: int = 50) -> tuple:
+    '''
+        Train PPO until an episode ends in a successful landing
+
+        Parameters:
+            env_config: The parameters used to initialise the environment
+            train_config: The training profile of the agent
+            max_iterations: Number of iterations to give up after
+
+        Returns:
+            steps: Environment steps sampled up to the first landing, or None if none landed
+            seconds: Time spent training
+    '''
+    agent = PPOAgent(env_config, train_config)
+
+    steps, seconds = None, 0.0
+    for _ in range(max_iterations):
+        result = agent.train()
+        seconds += result['time_this_iter_s']
+
+        # Outcome callbacks report the fraction of episodes that landed each iteration
+        if result.get('custom_metrics', {}).get('success_mean', 0) > 0:
+            steps = result['timesteps_total']
+            break
+
+    agent.model.stop()
+    return steps, seconds
+
+
+if __name__ == '__main__':
+    '''
+        This script compares how many samples PPO needs to first land the pencil with each action mode.
+    '''
+    parser = argparse.ArgumentParser(prog="PLSimulator.benchmarks.actions")
+    parser.add_argument('-env', choices=list(ENV_CONFIG.keys()), help="choose the environment", default='earth')
+    parser.add_argument('-modes', choices=ACTION_MODES, nargs='*', help="action modes to train", default=ACTION_MODES)
+    parser.add_argument('-iterations', type=int, help="iterations to give up after", default=50)
+    parser.add_argument('-repeats', type=int, help="training runs for each mode", default=3)
+    parser.add_argument('-num_workers', type=int, help="number of rollout workers", default=TRAIN_CONFIG['num_workers'])
+    args = parser.parse_args(sys.argv[1:])
+
+    ray.init(ignore_reinit_error=True)
+    train_config = dict(TRAIN_CONFIG, num_workers=args.num_workers)
+
+    print(f"{'mode':>12} {'landed':>7} {'median steps':>13} {'median secs':>12}")
+    for mode in args.modes:
+        env_config = dict(ENV_CONFIG[args.env], agent=dict(ENV_CONFIG[args.env]['agent'], action_mode=mode))
+        runs = [samples_to_first_landing(env_config, train_config, args.iterations) for _ in range(args.repeats)]
+
+        # Runs that never landed count as needing every sample they were given
+        limit = args.iterations * train_config['train_batch_size']
+        steps = [s if s is not None else limit for s, _ in runs]
+        landed = sum(s is not None for s, _ in runs)
+        print(f"{mode:>12} {landed:>4}/{len(runs):<2} {np.median(steps):13.0f} "
+              f"{np.median([t for _, t in runs]):12.1f}")
+
+    ray.shutdown()
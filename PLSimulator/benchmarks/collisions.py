@@ -0,0 +1,84 @@
+import sys
+import time
+import random
+import argparse
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.environment import Environment
+
+
+def steps_per_second(config: dict, steps: int = 2000) -> float:
+    '''
+        Measure how many environment steps can be run per second
+
+        Parameters:
+            config: The parameters used to initialise the environment
+            steps: Number of steps to time
+
+        Returns:
+            rate: Steps per second
+    '''
+    environment = Environment(config)
+    environment.reset()
+    random.seed(0)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        action = [random.randint(0, 1), random.randint(0, 1), random.randint(0, 1)]
+        _, _, done, _ = environment.step(action)
+        if done:
+            environment.reset()
+
+    return steps / (time.perf_counter() - start)
+
+
+def random_obstacles(count: int, seed: int = 0) -> list:
+    '''
+        Generate debris scattered over the window, away from the landing pad
+
+        Parameters:
+            count: Number of obstacles to generate
+            seed: Seed for the random placement
+
+        Returns:
+            definitions: List of obstacle definitions for the physics config
+    '''
+    rng = random.Random(seed)
+    return [
+        {
+            'type': 'debris',
+            'size': (8, 8),
+            'position': (rng.choice([rng.uniform(0, 0.3), rng.uniform(0.7, 1)]), rng.uniform(0.1, 0.9)),
+            'angle': rng.uniform(0, 90),
+        }
+        for _ in range(count)
+    ]
+
+
+if __name__ == '__main__':
+    '''
+        This script compares the step rate of each collision backend and broadphase.
+    '''
+    parser = argparse.ArgumentParser(prog="PLSimulator.benchmarks.collisions")
+    parser.add_argument('-env', choices=list(ENV_CONFIG.keys()), help="choose the environment", default='earth')
+    parser.add_argument('-steps', type=int, help="number of steps to time", default=2000)
+    parser.add_argument('-obstacles', type=int, nargs='*', help="obstacle counts to time", default=[0, 10, 100, 400])
+    args = parser.parse_args(sys.argv[1:])
+
+    rates = {}
+    for method in ['shapely', 'obb']:
+        config = dict(ENV_CONFIG[args.env])
+        config['physics'] = dict(config['physics'], collision=method, broadphase='none')
+        rates[method] = steps_per_second(config, args.steps)
+        print(f"{method:>8}: {rates[method]:10.1f} steps/sec")
+
+    print(f" speedup: {rates['obb'] / rates['shapely']:10.2f}x")
+
+    print(f"{'obstacles':>9} {'grid':>10} {'none':>10}")
+    for count in args.obstacles:
+        rates = {}
+        for broadphase in ['grid', 'none']:
+            config = dict(ENV_CONFIG[args.env])
+            config['physics'] = dict(config['physics'], entities=random_obstacles(count), broadphase=broadphase)
+            rates[broadphase] = steps_per_second(config, args.steps)
+        print(f"{count:>9} {rates['grid']:10.1f} {rates['none']:10.1f}")
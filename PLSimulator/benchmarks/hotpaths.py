@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.environment import Environment
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'baseline.json')
+
+ACTIONS = [[1, 0, 0], [1, 1, 0], [0, 0, 1], [1, 0, 1], [0, 0, 0]]
+
+
+def hot_paths(environment: Environment) -> dict:
+    '''
+        Build a function for each hot path of the environment, each call doing one unit of work
+
+        Parameters:
+            environment: The environment to exercise, already reset
+
+        Returns:
+            paths: Function for each hot path by name
+    '''
+    pencil, pad = environment.pencil, environment.pad
+    counter = [0]
+
+    def step():
+        counter[0] += 1
+        _, _, done, _ = environment.step(ACTIONS[counter[0] % len(ACTIONS)])
+        if done:
+            environment.reset()
+
+    def step_collisions():
+        info = {"outcome": "none", "legs": 0}
+        environment.step_collisions(info)
+
+    return {
+        'step': step,
+        'step_collisions': step_collisions,
+        'polygon': lambda: pencil.polygon(pencil.position),
+        'collides_with': lambda: pencil.collides_with(pad),
+        'reset': environment.reset,
+        'state': environment.state,
+        'render': lambda: environment.render('rgb_array'),
+    }
+
+
+def measure(function, seconds: float = 0.5, samples: int = 200) -> dict:
+    '''
+        Time a function and measure the memory it allocates
+
+        Parameters:
+            function: Function to call repeatedly
+            seconds: Minimum time to spend timing the function
+            samples: Number of calls traced for allocations
+
+        Returns:
+            result: Calls per second and mean peak bytes allocated by each call
+    '''
+    # Warm up caches before timing
+    for _ in range(10):
+        function()
+
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(100):
+            function()
+        calls += 100
+    rate = calls / (time.perf_counter() - start)
+
+    # Tracing slows every allocation, so it runs separately from the timing.
+    # Clearing the traces also resets the peak, which works on Python 3.6 unlike reset_peak
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(samples):
+        tracemalloc.clear_traces()
+        function()
+        allocated += tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'rate': round(rate, 1), 'bytes': round(allocated / samples)}
+
+
+def run(envs: list, seconds: float = 0.5) -> dict:
+    '''
+        Measure every hot path for each environment config
+
+        Parameters:
+            envs: Names of the configs in ENV_CONFIG
+            seconds: Minimum time to spend timing each hot path
+
+        Returns:
+            results: Result of each hot path by config and name
+    '''
+    results = {}
+    for env in envs:
+        environment = Environment(ENV_CONFIG[env])
+        environment.reset(seed=0)
+        results[env] = {name: measure(f, seconds) for name, f in hot_paths(environment).items()}
+    return results
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list:
+    '''
+        Find the hot paths that are slower than the baseline by more than the threshold
+
+        Parameters:
+            results: Result of each hot path by config and name
+            baseline: Baseline in the same layout as the results
+            threshold: Fraction of the baseline rate that may be lost before it counts as a regression
+
+        Returns:
+            regressions: Config, name, rate and baseline rate of each regressed hot path
+    '''
+    slow = []
+    for env, paths in results.items():
+        for name, result in paths.items():
+            expected = baseline.get(env, {}).get(name)
+            if expected is not None and result['rate'] < expected['rate'] * (1 - threshold):
+                slow.append((env, name, result['rate'], expected['rate']))
+    return slow
+
+
+if __name__ == '__main__':
+    '''
+        This script times the hot paths of the environment and compares them to the stored baseline.
+    '''
+    parser = argparse.ArgumentParser(prog="PLSimulator.benchmarks.hotpaths")
+    parser.add_argument('-env', choices=list(ENV_CONFIG.keys()), nargs='*', help="choose the environments",
+                        default=list(ENV_CONFIG.keys()))
+    parser.add_argument('-seconds', type=float, help="minimum time to time each hot path", default=0.5)
+    parser.add_argument('-check', action='store_true', help="fail if slower than the baseline", default=False)
+    parser.add_argument('-threshold', type=float, help="fraction of the baseline rate allowed to be lost",
+                        default=0.25)
+    parser.add_argument('-save', action='store_true', help="store the results as the new baseline", default=False)
+    args = parser.parse_args(sys.argv[1:])
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    results = run(args.env, args.seconds)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+
+    print(f"{'env':>6} {'hot path':>16} {'calls/sec':>12} {'baseline':>12} {'bytes/call':>11}")
+    for env, paths in results.items():
+        for name, result in paths.items():
+            expected = baseline.get(env, {}).get(name, {}).get('rate', float('nan'))
+            print(f"{env:>6} {name:>16} {result['rate']:12.1f} {expected:12.1f} {result['bytes']:11d}")
+
+    if args.save:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"Saved baseline to '{BASELINE_FILE}'.")
+
+    if args.check:
+        slow = regressions(results, baseline, args.threshold)
+        for env, name, rate, expected in slow:
+            print(f"Regression: {env} {name} runs at {rate:.1f} calls/sec, below {expected:.1f} by more than "
+                  f"{args.threshold:.0%}.")
+        sys.exit(1 if slow else 0)
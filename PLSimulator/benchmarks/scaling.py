@@ -0,0 +1,59 @@
+import sys
+import ray
+import argparse
+from ray.tune.registry import register_env
+
+from PLSimulator.agents.ppo import PPOAgent
+from PLSimulator.constants import ENV_CONFIG, TRAIN_CONFIG
+from PLSimulator.environments.environment import Environment
+
+
+def training_throughput(env_config: dict, train_config: dict, iterations: int = 3) -> float:
+    '''
+        Measure how many environment steps per second PPO trains on
+
+        Parameters:
+            env_config: The parameters used to initialise the environment
+            train_config: The training profile of the agent
+            iterations: Number of training iterations to time, after one warm up iteration
+
+        Returns:
+            rate: Steps per second
+    '''
+    agent = PPOAgent(env_config, train_config)
+    agent.train()
+
+    steps, seconds = 0, 0.0
+    for _ in range(iterations):
+        result = agent.train()
+        steps += result['timesteps_this_iter']
+        seconds += result['time_this_iter_s']
+
+    agent.model.stop()
+    return steps / seconds
+
+
+if __name__ == '__main__':
+    '''
+        This script measures how training throughput scales with the number of rollout workers.
+    '''
+    parser = argparse.ArgumentParser(prog="PLSimulator.benchmarks.scaling")
+    parser.add_argument('-env', choices=list(ENV_CONFIG.keys()), help="choose the environment", default='earth')
+    parser.add_argument('-iterations', type=int, help="number of iterations to time", default=3)
+    parser.add_argument('-workers', type=int, nargs='*', help="rollout worker counts to time", default=[1, 2, 4, 8])
+    parser.add_argument('-envs_per_worker', type=int, help="number of environments per worker", default=1)
+    args = parser.parse_args(sys.argv[1:])
+
+    env_config = ENV_CONFIG[args.env]
+    register_env(env_config["name"], lambda config: Environment(config))
+    ray.init(ignore_reinit_error=True)
+
+    print(f"{'workers':>7} {'steps/sec':>10} {'speedup':>8}")
+    base = None
+    for workers in args.workers:
+        train_config = dict(TRAIN_CONFIG, num_workers=workers, num_envs_per_worker=args.envs_per_worker)
+        rate = training_throughput(env_config, train_config, args.iterations)
+        base = base or rate
+        print(f"{workers:>7} {rate:10.0f} {rate / base:7.2f}x")
+
+    ray.shutdown()
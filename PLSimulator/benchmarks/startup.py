@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+from PLSimulator.agents.mlp import export_policy
+
+
+# Modules that only the code paths using them should import
+HEAVY_MODULES = ['ray', 'tensorflow', 'torch', 'matplotlib', 'imageio', 'PIL', 'pygame']
+
+# Report the heavy modules that were imported when the interpreter exits
+_REPORT = (
+    "import atexit, sys\n"
+    "atexit.register(lambda: sys.stderr.write('HEAVY ' + ' '.join(sorted(\n"
+    "    m for m in {heavy} if m in sys.modules)) + '\\n'))\n"
+)
+
+
+def startup_time(args: list, repeats: int = 5) -> tuple:
+    '''
+        Measure how long python -m PLSimulator takes to run with the arguments given
+
+        Parameters:
+            args: Command line arguments to run with
+            repeats: Number of runs, the fastest is reported
+
+        Returns:
+            seconds: Wall time of the fastest run
+            heavy: Heavy modules imported by the run
+    '''
+    code = _REPORT.format(heavy=HEAVY_MODULES) + (
+        "import runpy\n"
+        f"sys.argv = ['PLSimulator'] + {args}\n"
+        "runpy.run_module('PLSimulator', run_name='__main__')\n"
+    )
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy')
+
+    best, heavy = float('inf'), []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run = subprocess.run([sys.executable, '-W', 'ignore', '-c', code], env=env,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        best = min(best, time.perf_counter() - start)
+
+        lines = [line for line in run.stderr.splitlines() if line.startswith('HEAVY')]
+        heavy = lines[-1].split()[1:] if lines else ['?']
+
+    return best, heavy
+
+
+if __name__ == '__main__':
+    '''
+        This script measures the startup time of each command line mode.
+    '''
+    parser = argparse.ArgumentParser(prog="PLSimulator.benchmarks.startup")
+    parser.add_argument('-repeats', type=int, help="number of runs of each mode", default=5)
+    parser.add_argument('-limit', type=float, help="fail if a mode takes longer in seconds", default=None)
+    args = parser.parse_args(sys.argv[1:])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # A small random policy lets the numpy agent run without a trained checkpoint
+        rng = np.random.default_rng(0)
+        policy = export_policy(
+            os.path.join(tmp_dir, 'policy.npz'),
+            [(rng.normal(size=(5, 64)), np.zeros(64)), (rng.normal(size=(64, 6)), np.zeros(6))],
+            [0, 0, 0],
+            [1, 1, 1]
+        )
+
+        modes = {
+            'version': ['-version'],
+            'help': ['-h'],
+            'numpy': ['-agent', 'numpy', '-load', policy, '-headless', '-fps', '0'],
+        }
+
+        failed = False
+        print(f"{'mode':>8} {'seconds':>8}  heavy modules")
+        for mode, mode_args in modes.items():
+            seconds, heavy = startup_time(mode_args, args.repeats)
+            print(f"{mode:>8} {seconds:8.3f}  {' '.join(heavy) or '-'}")
+            failed |= args.limit is not None and seconds > args.limit
+
+    sys.exit(1 if failed else 0)
@@ -16,6 +16,9 @@ ENV_CONFIG = {
             'max_pos': (0.5, 0.1),
             'min_vel': (0, 0),
             'max_vel': (0, 0),
+            'seed': None,
+            'action_mode': 'box',
+            'action_repeat': 1,
             'min_ang': 0,
             'max_ang': 0
         },
@@ -23,13 +26,24 @@ ENV_CONFIG = {
             'gravity': 9.8,
             'density': 1.0,
             'entities': [],
+            'collision': 'obb',
+            'broadphase': 'grid',
+            'dt': 1.0,
+            'substeps': 1,
+            'integrator': 'split',
             'land_ang': 5,
             'land_vel': 2
         },
         'window': {
             'width': 640,
             'height': 900,
-            'colour': (137, 207, 240)
+            'colour': (137, 207, 240),
+            'rotation_resolution': 1.2,
+            'rotation_cache_mb': 32
+        },
+        'profile': {
+            'phases': False,
+            'info': False
         }
     },
     'moon': {
@@ -41,6 +55,9 @@ ENV_CONFIG = {
             'max_pos': (0.5, 0.1),
             'min_vel': (0, 0),
             'max_vel': (0, 0),
+            'seed': None,
+            'action_mode': 'box',
+            'action_repeat': 1,
             'min_ang': 0,
             'max_ang': 0
         },
@@ -48,13 +65,24 @@ ENV_CONFIG = {
             'gravity': 1.6,
             'density': 0.0,
             'entities': [],
+            'collision': 'obb',
+            'broadphase': 'grid',
+            'dt': 1.0,
+            'substeps': 1,
+            'integrator': 'split',
             'land_ang': 5,
             'land_vel': 2
         },
         'window': {
             'width': 640,
             'height': 900,
-            'colour': (169, 169, 169)
+            'colour': (169, 169, 169),
+            'rotation_resolution': 1.2,
+            'rotation_cache_mb': 32
+        },
+        'profile': {
+            'phases': False,
+            'info': False
         }
     },
     'mars': {
@@ -66,6 +94,9 @@ ENV_CONFIG = {
             'max_pos': (0.5, 0.1),
             'min_vel': (0, 0),
             'max_vel': (0, 0),
+            'seed': None,
+            'action_mode': 'box',
+            'action_repeat': 1,
             'min_ang': 0,
             'max_ang': 0
         },
@@ -73,6 +104,11 @@ ENV_CONFIG = {
             'gravity': 4.9,
             'density': 0.2,
             'entities': [],
+            'collision': 'obb',
+            'broadphase': 'grid',
+            'dt': 1.0,
+            'substeps': 1,
+            'integrator': 'split',
             'land_ang': 5,
             'land_vel': 2
         },
@@ -80,6 +116,25 @@ ENV_CONFIG = {
             'width': 640,
             'height': 900,
             'colour': (110, 38, 14),
+            'rotation_resolution': 1.2,
+            'rotation_cache_mb': 32
+        },
+        'profile': {
+            'phases': False,
+            'info': False
         }
     }
 }
+
+TRAIN_CONFIG = {
+    'iterations': 100,
+    'num_workers': 1,
+    'num_envs_per_worker': 1,
+    'rollout_fragment_length': 200,
+    'train_batch_size': 4000,
+    'num_sgd_iter': 10,
+    'sgd_minibatch_size': 250,
+    'framework': 'tf',
+    'num_threads': 0,
+    'vector_env': False
+}
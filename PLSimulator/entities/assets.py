@@ -0,0 +1,129 @@
+import os
+import pygame
+from collections import OrderedDict
+
+from PLSimulator.constants import ASSET_DATA_DIRECTORY
+
+
+# Scaled images shared by every entity in this process
+_ASSET_CACHE = {}
+
+# Rotated images shared by every entity in this process, least recently used first
+_ROTATION_CACHE = OrderedDict()
+_ROTATION_CONFIG = {'resolution': 1.2, 'max_bytes': 32 * 1024 * 1024}
+_ROTATION_STATS = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+
+def load_asset(asset_name: str, width: int, height: int, flip_x: bool = False, flip_y: bool = False) -> pygame.Surface:
+    '''
+        Load a scaled asset, reading it from disk only the first time it is requested
+
+        Parameters:
+            asset_name: Name of image in the asset directory
+            width: Width to scale the image to
+            height: Height to scale the image to
+            flip_x: Whether to mirror the image horizontally
+            flip_y: Whether to mirror the image vertically
+
+        Returns:
+            image: Scaled image shared with all other callers
+    '''
+    key = (asset_name, width, height, flip_x, flip_y)
+
+    if key not in _ASSET_CACHE:
+        image = pygame.image.load(os.path.join(ASSET_DATA_DIRECTORY, asset_name))
+        image = pygame.transform.flip(image, flip_x, flip_y)
+        _ASSET_CACHE[key] = pygame.transform.scale(image, (width, height))
+
+    return _ASSET_CACHE[key]
+
+
+def rotate_asset(key: tuple, angle: float) -> pygame.Surface:
+    '''
+        Rotate a scaled asset, snapping the angle to the cache resolution so repeated angles reuse one image
+
+        Parameters:
+            key: Arguments of load_asset identifying the asset as (name, width, height, flip_x, flip_y)
+            angle: Angle to rotate the image by in degrees
+
+        Returns:
+            image: Rotated image shared with all other callers
+    '''
+    resolution = _ROTATION_CONFIG['resolution']
+    step = round(angle / resolution) if resolution > 0 else angle
+    rotation_key = (key, step)
+
+    # Mark hits as most recently used
+    image = _ROTATION_CACHE.get(rotation_key)
+    if image is not None:
+        _ROTATION_CACHE.move_to_end(rotation_key)
+        _ROTATION_STATS['hits'] += 1
+        return image
+
+    _ROTATION_STATS['misses'] += 1
+    image = pygame.transform.rotozoom(load_asset(*key), step * resolution if resolution > 0 else angle, 1)
+    _ROTATION_CACHE[rotation_key] = image
+    _ROTATION_STATS['bytes'] += _surface_bytes(image)
+
+    # Evict the least recently used images until under the memory cap, always keeping the newest
+    while _ROTATION_STATS['bytes'] > _ROTATION_CONFIG['max_bytes'] and len(_ROTATION_CACHE) > 1:
+        _, evicted = _ROTATION_CACHE.popitem(last=False)
+        _ROTATION_STATS['bytes'] -= _surface_bytes(evicted)
+        _ROTATION_STATS['evictions'] += 1
+
+    return image
+
+
+def _surface_bytes(image: pygame.Surface) -> int:
+    width, height = image.get_size()
+    return width * height * image.get_bytesize()
+
+
+def configure_rotation_cache(resolution: float = None, max_bytes: int = None) -> None:
+    '''
+        Change the angular resolution or memory cap of the rotated image cache
+
+        Parameters:
+            resolution: Angle in degrees that rotations are snapped to, or 0 to cache exact angles
+            max_bytes: Memory in bytes the rotated images may use
+
+        Returns:
+            None
+    '''
+    if resolution is not None and resolution != _ROTATION_CONFIG['resolution']:
+        # Images cached at the old resolution are keyed by a different step
+        _ROTATION_CONFIG['resolution'] = resolution
+        _ROTATION_CACHE.clear()
+        _ROTATION_STATS['bytes'] = 0
+
+    if max_bytes is not None:
+        _ROTATION_CONFIG['max_bytes'] = max_bytes
+
+
+def rotation_cache_stats() -> dict:
+    '''
+        Get the counters of the rotated image cache
+
+        Parameters:
+            None
+
+        Returns:
+            stats: Hits, misses, evictions, number of images and bytes in use
+    '''
+    return dict(_ROTATION_STATS, images=len(_ROTATION_CACHE))
+
+
+def clear_assets() -> None:
+    '''
+        Release every cached asset and rotated image, and reset the cache counters
+
+        Parameters:
+            None
+
+        Returns:
+            None
+    '''
+    _ASSET_CACHE.clear()
+    _ROTATION_CACHE.clear()
+    for name in _ROTATION_STATS:
+        _ROTATION_STATS[name] = 0
@@ -0,0 +1,59 @@
+import math
+
+
+class UniformGrid:
+    '''
+        UniformGrid
+
+        This is a broadphase index that buckets static entities into square cells,
+        so only entities sharing a cell with a query reach the exact collision test.
+    '''
+
+    def __init__(self, cell_size: float = 64) -> None:
+        '''
+            Initialise the grid
+
+            Parameters:
+                cell_size: Width and height of each cell
+
+            Returns:
+                None
+        '''
+        self._cell_size = cell_size
+        self._cells = {}
+        self._order = {}
+
+    def _keys(self, bounds: tuple) -> list:
+        min_x, min_y, max_x, max_y = (math.floor(b / self._cell_size) for b in bounds)
+        return [(i, j) for i in range(min_x, max_x + 1) for j in range(min_y, max_y + 1)]
+
+    def insert(self, entity: object, bounds: tuple) -> None:
+        '''
+            Add an entity to every cell its bounds overlap
+
+            Parameters:
+                entity: Entity to add
+                bounds: Axis-aligned bounds of the entity as (min_x, min_y, max_x, max_y)
+
+            Returns:
+                None
+        '''
+        self._order.setdefault(entity, len(self._order))
+        for key in self._keys(bounds):
+            self._cells.setdefault(key, []).append(entity)
+
+    def query(self, bounds: tuple) -> list:
+        '''
+            Find the entities that share a cell with the given bounds
+
+            Parameters:
+                bounds: Axis-aligned bounds to look up as (min_x, min_y, max_x, max_y)
+
+            Returns:
+                entities: Candidate entities in the order they were inserted
+        '''
+        candidates = set()
+        for key in self._keys(bounds):
+            candidates.update(self._cells.get(key, ()))
+
+        return sorted(candidates, key=self._order.__getitem__)
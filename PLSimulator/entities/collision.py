@@ -0,0 +1,125 @@
+import math
+import numpy as np
+
+
+def obb_corners(center: tuple, half_size: tuple, angle: float) -> tuple:
+    '''
+        Calculate the corners of an oriented bounding box
+
+        The box is rotated the same way pygame rotates images, so a positive
+        angle turns the box anti-clockwise on screen.
+
+        Parameters:
+            center: Position of the centre of the box
+            half_size: Half of the width and height of the box
+            angle: Heading of the box in degrees
+
+        Returns:
+            corners: Four corners of the box in winding order
+    '''
+    c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    x, y = center[0], center[1]
+
+    # Body-frame axes scaled by the half extents
+    ux, uy = c * half_size[0], -s * half_size[0]
+    vx, vy = s * half_size[1], c * half_size[1]
+
+    return (
+        (x - ux - vx, y - uy - vy),
+        (x + ux - vx, y + uy - vy),
+        (x + ux + vx, y + uy + vy),
+        (x - ux + vx, y - uy + vy),
+    )
+
+
+def obb_intersects(this_corners: tuple, other_corners: tuple) -> bool:
+    '''
+        Check whether two oriented bounding boxes overlap using the separating axis test
+
+        Boxes that only touch along an edge are treated as overlapping.
+
+        Parameters:
+            this_corners: Corners of the first box
+            other_corners: Corners of the second box
+
+        Returns:
+            intersects: Whether the boxes overlap
+    '''
+    for corners in (this_corners, other_corners):
+        # Two edges of a rectangle give both of its face normals
+        for i in range(2):
+            nx = corners[i][1] - corners[i + 1][1]
+            ny = corners[i + 1][0] - corners[i][0]
+
+            this_min = this_max = this_corners[0][0] * nx + this_corners[0][1] * ny
+            for px, py in this_corners[1:]:
+                p = px * nx + py * ny
+                this_min, this_max = min(this_min, p), max(this_max, p)
+
+            other_min = other_max = other_corners[0][0] * nx + other_corners[0][1] * ny
+            for px, py in other_corners[1:]:
+                p = px * nx + py * ny
+                other_min, other_max = min(other_min, p), max(other_max, p)
+
+            # A gap along any axis means the boxes are separated
+            if this_max < other_min or other_max < this_min:
+                return False
+
+    return True
+
+
+def obb_corners_batch(centers: np.ndarray, half_size: tuple, angles: np.ndarray) -> np.ndarray:
+    '''
+        Calculate the corners of many oriented bounding boxes of the same size
+
+        Parameters:
+            centers: Array of shape (N, 2) with the centre of each box
+            half_size: Half of the width and height shared by every box
+            angles: Array of shape (N,) with the heading of each box in degrees
+
+        Returns:
+            corners: Array of shape (N, 4, 2) with the corners of each box in winding order
+    '''
+    c, s = np.cos(np.radians(angles)), np.sin(np.radians(angles))
+
+    # Body-frame axes scaled by the half extents
+    u = np.stack([c * half_size[0], -s * half_size[0]], axis=-1)
+    v = np.stack([s * half_size[1], c * half_size[1]], axis=-1)
+
+    return np.stack([
+        centers - u - v,
+        centers + u - v,
+        centers + u + v,
+        centers - u + v,
+    ], axis=1)
+
+
+def obb_intersects_batch(this_corners: np.ndarray, other_corners: np.ndarray) -> np.ndarray:
+    '''
+        Check whether pairs of oriented bounding boxes overlap using the separating axis test
+
+        Parameters:
+            this_corners: Array of shape (N, 4, 2) with the corners of the first boxes
+            other_corners: Array of shape (4, 2) or (N, 4, 2) with the corners of the second boxes
+
+        Returns:
+            intersects: Array of shape (N,) with whether each pair of boxes overlaps
+    '''
+    other_corners = np.broadcast_to(other_corners, this_corners.shape)
+
+    # Two edges of each rectangle give both of its face normals
+    edges = np.concatenate([
+        this_corners[:, 1:3] - this_corners[:, 0:2],
+        other_corners[:, 1:3] - other_corners[:, 0:2],
+    ], axis=1)
+    axes = np.stack([-edges[..., 1], edges[..., 0]], axis=-1)
+
+    # Project every corner onto every axis
+    this_projection = np.einsum('nad,ncd->nac', axes, this_corners)
+    other_projection = np.einsum('nad,ncd->nac', axes, other_corners)
+
+    # A gap along any axis means the boxes are separated
+    separated = (this_projection.max(axis=2) < other_projection.min(axis=2)) | \
+        (other_projection.max(axis=2) < this_projection.min(axis=2))
+
+    return ~separated.any(axis=1)
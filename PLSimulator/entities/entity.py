@@ -1,9 +1,8 @@
-import os
-import pygame
-from pygame import Vector2
-from shapely.geometry import Polygon
+import math
 
-from PLSimulator.constants import ASSET_DATA_DIRECTORY
+from PLSimulator import physics
+from PLSimulator.entities.collision import obb_corners
+from PLSimulator.entities.collision import obb_intersects
 
 
 class Entity:
@@ -16,9 +15,9 @@ class Entity:
     def __init__(
             self,
             asset_name: str,
-            asset_size: Vector2 = Vector2(64, 64),
-            position: Vector2 = Vector2(0, 0),
-            velocity: Vector2 = Vector2(0, 0),
+            asset_size: tuple = (64, 64),
+            position: tuple = (0, 0),
+            velocity: tuple = (0, 0),
             angle: float = 0,
             mass: float = 1,
             entities: "list[Entity]" = [],
@@ -43,21 +42,41 @@ class Entity:
         '''
         self._asset_name = asset_name
         self._asset_size = asset_size
-        self.position = position
-        self.acceleration = Vector2(0, 0)
-        self.velocity = velocity
+        self._half_size = (abs(asset_size[0]) / 2, abs(asset_size[1]) / 2)
+        self.position = [float(position[0]), float(position[1])]
+        self.acceleration = [0.0, 0.0]
+        self.velocity = [float(velocity[0]), float(velocity[1])]
         self.angle = angle
         self.mass = mass + sum([e.mass for e in entities])
         self.entities = entities
         self.isRenderable = isRenderable
         self.isCollidable = isCollidable
 
-        image_path = os.path.join(ASSET_DATA_DIRECTORY, asset_name)
-        self.image = pygame.image.load(image_path)
-        self.image = pygame.transform.flip(self.image, self._asset_size[0] < 0, self._asset_size[1] < 0)
-        self.image = pygame.transform.scale(self.image, (abs(self._asset_size[0]), abs(self._asset_size[1])))
+    @property
+    def image(self):
+        '''
+            Image of the entity, loaded from the shared asset cache on first use
+
+            Parameters:
+                None
 
-    def update_position(self, force: Vector2, heading: float = None) -> None:
+            Returns:
+                image: Scaled and flipped image of the entity
+        '''
+        from PLSimulator.entities.assets import load_asset
+
+        return load_asset(*self._asset_key())
+
+    def _asset_key(self) -> tuple:
+        return (
+            self._asset_name,
+            int(abs(self._asset_size[0])),
+            int(abs(self._asset_size[1])),
+            self._asset_size[0] < 0,
+            self._asset_size[1] < 0
+        )
+
+    def update_position(self, force: tuple, heading: float = None) -> None:
         '''
             Update the positional information of the entity
 
@@ -68,20 +87,37 @@ class Entity:
             Returns:
                 None
         '''
-        # Calculate acceleration: A = F/M
-        self.acceleration = force / self.mass
-
-        # Update velocity
-        self.velocity += self.acceleration
-
-        # Update position
-        self.position += self.velocity
+        x, y, vx, vy, ax, ay = physics.integrate(
+            self.position[0], self.position[1],
+            self.velocity[0], self.velocity[1],
+            force[0], force[1],
+            self.mass
+        )
+        self.position[0], self.position[1] = x, y
+        self.velocity[0], self.velocity[1] = vx, vy
+        self.acceleration[0], self.acceleration[1] = ax, ay
 
         # Update heading
         if heading is not None:
             self.angle = heading
 
-    def render(self, pivot: Vector2 = Vector2(0, 0), offset: Vector2 = Vector2(0, 0), angle: float = 0) -> list:
+    @staticmethod
+    def center(pivot: tuple, offset: tuple, angle: float) -> tuple:
+        '''
+            Calculate the centre of an entity offset from a pivot and rotated around it
+
+            Parameters:
+                pivot: Position around which to rotate
+                offset: Offset from the pivot to place the entity
+                angle: Heading of the entity in degrees
+
+            Returns:
+                center: Position of the centre of the entity
+        '''
+        c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+        return pivot[0] + offset[0] * c + offset[1] * s, pivot[1] - offset[0] * s + offset[1] * c
+
+    def render(self, pivot: tuple = (0, 0), offset: tuple = (0, 0), angle: float = 0) -> list:
         '''
             Render the entity and any sub-entities to the window
 
@@ -97,10 +133,11 @@ class Entity:
         if not self.isRenderable:
             return []
 
-        # Rotate this entity
-        rotated_image = pygame.transform.rotozoom(self.image, self.angle + angle, 1)
-        rotated_offset = offset.rotate(-(self.angle + angle))
-        rotated_rect = rotated_image.get_rect(center=pivot + rotated_offset)
+        from PLSimulator.entities.assets import rotate_asset
+
+        # Rotate this entity, reusing the image from any earlier frame at the same angle
+        rotated_image = rotate_asset(self._asset_key(), self.angle + angle)
+        rotated_rect = rotated_image.get_rect(center=self.center(pivot, offset, self.angle + angle))
 
         # Add rotated image to list
         images = [(rotated_image, rotated_rect)]
@@ -111,7 +148,7 @@ class Entity:
 
         return images
 
-    def polygon(self, pivot: Vector2 = Vector2(0, 0), offset: Vector2 = Vector2(0, 0), angle: float = 0) -> list:
+    def polygon(self, pivot: tuple = (0, 0), offset: tuple = (0, 0), angle: float = 0) -> list:
         '''
             Calculate the polygon for this entity and any sub-entities
 
@@ -127,10 +164,16 @@ class Entity:
         if not self.isRenderable or not self.isCollidable:
             return []
 
-        # Rotate this entity
-        rotated_image = pygame.transform.rotozoom(self.image, self.angle + angle, 1)
-        rotated_offset = offset.rotate(-(self.angle + angle))
-        rotated_rect = rotated_image.get_rect(center=pivot + rotated_offset)
+        import pygame
+        from shapely.geometry import Polygon
+
+        # Bound this entity once rotated, using its declared size rather than its image
+        heading = math.radians(self.angle + angle)
+        c, s = abs(math.cos(heading)), abs(math.sin(heading))
+        width = 2 * (self._half_size[0] * c + self._half_size[1] * s)
+        height = 2 * (self._half_size[0] * s + self._half_size[1] * c)
+        rotated_rect = pygame.Rect(0, 0, math.ceil(width), math.ceil(height))
+        rotated_rect.center = self.center(pivot, offset, self.angle + angle)
 
         # Add rotated polygon to list
         vertices = [rotated_rect.topleft, rotated_rect.topright, rotated_rect.bottomright, rotated_rect.bottomleft]
@@ -142,12 +185,56 @@ class Entity:
 
         return polygons
 
-    def collides_with(self, other: "Entity") -> bool:
+    def boxes(self, pivot: tuple = (0, 0), offset: tuple = (0, 0), angle: float = 0) -> list:
+        '''
+            Calculate the oriented bounding boxes for this entity and any sub-entities
+
+            Parameters:
+                pivot: Position around which to rate
+                offset: Offset from the pivot to place box
+                angle: Heading of the box relative to parent
+
+            Returns:
+                boxes: List of box corners to collide
+        '''
+        # Return if entity is not renderable or collidable
+        if not self.isRenderable or not self.isCollidable:
+            return []
+
+        # Add rotated box to list
+        heading = self.angle + angle
+        boxes = [(self, obb_corners(self.center(pivot, offset, heading), self._half_size, heading))]
+
+        # Add all sub-entities as rotated boxes
+        for entity in self.entities:
+            boxes.extend(entity.boxes(pivot, entity.position, heading))
+
+        return boxes
+
+    def bounds(self) -> tuple:
+        '''
+            Calculate the axis-aligned bounds of this entity and any sub-entities
+
+            Parameters:
+                None
+
+            Returns:
+                bounds: Bounds as (min_x, min_y, max_x, max_y), or None if nothing is collidable
+        '''
+        corners = [corner for _, box in self.boxes(self.position) for corner in box]
+        if len(corners) == 0:
+            return None
+
+        xs, ys = [c[0] for c in corners], [c[1] for c in corners]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def collides_with(self, other: "Entity", method: str = 'obb') -> bool:
         '''
             Check whether other Entity collides with this Entity
 
             Parameters:
                 other: Other base entity to consider
+                method: Collision backend to use ('obb' or 'shapely')
 
             Returns:
                 collision: Whether a collision has occurred
@@ -160,15 +247,27 @@ class Entity:
         if self == other:
             return []
 
-        # Generate polygons for both objects
-        this_polygons = self.polygon(self.position)
-        other_polygons = other.polygon(other.position)
-
-        # For each polygon object, see if it intersects in any other polygon
         collisions = []
-        for this_object, this_polygon in this_polygons:
-            for other_object, other_polygon in other_polygons:
-                if this_polygon.intersects(other_polygon):
+
+        # Test rotated polygons with shapely, kept for cross-checking the analytic backend
+        if method == 'shapely':
+            this_polygons = self.polygon(self.position)
+            other_polygons = other.polygon(other.position)
+
+            for this_object, this_polygon in this_polygons:
+                for other_object, other_polygon in other_polygons:
+                    if this_polygon.intersects(other_polygon):
+                        collisions.append((this_object, other_object))
+
+            return collisions
+
+        # Otherwise test oriented bounding boxes with the separating axis test
+        this_boxes = self.boxes(self.position)
+        other_boxes = other.boxes(other.position)
+
+        for this_object, this_box in this_boxes:
+            for other_object, other_box in other_boxes:
+                if obb_intersects(this_box, other_box):
                     collisions.append((this_object, other_object))
 
         return collisions
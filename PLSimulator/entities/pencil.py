@@ -1,5 +1,3 @@
-from pygame import Vector2
-
 from PLSimulator.entities.entity import Entity
 
 
@@ -13,9 +11,9 @@ class Pencil(Entity):
     def __init__(self):
         super().__init__(
             'pencil.png',
-            Vector2(16, 128),
-            Vector2(312, 64),
-            Vector2(0, 0),
+            (16, 128),
+            (312, 64),
+            (0, 0),
             0,
             20,
             [
@@ -33,9 +31,9 @@ class Pencil(Entity):
         self.start_fuel, self.fuel_mass = 20, 20
         self.mass = self.dry_mass + self.fuel_mass
 
-    def fire_engine(self):
+    def fire_engine(self, amount: float = 0.1):
         if self.fuel_mass > 0:
-            self.fuel_mass -= 0.1
+            self.fuel_mass -= amount
             self.mass = self.dry_mass + self.fuel_mass
             return True
         return False
@@ -49,9 +47,9 @@ class Engine(Entity):
     def __init__(self):
         super(Engine, self).__init__(
             'engine_firing.png',
-            Vector2(16, 80),
-            Vector2(0, 84),
-            Vector2(0, 0),
+            (16, 80),
+            (0, 84),
+            (0, 0),
             0,
             5,
             [],
@@ -62,13 +60,13 @@ class Engine(Entity):
 
 class RCS(Entity):
     def __init__(self, flip_x: bool):
-        asset_size = Vector2(-16, 16) if flip_x else Vector2(16, 16)
-        position = Vector2(-13, -52) if flip_x else Vector2(13, -52)
+        asset_size = (-16, 16) if flip_x else (16, 16)
+        position = (-13, -52) if flip_x else (13, -52)
         super(RCS, self).__init__(
             'rcs_firing.png',
             asset_size,
             position,
-            Vector2(0, 0),
+            (0, 0),
             0,
             1,
             [],
@@ -79,13 +77,13 @@ class RCS(Entity):
 
 class Leg(Entity):
     def __init__(self, flip_x: bool):
-        asset_size = Vector2(-8, 48) if flip_x else Vector2(8, 48)  # TODO: Fix image, not correct asset_size
-        position = Vector2(10, 46) if flip_x else Vector2(-9, 46)
+        asset_size = (-8, 48) if flip_x else (8, 48)  # TODO: Fix image, not correct asset_size
+        position = (10, 46) if flip_x else (-9, 46)
         super(Leg, self).__init__(
             "leg.png",
             asset_size,
             position,
-            Vector2(0, 0),
+            (0, 0),
             0,
             3,
             [],
@@ -1,5 +1,3 @@
-from pygame import Vector2
-
 from PLSimulator.entities.entity import Entity
 
 
@@ -13,9 +11,9 @@ class Ground(Entity):
     def __init__(self):
         super().__init__(
             'ground.png',
-            Vector2(640, 16),
-            Vector2(320, 892),
-            Vector2(0, 0),
+            (640, 16),
+            (320, 892),
+            (0, 0),
             0,
             100,
             [],
@@ -33,11 +31,81 @@ class LandingPad(Entity):
     def __init__(self):
         super().__init__(
             'landing_zone.png',
-            Vector2(256, 16),
-            Vector2(320, 876),  # TODO: change position on reset method
-            Vector2(0, 0),
+            (256, 16),
+            (320, 876),  # TODO: change position on reset method
+            (0, 0),
             0,
             100,
             [],
             True
         )
+
+
+class Obstacle(Entity):
+    '''
+        Obstacle
+
+        This is the base class for static obstacles placed through the environment config
+    '''
+
+    def __init__(self, asset_name: str, size: tuple, position: tuple, angle: float = 0):
+        super().__init__(
+            asset_name,
+            size,
+            position,
+            (0, 0),
+            angle,
+            100,
+            [],
+            True
+        )
+
+
+class Tower(Obstacle):
+    '''
+        Tower
+
+        This is a tall obstacle standing on the ground
+    '''
+
+    def __init__(self, size: tuple, position: tuple, angle: float = 0):
+        super().__init__('ground.png', size, position, angle)
+
+
+class Debris(Obstacle):
+    '''
+        Debris
+
+        This is a floating obstacle
+    '''
+
+    def __init__(self, size: tuple, position: tuple, angle: float = 0):
+        super().__init__('landing_zone.png', size, position, angle)
+
+
+OBSTACLE_OBJECTS_DICT = {
+    'tower': Tower,
+    'debris': Debris,
+}
+
+
+def build_obstacles(definitions: list, width: float, height: float) -> list:
+    '''
+        Create obstacles from the definitions in the physics config
+
+        Parameters:
+            definitions: List of dicts with a 'type', 'size', 'position' relative to the window and optional 'angle'
+            width: Width of the window
+            height: Height of the window
+
+        Returns:
+            obstacles: List of obstacle entities
+    '''
+    return [
+        OBSTACLE_OBJECTS_DICT[d["type"]](
+            d["size"],
+            (d["position"][0] * width, d["position"][1] * height),
+            d.get("angle", 0)
+        )
+        for d in definitions
+    ]
@@ -0,0 +1,86 @@
+import numpy as np
+from gym.spaces import Box, Discrete, MultiDiscrete
+
+
+ACTION_MODES = ['box', 'multibinary', 'discrete']
+
+# Engine, left and right flags of each discrete action, one bit each
+DISCRETE_ACTIONS = np.array([[i & 1, i >> 1 & 1, i >> 2 & 1] for i in range(8)])
+
+
+def action_space(mode: str) -> object:
+    '''
+        Build the action space of an action mode
+
+        Parameters:
+            mode: Name of the action mode in ACTION_MODES
+
+        Returns:
+            space: Box of three values in [0, 1] for 'box', three binary choices for 'multibinary'
+                   or one of the eight combinations of flags for 'discrete'
+    '''
+    if mode == 'box':
+        return Box(
+            np.array([0, 0, 0], dtype=np.int),
+            np.array([1, 1, 1], dtype=np.int),
+            dtype=np.int
+        )
+    if mode == 'multibinary':
+        # RLlib samples a MultiDiscrete of two choices each as independent categoricals, unlike MultiBinary
+        return MultiDiscrete([2, 2, 2])
+    if mode == 'discrete':
+        return Discrete(8)
+
+    raise ValueError(f"Unknown action mode '{mode}', choose from {ACTION_MODES}.")
+
+
+def decode_action(mode: str, action) -> list:
+    '''
+        Convert an action of the action space into engine, left and right flags
+
+        Parameters:
+            mode: Name of the action mode in ACTION_MODES
+            action: The action made by the agent
+
+        Returns:
+            action: Engine, left and right values, a new list unless the mode is 'box'
+    '''
+    if mode == 'discrete':
+        return DISCRETE_ACTIONS[int(action)].tolist()
+    if mode == 'multibinary':
+        return [int(action[0]), int(action[1]), int(action[2])]
+    return action
+
+
+def decode_actions(mode: str, actions: list) -> np.ndarray:
+    '''
+        Convert the actions of several pencils into engine, left and right flags
+
+        Parameters:
+            mode: Name of the action mode in ACTION_MODES
+            actions: The action made by the agent for each pencil
+
+        Returns:
+            actions: Array of shape (N, 3) with the engine, left and right values of each pencil
+    '''
+    if mode == 'discrete':
+        return DISCRETE_ACTIONS[np.asarray(actions, dtype=np.int64).reshape(-1)].astype(np.float64)
+    return np.array(actions, dtype=np.float64).reshape(-1, 3)
+
+
+def encode_action(mode: str, action: list) -> object:
+    '''
+        Convert engine, left and right flags into an action of the action space
+
+        Parameters:
+            mode: Name of the action mode in ACTION_MODES
+            action: Engine, left and right flags
+
+        Returns:
+            action: The action in the action space
+    '''
+    if mode == 'discrete':
+        return int(action[0]) | int(action[1]) << 1 | int(action[2]) << 2
+    if mode == 'multibinary':
+        return np.array(action, dtype=np.int64)
+    return list(action)
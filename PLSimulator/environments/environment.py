@@ -1,19 +1,57 @@
 import os
-import io
 import gym
 import math
-import pygame
-import random
-import imageio
+import time
 import numpy as np
 from gym.spaces import Box
-from pygame import Vector2
-from ray.rllib.env.env_context import EnvContext
 
-from PLSimulator.constants import ASSET_DATA_DIRECTORY
+from PLSimulator import physics
+from PLSimulator.profiling import PhaseTimer
+from PLSimulator.environments.actions import action_space, decode_action
 from PLSimulator.entities.pencil import Pencil
 from PLSimulator.entities.static import Ground
 from PLSimulator.entities.static import LandingPad
+from PLSimulator.entities.static import build_obstacles
+from PLSimulator.entities.broadphase import UniformGrid
+
+
+# Scale that rounds observations to one decimal place
+_TENTHS = np.array(10, dtype=np.float32)
+
+
+def make_rng(config: dict, seed: int = None) -> np.random.Generator:
+    '''
+        Create the random generator used to reset an environment
+
+        Parameters:
+            config: The parameters used to initialise the environment
+            seed: Seed for the generator, otherwise the optional seed of the agent config is used
+
+        Returns:
+            rng: Generator seeded with the seed given, or mixed with the worker and vector index of the
+                 config so parallel copies of one config draw different episodes
+    '''
+    if seed is not None:
+        return np.random.default_rng(seed)
+
+    seed = config["agent"].get("seed")
+    if seed is None:
+        return np.random.default_rng()
+
+    return np.random.default_rng([seed, getattr(config, "worker_index", 0), getattr(config, "vector_index", 0)])
+
+
+def sign(x: float) -> int:
+    '''
+        Get the sign of a number as np.sign does, without creating a NumPy scalar
+
+        Parameters:
+            x: The number
+
+        Returns:
+            sign: -1, 0 or 1
+    '''
+    return int(x > 0) - int(x < 0)
 
 
 class Environment(gym.Env):
@@ -23,8 +61,9 @@ class Environment(gym.Env):
         This is the environment class for the pencil landing simulation.
         It inherits from the gym environment class.
     '''
+    metadata = {'render.modes': ['human', 'rgb_array']}
 
-    def __init__(self, config: EnvContext) -> None:
+    def __init__(self, config: dict) -> None:
         '''
             Initialise the environment
 
@@ -38,11 +77,23 @@ class Environment(gym.Env):
         self.pencil = Pencil()
         self.ground = Ground()
         self.pad = LandingPad()
+        self.obstacles = build_obstacles(
+            config["physics"]["entities"],
+            config["window"]["width"],
+            config["window"]["height"]
+        )
         self.entities = [
             self.pencil,
             self.ground,
             self.pad
-        ]
+        ] + self.obstacles
+
+        # Set up broadphase over the static entities
+        self._broadphase = config["physics"].get("broadphase", "grid")
+        self._grid = UniformGrid(64)
+        self._obstacles = set(self.obstacles)
+        for entity in self.entities[1:]:
+            self._grid.insert(entity, entity.bounds())
 
         # Set up forces
         self._rotation_scale = 0.1
@@ -51,13 +102,16 @@ class Environment(gym.Env):
         self._density = config["physics"]["density"]
         self._land_ang = config["physics"]["land_ang"]
         self._land_vel = config["physics"]["land_vel"]
+        self._dt = config["physics"].get("dt", 1.0)
+        self._substeps = config["physics"].get("substeps", 1)
+        self._integrator = config["physics"].get("integrator", "split")
+        if self._integrator not in physics.INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{self._integrator}', choose from {list(physics.INTEGRATORS)}.")
+        self._collision = config["physics"].get("collision", "obb")
 
         # Set up environment
-        self.action_space = Box(
-            np.array([0, 0, 0], dtype=np.int),
-            np.array([1, 1, 1], dtype=np.int),
-            dtype=np.int
-        )
+        self.action_mode = config["agent"].get("action_mode", "box")
+        self.action_space = action_space(self.action_mode)
         self.observation_space = Box(
             np.array([-1, -1, -1, -1, -1], dtype=np.float32),
             np.array([1, 1, 1, 1, 1], dtype=np.float32),
@@ -73,33 +127,56 @@ class Environment(gym.Env):
         self._min_vel = config["agent"]["min_vel"]
         self._max_vel = config["agent"]["max_vel"]
 
+        # Observations are computed into one buffer, so stepping allocates little
+        self._state = np.zeros(5, dtype=np.float32)
+
         # Set up window
         self._window_width = config["window"]["width"]
         self._window_height = config["window"]["height"]
         self._window_bg_colour = config["window"]["colour"]
-        self._window_frames = []
+        self._rotation_resolution = config["window"].get("rotation_resolution", 1.2)
+        self._rotation_cache_mb = config["window"].get("rotation_cache_mb", 32)
+        self._rng = make_rng(config)
+
+        # Time each phase of a step only when asked, optionally reporting the durations in info
+        profile = config.get("profile", {})
+        self.timer = PhaseTimer() if profile.get("phases", False) else None
+        self._timer_info = profile.get("info", False)
+        self._video = None
+        self._layer = None
+        self._static_images = []
+        self._static_rects = []
+        self._dirty_rects = []
         self.window = None
+        self.clock = None
 
-    def reset(self) -> list:
+    def reset(self, seed: int = None) -> list:
         '''
             Reset the environment to starting conditions
 
             Parameters:
-                None
+                seed: Seed for this and every following reset, otherwise the sequence continues
 
             Returns:
                 state: Starting state of environment
         '''
-        self.pencil.position = Vector2(
-            random.uniform(self._min_pos[0] * self._window_width, self._max_pos[0] * self._window_width),
-            random.uniform(self._min_pos[1] * self._window_width, self._max_pos[1] * self._window_width),
-        )
-        self.pencil.velocity = Vector2(
-            random.uniform(self._min_vel[0] * self._window_width, self._max_vel[0] * self._window_width),
-            random.uniform(self._min_vel[1] * self._window_width, self._max_vel[1] * self._window_width),
-        )
-        self.pencil.angle = random.uniform(self._min_ang, self._max_ang)
-        self.pencil.fuel_mass = random.uniform(self._min_fuel, self._max_fuel)
+        if seed is not None:
+            self._rng = make_rng(None, seed)
+
+        # Draw in the same order as the vector environment so a seed starts both the same way
+        uniform = self._rng.uniform
+        self.pencil.position = [
+            float(uniform(self._min_pos[0] * self._window_width, self._max_pos[0] * self._window_width)),
+            float(uniform(self._min_pos[1] * self._window_width, self._max_pos[1] * self._window_width)),
+        ]
+        self.pencil.velocity = [
+            float(uniform(self._min_vel[0] * self._window_width, self._max_vel[0] * self._window_width)),
+            float(uniform(self._min_vel[1] * self._window_width, self._max_vel[1] * self._window_width)),
+        ]
+        self.pencil.acceleration = [0.0, 0.0]
+        self.pencil.angle = float(uniform(self._min_ang, self._max_ang))
+        self.pencil.fuel_mass = float(uniform(self._min_fuel, self._max_fuel))
+        self.pencil.mass = self.pencil.dry_mass + self.pencil.fuel_mass
         self.total_reward = 0
 
         return self.state()
@@ -114,54 +191,105 @@ class Environment(gym.Env):
             Returns:
                 state: Information about the environment in relation to the agent
         '''
-        return np.clip(
-            np.array([
-                round((self.pad.position - self.pencil.position)[0] / self._window_width, 1),
-                round((self.pad.position - self.pencil.position)[1] / self._window_height, 1),
-                round((self.pad.velocity - self.pencil.velocity)[0], 1),
-                round((self.pad.velocity - self.pencil.velocity)[1], 1),
-                round((self.pad.angle - self.pencil.angle) / 45, 1)
-            ], dtype=np.float32),
-            -1,
-            1
-        )
+        return self.observe().copy()
+
+    def observe(self) -> np.ndarray:
+        '''
+            Compute the current state of the environment into the observation buffer
+
+            Parameters:
+                None
+
+            Returns:
+                state: The observation buffer, overwritten by the next call
+        '''
+        state = self._state
+        state[0] = (self.pad.position[0] - self.pencil.position[0]) / self._window_width
+        state[1] = (self.pad.position[1] - self.pencil.position[1]) / self._window_height
+        state[2] = self.pad.velocity[0] - self.pencil.velocity[0]
+        state[3] = self.pad.velocity[1] - self.pencil.velocity[1]
+        state[4] = (self.pad.angle - self.pencil.angle) / 45
+
+        # Round to one decimal place and clip to the observation space, in place and with array operands
+        # since NumPy allocates when converting Python scalars
+        np.multiply(state, _TENTHS, out=state)
+        np.rint(state, out=state)
+        np.divide(state, _TENTHS, out=state)
+        np.maximum(state, self.observation_space.low, out=state)
+        np.minimum(state, self.observation_space.high, out=state)
+        return state
 
     def step(self, action: list) -> tuple:
         '''
             Step the environment given an action by agent
 
             Parameters:
-                action: The action made by the agent during this step
+                action: The action made by the agent during this step, in the space of the action mode
 
             Returns:
                 state: Next state of the environment
                 reward: Value to reward the agent
                 done: Whether the environment is done
-                info: Any extra information about environment
+                info: Any extra information about environment, including the engine, left and right flags applied,
+                      the number of physics ticks run and the phase durations if enabled
         '''
-        state = self.state()
-
-        info = {
-            "outcome": "none",
-            "pos": Vector2(state[0], state[1]),
-            "vel": Vector2(state[2], state[3]),
-            "ang": round(state[4], 1),
-            "fuel": round(self.pencil.fuel_mass, 1),
-            "legs": 0,
-        }
+        # Only read the clock between phases when they are timed
+        clock = self.timer is not None and time.perf_counter
+        t0 = clock and clock()
+        # Copy the action as floats, the physics turns off an engine without fuel and info reports what was applied
+        action = [float(a) for a in decode_action(self.action_mode, action)]
+        info = {"outcome": "none", "legs": 0, "action": action, "ticks": 1}
 
         self.step_collisions(info)
+        t1 = clock and clock()
         self.step_physics(action)
+        t2 = clock and clock()
         reward, done = self.step_rewards(info)
         self.total_reward += reward
+        t3 = clock and clock()
+
+        # Learners keep the observations they are given, so they get a copy of the buffer
+        state = self.step_state(info).copy()
+
+        if clock:
+            phases = {"collisions": t1 - t0, "physics": t2 - t1, "rewards": t3 - t2, "state": clock() - t3}
+            for phase, seconds in phases.items():
+                self.timer.record(phase, seconds)
+            if self._timer_info:
+                info["phases"] = phases
 
         return state, reward, done, info
 
+    def step_state(self, info: dict) -> np.ndarray:
+        '''
+            Observe the environment after the physics update and add the pencil's state to info
+
+            Parameters:
+                info: Information about the environment during this step, updated in place
+
+            Returns:
+                state: The observation buffer, overwritten by the next call
+        '''
+        # Info gets plain values as the buffer is overwritten next step
+        state = self.observe()
+        info["pos"] = (float(state[0]), float(state[1]))
+        info["vel"] = (float(state[2]), float(state[3]))
+        info["ang"] = float(state[4])
+        info["fuel"] = round(self.pencil.fuel_mass, 1)
+        return state
+
     def step_collisions(self, info: dict):
+        # Find the entities near enough to the pencil to need an exact test
+        if self._broadphase == "grid":
+            bounds = self.pencil.bounds()
+            candidates = self._grid.query(bounds) if bounds is not None else []
+        else:
+            candidates = self.entities
+
         # Collect collisions between pencil and other entities
         collisions = []
-        for entity in self.entities:
-            collisions.extend(self.pencil.collides_with(entity))
+        for entity in candidates:
+            collisions.extend(self.pencil.collides_with(entity, self._collision))
         collisions = set(collisions)
 
         # For each collision, check for crash/landing cases
@@ -170,7 +298,8 @@ class Environment(gym.Env):
             if self.pencil in c and self.ground in c or \
                self.pencil in c and self.pad in c or \
                self.pencil.entities[3] in c and self.ground in c or \
-               self.pencil.entities[4] in c and self.ground in c:
+               self.pencil.entities[4] in c and self.ground in c or \
+               c[1] in self._obstacles:
                 info["outcome"] = "failed"
                 break
 
@@ -183,7 +312,10 @@ class Environment(gym.Env):
         # Check if both landing legs are on pad
         if not info["outcome"] == "failed" and info["legs"] == 2:
             # Check the pencil velocity and angle are within bounds
-            velCondition = abs(self.pad.velocity.magnitude() - self.pencil.velocity.magnitude()) < self._land_vel
+            velCondition = abs(
+                math.hypot(self.pad.velocity[0], self.pad.velocity[1]) -
+                math.hypot(self.pencil.velocity[0], self.pencil.velocity[1])
+            ) < self._land_vel
             angCondition = abs(self.pad.angle - self.pencil.angle) < self._land_ang
 
             # Update landed and crashed states
@@ -195,54 +327,52 @@ class Environment(gym.Env):
 
     def step_physics(self, action: list):
         # Check if agent has enough fuel to fire engine
-        if action[0] > 0 and not self.pencil.fire_engine():
+        if action[0] > 0 and not self.pencil.fire_engine(0.1 * self._dt):
             action[0] = 0
 
-        # Convert agent actions into forces
-        thrust = -action[0] * 12 * self._force_scale
-        left = -action[1] * 12 * self._rotation_scale
-        right = action[2] * 12 * self._rotation_scale
+        # Convert agent actions into a new heading
+        left = -action[1] * 12 * self._rotation_scale * self._dt
+        right = action[2] * 12 * self._rotation_scale * self._dt
         heading = self.pencil.angle + left + right
         self.pencil.update_entities(action)
 
-        # Move pencil under the forces of its thrust, gravity and drag:
-        thrust = thrust * Vector2(math.sin(math.radians(heading)), math.cos(math.radians(heading)))
-        gravity = self._force_scale * Vector2(0, self._gravity)
-
-        # drag is calculated using: Fd = 0.5 * Cd * A * p * V^2
-        cd = 0.5 * math.sin(math.radians(heading)) + 0.5
-        drag = 0.5 * cd * 1 * self._density * Vector2(self.pencil.velocity[0]**2, self.pencil.velocity[1]**2)
-        if self.pencil.velocity[0] > 0:
-            drag[0] *= -1
-        if self.pencil.velocity[1] > 0:
-            drag[1] *= -1
-        drag = self._force_scale * drag
-
-        # Update pencils position under external and internal forces
-        self.pencil.update_position(gravity + drag)
-        self.pencil.update_position(thrust, heading)
+        # Move pencil under the forces of its thrust, gravity and drag
+        x, y, vx, vy, ax, ay = physics.step(
+            self.pencil.position[0], self.pencil.position[1],
+            self.pencil.velocity[0], self.pencil.velocity[1],
+            self.pencil.mass, action[0], heading,
+            self._gravity, self._density, self._force_scale,
+            self._dt, self._substeps, self._integrator
+        )
+        self.pencil.position[0], self.pencil.position[1] = x, y
+        self.pencil.velocity[0], self.pencil.velocity[1] = vx, vy
+        self.pencil.acceleration[0], self.pencil.acceleration[1] = ax, ay
+        self.pencil.angle = heading
 
     def step_rewards(self, info: dict):
         # Reward agent for conserving fuel
         reward = 0
 
         # Calculate distance/velocity/acceleration of pencil relative to landing pad
-        distance = (self.pad.position - self.pencil.position) / self.pad.position.magnitude()
-        velocity = (self.pad.velocity - self.pencil.velocity)
-        acceleration = (self.pad.acceleration - self.pencil.acceleration)
+        scale = math.hypot(self.pad.position[0], self.pad.position[1])
+        dx = (self.pad.position[0] - self.pencil.position[0]) / scale
+        dy = (self.pad.position[1] - self.pencil.position[1]) / scale
+        vx = self.pad.velocity[0] - self.pencil.velocity[0]
+        vy = self.pad.velocity[1] - self.pencil.velocity[1]
+        ax = self.pad.acceleration[0] - self.pencil.acceleration[0]
+        ay = self.pad.acceleration[1] - self.pencil.acceleration[1]
+        distance = math.hypot(dx, dy)
 
         # Determine if pencil is moving/slowing towards landing pad
-        moving = np.sign(distance[0]) != np.sign(velocity[0]) and np.sign(distance[0]) != np.sign(velocity[1])
-        slowing = not (
-            np.sign(distance[0]) != np.sign(acceleration[0]) and np.sign(distance[1]) != np.sign(acceleration[1])
-        )
+        moving = sign(dx) != sign(vx) and sign(dx) != sign(vy)
+        slowing = not (sign(dx) != sign(ax) and sign(dy) != sign(ay))
 
         # Reward if pencil is not firing engine far from landing pad
-        if abs(acceleration.magnitude()) <= 0 and distance.magnitude() > 0.5:
+        if math.hypot(ax, ay) <= 0 and distance > 0.5:
             reward += 2
         # Reward if pencil is moving and slowing towards landing pad
-        elif moving and slowing or distance.magnitude() < 0.5 and velocity.magnitude() <= self._land_vel:
-            reward += 8 * (0.5 - distance.magnitude()) * math.cos(math.radians(self.pencil.angle))
+        elif moving and slowing or distance < 0.5 and math.hypot(vx, vy) <= self._land_vel:
+            reward += 8 * (0.5 - distance) * math.cos(math.radians(self.pencil.angle))
         # Otherwise negatively reward pencil
         else:
             reward -= 8
@@ -255,56 +385,131 @@ class Environment(gym.Env):
 
         return round(reward, 1), info["outcome"] in ["success", "failed"]
 
-    def render(self, save_video: bool = False) -> None:
+    def render(self, mode: str = 'human', save_video: bool = False) -> np.ndarray:
         '''
             Render the entities to window
 
             Paramters:
+                mode: Either 'human' to draw to a display window or 'rgb_array' to draw off-screen
                 save_video: Whether to save simulation as a video
 
             Returns:
-                None
+                frame: Array of shape (H, W, 3) with the pixels when mode is 'rgb_array', otherwise None
         '''
-        # Set up pygame
-        if self.window is None:
-            image_path = os.path.join(ASSET_DATA_DIRECTORY, 'pencil.png')
-            self._icon = pygame.image.load(image_path).subsurface(0, 0, 16, 16)
-            pygame.display.set_icon(self._icon)
-            pygame.display.set_caption('Pencil Landing Simulator')
+        import pygame
+        from PLSimulator.entities.assets import load_asset
+        from PLSimulator.entities.assets import configure_rotation_cache
 
-            pygame.init()
-            self.window = pygame.display.set_mode((self._window_width, self._window_height))
+        start = time.perf_counter()
+
+        # Set up pygame, drawing to an off-screen surface if no window is wanted
+        if self.window is None:
+            configure_rotation_cache(self._rotation_resolution, int(self._rotation_cache_mb * 1024 * 1024))
+            if mode == 'rgb_array':
+                self.window = pygame.Surface((self._window_width, self._window_height))
+            else:
+                self._icon = load_asset('pencil.png', 16, 128).subsurface(0, 0, 16, 16)
+                pygame.display.set_icon(self._icon)
+                pygame.display.set_caption('Pencil Landing Simulator')
+
+                pygame.init()
+                self.window = pygame.display.set_mode((self._window_width, self._window_height))
             self.clock = pygame.time.Clock()
+            self._build_layer()
+
+            # Start from the whole static layer, which is pushed to the display in full
+            self.window.blit(self._layer, (0, 0))
+            self._dirty_rects = [self.window.get_rect()]
+
+        # Restore the static layer where the pencil was drawn last frame
+        for rect in self._dirty_rects:
+            self.window.blit(self._layer, rect, rect)
+
+        # Draw the pencil, then redraw any static entity in front of it
+        pencil_rects = []
+        for image, position in self.pencil.render(self.pencil.position):
+            pencil_rects.append(self.window.blit(image, position))
+
+        if pencil_rects:
+            area = pencil_rects[0].unionall(pencil_rects[1:])
+            self.window.set_clip(area)
+            for index in area.collidelistall(self._static_rects):
+                self.window.blit(*self._static_images[index])
+            self.window.set_clip(None)
+
+        # Only push the regions that changed to the display
+        if self.window is pygame.display.get_surface():
+            pygame.display.update(self._dirty_rects + pencil_rects)
+        self._dirty_rects = pencil_rects
+
+        # Copy this frame straight from the window pixels
+        frame = None
+        if save_video or mode == 'rgb_array':
+            frame = pygame.surfarray.array3d(self.window).transpose(1, 0, 2)
+
+        # Encode this frame into the video
+        if save_video:
+            if self._video is None:
+                self.start_video()
+            self._video.append(frame)
 
-        # Clear screen
-        self.window.fill(self._window_bg_colour)
+        if self.timer is not None:
+            self.timer.record("render", time.perf_counter() - start)
 
-        # For each entity, render if renderable
-        for entity in self.entities:
-            if entity.isRenderable:
-                images = entity.render(entity.position)
+        return frame
 
-                # Render all images that make up entity
-                for image, position in images:
-                    self.window.blit(image, position)
+    def _build_layer(self) -> None:
+        '''
+            Draw the background and static entities once into a cached layer
 
-        pygame.display.update()
+            Parameters:
+                None
 
-        # Save this frame in list
-        if save_video:
-            frame = io.BytesIO()
-            pygame.image.save(self.window, frame, "PNG")
-            self._window_frames.append(imageio.imread(frame))
+            Returns:
+                None
+        '''
+        # Copy the window so the layer shares its pixel format and blits fast
+        self._layer = self.window.copy()
+        self._layer.fill(self._window_bg_colour)
 
-    def save_video(self, dir: str = '', fps: int = 30):
+        self._static_images = []
+        for entity in self.entities[1:]:
+            if entity.isRenderable:
+                for image, position in entity.render(entity.position):
+                    self._layer.blit(image, position)
+                    self._static_images.append((image, position))
+        self._static_rects = [position for _, position in self._static_images]
+
+    def start_video(self, dir: str = '', fps: int = 30, format: str = 'gif') -> None:
         '''
-            Save the window frames collection as a gif
+            Open a video file that rendered frames are encoded into as they arrive
 
             Parameters:
-                dir: The directory to store the gif in
-                fps: Frames per second for the gif
+                dir: The directory to store the video in
+                fps: Frames per second for the video
+                format: Format of the video ('gif' or 'mp4')
 
             Returns:
                 None
         '''
-        imageio.mimsave(os.path.join(dir, "simulation.gif"), self._window_frames, 'GIF', duration=1 / fps)
+        self.save_video()
+        from PLSimulator.environments.video import VideoWriter
+
+        self._video = VideoWriter(os.path.join(dir, f"simulation.{format}"), fps)
+
+    def save_video(self) -> str:
+        '''
+            Finish writing the video file
+
+            Parameters:
+                None
+
+            Returns:
+                path: The path of the video, or None if no video was recorded
+        '''
+        if self._video is None:
+            return None
+
+        self._video.close()
+        path, self._video = self._video.path, None
+        return path
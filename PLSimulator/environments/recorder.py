@@ -0,0 +1,182 @@
+import os
+import json
+import numpy as np
+
+
+# Outcomes are stored as small integer codes
+OUTCOMES = ['none', 'success', 'failed']
+
+# Name, data type and width of every column written for each step
+COLUMNS = {
+    'state': (np.float32, 5),
+    # Box actions are continuous throttle and RCS values, not only flags
+    'action': (np.float32, 3),
+    'reward': (np.float32, None),
+    'outcome': (np.int8, None),
+    'pose': (np.float32, 3),
+}
+
+# The .npy header is written at a fixed size so it can be rewritten in place with the final length
+_HEADER_SIZE = 128
+
+
+def _header(dtype: np.dtype, shape: tuple) -> bytes:
+    description = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': shape})
+    description = description.ljust(_HEADER_SIZE - 10 - 1) + '\n'
+    return b'\x93NUMPY\x01\x00' + np.uint16(len(description)).tobytes() + description.encode('latin1')
+
+
+class TrajectoryRecorder:
+    '''
+        TrajectoryRecorder
+
+        This writes every step of an episode into one .npy file per column,
+        buffering the rows in memory and flushing them to disk in chunks.
+    '''
+
+    def __init__(self, dir: str, env: str, config: dict, chunk_size: int = 256) -> None:
+        '''
+            Create the recording directory
+
+            Parameters:
+                dir: The directory to store the episodes in
+                env: Name of the environment config in ENV_CONFIG
+                config: The parameters the environment was initialised with, stored with each episode for replays
+                chunk_size: Number of steps buffered before they are written to disk
+
+            Returns:
+                None
+        '''
+        os.makedirs(dir, exist_ok=True)
+
+        self.dir = dir
+        self.env = env
+        self.config = config
+        self.episodes = len([d for d in os.listdir(dir) if d.startswith('episode_')])
+        self._chunk_size = chunk_size
+        self._buffers = {
+            name: np.zeros((chunk_size,) if width is None else (chunk_size, width), dtype=dtype)
+            for name, (dtype, width) in COLUMNS.items()
+        }
+        self._files = None
+        self._path = None
+        self._buffered = 0
+        self._length = 0
+
+    def start_episode(self) -> str:
+        '''
+            Open the column files of a new episode
+
+            Parameters:
+                None
+
+            Returns:
+                path: The directory of the episode
+        '''
+        if self._files is not None:
+            self.end_episode()
+
+        path = os.path.join(self.dir, f'episode_{self.episodes:05d}')
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'config.json'), 'w') as f:
+            json.dump({'env': self.env, 'config': self.config}, f)
+
+        self._files = {}
+        for name, buffer in self._buffers.items():
+            self._files[name] = open(os.path.join(path, f'{name}.npy'), 'wb')
+            self._files[name].write(_header(buffer.dtype, (0,) + buffer.shape[1:]))
+
+        self._path = path
+        self._buffered = 0
+        self._length = 0
+        self.episodes += 1
+        return path
+
+    def record(self, state: list, action: list, reward: float, info: dict, pose: tuple) -> None:
+        '''
+            Add a step to the current episode
+
+            Parameters:
+                state: State returned by the environment
+                action: Action taken by the agent
+                reward: Reward returned by the environment
+                info: Info returned by the environment
+                pose: Position and angle of the pencil after the step as (x, y, angle)
+
+            Returns:
+                None
+        '''
+        if self._files is None:
+            self.start_episode()
+
+        i = self._buffered
+        self._buffers['state'][i] = state
+        self._buffers['action'][i] = action
+        self._buffers['reward'][i] = reward
+        self._buffers['outcome'][i] = OUTCOMES.index(info['outcome'])
+        self._buffers['pose'][i] = pose
+
+        self._buffered += 1
+        if self._buffered == self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        '''
+            Write the buffered steps to disk
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        if self._files is None or self._buffered == 0:
+            return
+
+        for name, buffer in self._buffers.items():
+            self._files[name].write(buffer[:self._buffered].tobytes())
+
+        self._length += self._buffered
+        self._buffered = 0
+
+    def end_episode(self) -> str:
+        '''
+            Flush the remaining steps and record the final length in each file header
+
+            Parameters:
+                None
+
+            Returns:
+                path: The directory of the finished episode, or None if no episode was open
+        '''
+        if self._files is None:
+            return None
+
+        self.flush()
+        for name, f in self._files.items():
+            buffer = self._buffers[name]
+            f.seek(0)
+            f.write(_header(buffer.dtype, (self._length,) + buffer.shape[1:]))
+            f.close()
+
+        self._files = None
+        return self._path
+
+
+def load_episode(path: str) -> dict:
+    '''
+        Open the columns of a recorded episode without reading them into memory
+
+        Parameters:
+            path: The directory of the episode
+
+        Returns:
+            episode: Memory-mapped array for each column, with the environment name under 'env'
+                     and the parameters of the environment under 'config'
+    '''
+    episode = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in COLUMNS}
+
+    with open(os.path.join(path, 'config.json')) as f:
+        episode.update(json.load(f))
+
+    return episode
@@ -0,0 +1,381 @@
+import numpy as np
+from gym.spaces import Box
+from ray.rllib.env.vector_env import VectorEnv
+from ray.rllib.env.env_context import EnvContext
+
+from PLSimulator import physics
+from PLSimulator.entities.pencil import Pencil
+from PLSimulator.entities.static import Ground
+from PLSimulator.entities.static import LandingPad
+from PLSimulator.entities.static import build_obstacles
+from PLSimulator.entities.collision import obb_corners
+from PLSimulator.entities.collision import obb_corners_batch
+from PLSimulator.entities.collision import obb_intersects_batch
+from PLSimulator.environments.environment import make_rng
+from PLSimulator.environments.actions import action_space, decode_actions
+
+
+class VectorEnvironment(VectorEnv):
+    '''
+        VectorEnvironment
+
+        This is a batched version of the pencil landing simulation.
+        It holds many pencils as arrays and steps them all at once with NumPy,
+        following the same physics and rewards as the Environment class.
+    '''
+
+    def __init__(self, config: EnvContext, num_envs: int = 64) -> None:
+        '''
+            Initialise the vector environment
+
+            Parameters:
+                config: The parameters used to initialise the environment
+                num_envs: Number of pencils to simulate at once
+
+            Returns:
+                None
+        '''
+        # Set up reference entities for their geometry
+        pencil, ground, pad = Pencil(), Ground(), LandingPad()
+        self._dry_mass = pencil.dry_mass
+        self._pencil_half_size = pencil._half_size
+        self._leg_half_size = pencil.entities[3]._half_size
+        self._leg_offsets = np.array([pencil.entities[3].position, pencil.entities[4].position], dtype=np.float64)
+        self._ground_box = np.array(obb_corners(ground.position, ground._half_size, ground.angle))
+        self._pad_box = np.array(obb_corners(pad.position, pad._half_size, pad.angle))
+        self._pad_position = np.array(pad.position, dtype=np.float64)
+        obstacles = build_obstacles(
+            config["physics"]["entities"],
+            config["window"]["width"],
+            config["window"]["height"]
+        )
+        self._obstacle_boxes = np.array([obb_corners(o.position, o._half_size, o.angle) for o in obstacles])
+        self._obstacle_boxes = self._obstacle_boxes.reshape(-1, 4, 2)
+        self._obstacle_bounds = np.array([o.bounds() for o in obstacles]).reshape(-1, 4)
+        self._surface = min(self._ground_box[:, 1].min(), self._pad_box[:, 1].min())
+        self._reach = max(
+            np.hypot(*self._pencil_half_size),
+            max(np.hypot(*offset) for offset in self._leg_offsets) + np.hypot(*self._leg_half_size)
+        )
+
+        # Set up forces
+        self._rotation_scale = 0.1
+        self._force_scale = 0.35
+        self._gravity = config["physics"]["gravity"]
+        self._density = config["physics"]["density"]
+        self._land_ang = config["physics"]["land_ang"]
+        self._land_vel = config["physics"]["land_vel"]
+        self._dt = config["physics"].get("dt", 1.0)
+        self._substeps = config["physics"].get("substeps", 1)
+        self._integrator = config["physics"].get("integrator", "split")
+        if self._integrator not in physics.INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{self._integrator}', choose from {list(physics.INTEGRATORS)}.")
+
+        # Set up starting conditions
+        self._min_fuel = config["agent"]["min_fuel"]
+        self._max_fuel = config["agent"]["max_fuel"]
+        self._min_pos = config["agent"]["min_pos"]
+        self._max_pos = config["agent"]["max_pos"]
+        self._min_ang = config["agent"]["min_ang"]
+        self._max_ang = config["agent"]["max_ang"]
+        self._min_vel = config["agent"]["min_vel"]
+        self._max_vel = config["agent"]["max_vel"]
+        self._window_width = config["window"]["width"]
+        self._window_height = config["window"]["height"]
+        self._rng = make_rng(config)
+        self._action_mode = config["agent"].get("action_mode", "box")
+
+        # Set up pencils as arrays
+        self.position = np.zeros((num_envs, 2))
+        self.velocity = np.zeros((num_envs, 2))
+        self.acceleration = np.zeros((num_envs, 2))
+        self.angle = np.zeros(num_envs)
+        self.fuel = np.zeros(num_envs)
+        self.mass = np.zeros(num_envs)
+        self.total_reward = np.zeros(num_envs)
+        self._dones = np.zeros(num_envs, dtype=bool)
+
+        super().__init__(
+            Box(
+                np.array([-1, -1, -1, -1, -1], dtype=np.float32),
+                np.array([1, 1, 1, 1, 1], dtype=np.float32),
+                dtype=np.float32
+            ),
+            action_space(self._action_mode),
+            num_envs
+        )
+
+    def reset_members(self, mask: np.ndarray) -> None:
+        '''
+            Reset the selected pencils to starting conditions
+
+            Parameters:
+                mask: Boolean array selecting the pencils to reset
+
+            Returns:
+                None
+        '''
+        n = int(np.count_nonzero(mask))
+        if n == 0:
+            return
+
+        self.position[mask] = self._rng.uniform(
+            np.multiply(self._min_pos, self._window_width),
+            np.multiply(self._max_pos, self._window_width),
+            (n, 2)
+        )
+        self.velocity[mask] = self._rng.uniform(
+            np.multiply(self._min_vel, self._window_width),
+            np.multiply(self._max_vel, self._window_width),
+            (n, 2)
+        )
+        self.acceleration[mask] = 0
+        self.angle[mask] = self._rng.uniform(self._min_ang, self._max_ang, n)
+        self.fuel[mask] = self._rng.uniform(self._min_fuel, self._max_fuel, n)
+        self.mass[mask] = self._dry_mass + self.fuel[mask]
+        self.total_reward[mask] = 0
+        self._dones[mask] = False
+
+    def vector_reset(self, seed: int = None) -> list:
+        '''
+            Reset every pencil to starting conditions
+
+            Parameters:
+                seed: Seed for this and every following reset, otherwise the sequence continues
+
+            Returns:
+                states: Starting state of each pencil
+        '''
+        if seed is not None:
+            self._rng = make_rng(None, seed)
+
+        self.reset_members(np.ones(self.num_envs, dtype=bool))
+        return list(self.states())
+
+    def reset_at(self, index: int = None) -> np.ndarray:
+        '''
+            Reset a single pencil to starting conditions
+
+            Parameters:
+                index: Index of the pencil to reset
+
+            Returns:
+                state: Starting state of the pencil
+        '''
+        index = 0 if index is None else index
+        mask = np.zeros(self.num_envs, dtype=bool)
+        mask[index] = True
+        self.reset_members(mask)
+        return self.states()[index]
+
+    def states(self) -> np.ndarray:
+        '''
+            Get the current state of every pencil
+
+            Parameters:
+                None
+
+            Returns:
+                states: Array of shape (N, 5) with information about each pencil relative to the pad
+        '''
+        states = np.empty((self.num_envs, 5))
+        states[:, 0] = (self._pad_position[0] - self.position[:, 0]) / self._window_width
+        states[:, 1] = (self._pad_position[1] - self.position[:, 1]) / self._window_height
+        states[:, 2:4] = -self.velocity
+        states[:, 4] = -self.angle / 45
+        return np.clip(np.round(states, 1), -1, 1).astype(np.float32)
+
+    def vector_step(self, actions: list) -> tuple:
+        '''
+            Step every pencil given an action each, resetting any that finished on the last step
+
+            Parameters:
+                actions: The action made by the agent for each pencil, in the space of the action mode
+
+            Returns:
+                states: Next state of each pencil
+                rewards: Value to reward the agent for each pencil
+                dones: Whether each pencil is done
+                infos: Any extra information about each pencil
+        '''
+        self.reset_members(self._dones)
+        actions = decode_actions(self._action_mode, actions)
+
+        outcomes, legs = self.step_collisions()
+        self.step_physics(actions)
+        rewards = self.step_rewards(outcomes)
+        self.total_reward += rewards
+        self._dones = outcomes != 0
+        states = self.states()
+
+        # Convert arrays to lists once rather than indexing them per pencil
+        names = np.array(["none", "success", "failed"])[outcomes].tolist()
+        values = np.round(states, 1).astype(np.float64).tolist()
+        fuel = np.round(self.fuel, 1).tolist()
+        legs = legs.tolist()
+        applied = actions.tolist()
+        infos = [
+            {
+                "outcome": names[i],
+                "pos": (values[i][0], values[i][1]),
+                "vel": (values[i][2], values[i][3]),
+                "ang": values[i][4],
+                "fuel": fuel[i],
+                "legs": legs[i],
+                "action": applied[i],
+                "ticks": 1,
+            }
+            for i in range(self.num_envs)
+        ]
+
+        return list(states), list(rewards), list(self._dones), infos
+
+    def step_collisions(self) -> tuple:
+        '''
+            Detect crashes and landings for every pencil
+
+            Parameters:
+                None
+
+            Returns:
+                outcomes: Array with 0 for none, 1 for success and 2 for failed
+                legs: Array with the number of legs touching the landing pad
+        '''
+        failed = np.zeros(self.num_envs, dtype=bool)
+        on_pad = np.zeros(self.num_envs, dtype=int)
+
+        # Only pencils that can reach the ground or landing pad need exact tests
+        near = np.flatnonzero(self.position[:, 1] + self._reach >= self._surface)
+        if len(near) > 0:
+            body, *legs = self.pencil_boxes(near)
+
+            # Detect if pencil is touching ground or landing pad
+            touching = obb_intersects_batch(body, self._ground_box) | obb_intersects_batch(body, self._pad_box)
+            for leg in legs:
+                touching |= obb_intersects_batch(leg, self._ground_box)
+            failed[near] = touching
+
+            # Detect if both legs are touching the landing pad
+            on_pad[near] = sum(obb_intersects_batch(leg, self._pad_box).astype(int) for leg in legs)
+
+        # Only pairs of pencils and obstacles whose bounds overlap need exact tests
+        if len(self._obstacle_boxes) > 0:
+            x, y, bounds = self.position[:, 0:1], self.position[:, 1:2], self._obstacle_bounds
+            overlap = (x + self._reach >= bounds[:, 0]) & (x - self._reach <= bounds[:, 2]) & \
+                (y + self._reach >= bounds[:, 1]) & (y - self._reach <= bounds[:, 3])
+            rows, cols = np.nonzero(overlap)
+
+            # Detect if any part of the pencil is touching an obstacle
+            if len(rows) > 0:
+                touching = np.zeros(len(rows), dtype=bool)
+                for part in self.pencil_boxes(rows):
+                    touching |= obb_intersects_batch(part, self._obstacle_boxes[cols])
+                failed[rows[touching]] = True
+
+        # Check the pencil velocity and angle are within bounds when both legs are on pad
+        speed = np.hypot(self.velocity[:, 0], self.velocity[:, 1])
+        landed = ~failed & (on_pad == 2)
+        success = landed & (speed < self._land_vel) & (np.abs(self.angle) < self._land_ang)
+        failed |= landed & ~success
+
+        # Check if pencil is within bounds of screen
+        failed |= (self.position[:, 0] < 0) | (self.position[:, 0] > self._window_width) | (self.position[:, 1] < 0)
+        success &= ~failed
+
+        return np.where(failed, 2, np.where(success, 1, 0)), on_pad
+
+    def pencil_boxes(self, index: np.ndarray) -> list:
+        '''
+            Calculate the oriented bounding boxes of the selected pencils and their legs
+
+            Parameters:
+                index: Indices of the pencils to use
+
+            Returns:
+                boxes: Corner arrays for the pencil body and then each leg
+        '''
+        position, angle = self.position[index], self.angle[index]
+        c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+
+        boxes = [obb_corners_batch(position, self._pencil_half_size, angle)]
+        for offset in self._leg_offsets:
+            centers = position + np.stack([offset[0] * c + offset[1] * s, -offset[0] * s + offset[1] * c], axis=-1)
+            boxes.append(obb_corners_batch(centers, self._leg_half_size, angle))
+
+        return boxes
+
+    def step_physics(self, actions: np.ndarray) -> None:
+        '''
+            Move every pencil under the forces of its thrust, gravity and drag
+
+            Parameters:
+                actions: Array of shape (N, 3) with the action for each pencil, the engine is turned off in place
+                         for pencils without fuel
+
+            Returns:
+                None
+        '''
+        # Check if agent has enough fuel to fire engine
+        firing = actions[:, 0] > 0
+        fired = firing & (self.fuel > 0)
+        self.fuel[fired] -= 0.1 * self._dt
+        self.mass[fired] = self._dry_mass + self.fuel[fired]
+        throttle = np.where(firing & ~fired, 0, actions[:, 0])
+        actions[:, 0] = throttle
+
+        # Convert agent actions into a new heading
+        left = -actions[:, 1] * 12 * self._rotation_scale * self._dt
+        right = actions[:, 2] * 12 * self._rotation_scale * self._dt
+        heading = self.angle + left + right
+
+        # Move pencils under the forces of their thrust, gravity and drag
+        x, y, vx, vy, ax, ay = physics.step(
+            self.position[:, 0], self.position[:, 1],
+            self.velocity[:, 0], self.velocity[:, 1],
+            self.mass, throttle, heading,
+            self._gravity, self._density, self._force_scale,
+            self._dt, self._substeps, self._integrator
+        )
+        self.position[:, 0], self.position[:, 1] = x, y
+        self.velocity[:, 0], self.velocity[:, 1] = vx, vy
+        self.acceleration[:, 0], self.acceleration[:, 1] = ax, ay
+        self.angle = heading
+
+    def step_rewards(self, outcomes: np.ndarray) -> np.ndarray:
+        '''
+            Calculate the reward for every pencil
+
+            Parameters:
+                outcomes: Array with 0 for none, 1 for success and 2 for failed
+
+            Returns:
+                rewards: Array with the reward for each pencil
+        '''
+        # Calculate distance/velocity/acceleration of pencil relative to landing pad
+        distance = (self._pad_position - self.position) / np.hypot(*self._pad_position)
+        velocity = -self.velocity
+        acceleration = -self.acceleration
+        distance_magnitude = np.hypot(distance[:, 0], distance[:, 1])
+
+        # Determine if pencil is moving/slowing towards landing pad
+        sign_distance = np.sign(distance)
+        moving = (sign_distance[:, 0] != np.sign(velocity[:, 0])) & (sign_distance[:, 0] != np.sign(velocity[:, 1]))
+        slowing = ~(
+            (sign_distance[:, 0] != np.sign(acceleration[:, 0])) & (sign_distance[:, 1] != np.sign(acceleration[:, 1]))
+        )
+
+        # Reward if pencil is not firing engine far from landing pad, if pencil is moving and slowing towards
+        # landing pad, and otherwise negatively reward pencil
+        coasting = (np.hypot(acceleration[:, 0], acceleration[:, 1]) <= 0) & (distance_magnitude > 0.5)
+        approaching = moving & slowing | \
+            (distance_magnitude < 0.5) & (np.hypot(velocity[:, 0], velocity[:, 1]) <= self._land_vel)
+        rewards = np.where(
+            coasting,
+            2,
+            np.where(approaching, 8 * (0.5 - distance_magnitude) * np.cos(np.radians(self.angle)), -8)
+        )
+
+        # Reward agent for successful landing vs crash landing
+        rewards = rewards + np.where(outcomes == 1, 100 + self.fuel * 10, 0) - np.where(outcomes == 2, 100, 0)
+
+        return np.round(rewards, 1)
@@ -0,0 +1,85 @@
+import os
+import numpy as np
+from PIL import Image
+from PIL import GifImagePlugin
+
+
+class VideoWriter:
+    '''
+        VideoWriter
+
+        This encodes frames into a GIF or MP4 file as they arrive,
+        so memory use does not grow with the length of the video.
+    '''
+
+    def __init__(self, path: str, fps: int = 30) -> None:
+        '''
+            Open the video file for writing
+
+            Parameters:
+                path: File to write, the extension chooses the format ('.gif' or '.mp4')
+                fps: Frames per second of the video
+
+            Returns:
+                None
+        '''
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.gif':
+            self._file = open(path, 'wb')
+            self._writer = None
+        elif extension == '.mp4':
+            # Encoding MP4 requires the optional imageio-ffmpeg package
+            import imageio
+            self._file = None
+            self._writer = imageio.get_writer(path, format='FFMPEG', mode='I', fps=fps, macro_block_size=1)
+        else:
+            raise ValueError(f"Unsupported video format '{extension}', choose from '.gif' or '.mp4'.")
+
+        self.path = path
+        self.frames = 0
+        self._duration = round(1000 / fps)
+
+    def append(self, frame: np.ndarray) -> None:
+        '''
+            Encode a frame and add it to the video
+
+            Parameters:
+                frame: Array of shape (H, W, 3) with the pixels of the frame
+
+            Returns:
+                None
+        '''
+        if self._writer is not None:
+            self._writer.append_data(frame)
+        else:
+            image = Image.fromarray(np.ascontiguousarray(frame)).quantize()
+
+            # Image.save can only write whole files, so frames are encoded with the helpers
+            # Pillow keeps for incremental GIF writers, its version is pinned in environment.yml
+            # Write the file header and loop forever extension before the first frame
+            if self.frames == 0:
+                header, _ = GifImagePlugin.getheader(image)
+                self._file.write(b''.join(header))
+                self._file.write(b'!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00')
+
+            # Each frame carries its own palette
+            for data in GifImagePlugin.getdata(image, duration=self._duration, include_color_table=True):
+                self._file.write(data)
+
+        self.frames += 1
+
+    def close(self) -> None:
+        '''
+            Finish writing the video file
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            self._file.write(b';')
+            self._file.close()
@@ -0,0 +1,67 @@
+import gym
+
+from PLSimulator.environments.environment import Environment
+
+
+class ActionRepeat(gym.Wrapper):
+    '''
+        ActionRepeat
+
+        This wrapper applies each action of the agent for several physics ticks,
+        so an episode needs that many times fewer decisions from the policy.
+    '''
+
+    def __init__(self, env: Environment, repeat: int = 1) -> None:
+        '''
+            Wrap the environment
+
+            Parameters:
+                env: The environment to step
+                repeat: Number of ticks to apply each action for
+
+            Returns:
+                None
+        '''
+        if repeat < 1:
+            raise ValueError(f"Actions must be repeated at least once, not {repeat} times.")
+
+        super().__init__(env)
+        self.repeat = repeat
+
+    def step(self, action: list) -> tuple:
+        '''
+            Step the environment with the same action until it has been repeated or the episode ends
+
+            Parameters:
+                action: The action made by the agent during these ticks
+
+            Returns:
+                state: State of the environment after the last tick
+                reward: Sum of the rewards of every tick
+                done: Whether the environment is done
+                info: Information about the environment after the last tick, with the number of ticks run
+        '''
+        total = 0.0
+        for ticks in range(1, self.repeat + 1):
+            state, reward, done, info = self.env.step(action)
+            total += reward
+            if done:
+                break
+
+        info["ticks"] = ticks
+        return state, round(total, 1), done, info
+
+
+def make_environment(config: dict) -> gym.Env:
+    '''
+        Create the environment described by a config, wrapped to repeat actions if it asks for it
+
+        Parameters:
+            config: The parameters used to initialise the environment
+
+        Returns:
+            environment: The environment to step
+    '''
+    environment = Environment(config)
+    repeat = config["agent"].get("action_repeat", 1)
+    return ActionRepeat(environment, repeat) if repeat > 1 else environment
@@ -0,0 +1,159 @@
+import os
+import json
+import math
+import time
+
+from PLSimulator.environments.recorder import OUTCOMES
+
+
+def _metrics_file(path: str) -> str:
+    return os.path.join(path, 'metrics.jsonl') if os.path.isdir(path) else path
+
+
+def _finite(value: float) -> float:
+    # RLlib reports NaN when no episode ended, which is not valid JSON, so it is stored as null
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def iteration_metrics(result: dict) -> dict:
+    '''
+        Pick the metrics of a training iteration out of an RLlib result
+
+        Parameters:
+            result: Result of a training iteration, as returned by agent.train()
+
+        Returns:
+            metrics: Rewards, episode counts and lengths, throughput and time spent sampling and learning
+    '''
+    steps, seconds = result.get('timesteps_this_iter', 0), result.get('time_this_iter_s', 0.0)
+    episodes = result.get('episodes_this_iter', 0)
+    timers = result.get('timers', {})
+    custom = result.get('custom_metrics', {})
+
+    return {
+        'iteration': result.get('training_iteration'),
+        'time': time.time(),
+        'reward_min': _finite(result.get('episode_reward_min')),
+        'reward_mean': _finite(result.get('episode_reward_mean')),
+        'reward_max': _finite(result.get('episode_reward_max')),
+        'episodes': episodes,
+        'episode_length': _finite(result.get('episode_len_mean')),
+        # Outcomes are reported as the fraction of the iteration's episodes that ended that way
+        'outcomes': {o: round(custom.get(f'{o}_mean', 0.0) * episodes) for o in OUTCOMES},
+        'steps': steps,
+        'steps_total': result.get('timesteps_total'),
+        'seconds': seconds,
+        'steps_per_sec': steps / seconds if seconds > 0 else 0.0,
+        'sample_ms': timers.get('sample_time_ms', 0.0),
+        'learn_ms': timers.get('learn_time_ms', 0.0),
+    }
+
+
+class MetricsLog:
+    '''
+        MetricsLog
+
+        This appends the metrics of each training iteration to a JSON lines file as soon as it arrives,
+        so the history of a run survives the run crashing.
+    '''
+
+    def __init__(self, path: str) -> None:
+        '''
+            Open the file for appending, keeping the iterations already in it
+
+            Parameters:
+                path: The JSON lines file to append to
+
+            Returns:
+                None
+        '''
+        self.path = path
+        self._file = open(path, 'a')
+
+    def write(self, metrics: dict) -> None:
+        '''
+            Append the metrics of an iteration
+
+            Parameters:
+                metrics: Metrics of the iteration, as returned by iteration_metrics
+
+            Returns:
+                None
+        '''
+        self._file.write(json.dumps(metrics) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_metrics(path: str) -> list:
+    '''
+        Read the metrics of every iteration of a run
+
+        Parameters:
+            path: The JSON lines file, or the run directory containing metrics.jsonl
+
+        Returns:
+            metrics: Metrics of each iteration in the order they were written
+    '''
+    with open(_metrics_file(path)) as f:
+        # A run that crashed mid write can leave the last line incomplete
+        lines = [line for line in f.read().split('\n') if line.endswith('}')]
+    return [json.loads(line) for line in lines]
+
+
+def plot_metrics(path: str) -> str:
+    '''
+        Render graphs of the rewards, outcomes, episode lengths and throughput of a run
+
+        Parameters:
+            path: The JSON lines file, or the run directory containing metrics.jsonl
+
+        Returns:
+            path: The image written next to the metrics
+    '''
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    metrics = read_metrics(path)
+    x = list(range(1, len(metrics) + 1))
+
+    figure, axes = plt.subplots(2, 2, figsize=(10, 7), constrained_layout=True)
+
+    for key in ['reward_min', 'reward_mean', 'reward_max']:
+        axes[0][0].plot(x, [m[key] for m in metrics], label=key[7:])
+    axes[0][0].set_title("Rewards per iteration")
+    axes[0][0].set_ylabel('reward')
+
+    for outcome in OUTCOMES:
+        axes[0][1].plot(x, [m['outcomes'][outcome] for m in metrics], label=outcome)
+    axes[0][1].set_title("Episode outcomes per iteration")
+    axes[0][1].set_ylabel('episodes')
+
+    axes[1][0].plot(x, [m['episode_length'] for m in metrics])
+    axes[1][0].set_title("Mean episode length")
+    axes[1][0].set_ylabel('steps')
+
+    axes[1][1].stackplot(
+        x,
+        [m['sample_ms'] for m in metrics],
+        [m['learn_ms'] for m in metrics],
+        labels=['sample', 'learn']
+    )
+    rate = axes[1][1].twinx()
+    rate.plot(x, [m['steps_per_sec'] for m in metrics], color='black', label='steps/sec')
+    rate.set_ylabel('steps/sec')
+    axes[1][1].set_title("Time per iteration")
+    axes[1][1].set_ylabel('ms')
+
+    for axis in [axes[0][0], axes[0][1], axes[1][1]]:
+        axis.legend(loc='upper left')
+    for axis in axes[1]:
+        axis.set_xlabel('iteration')
+
+    image = os.path.join(os.path.dirname(os.path.abspath(_metrics_file(path))), 'metrics.png')
+    figure.savefig(image)
+    plt.close(figure)
+    return image
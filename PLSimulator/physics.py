@@ -0,0 +1,204 @@
+import math
+import numpy as np
+
+
+def _sin(degrees):
+    # Use math for plain floats as it avoids allocating NumPy scalars
+    if isinstance(degrees, np.ndarray):
+        return np.sin(np.radians(degrees))
+    return math.sin(math.radians(degrees))
+
+
+def _cos(degrees):
+    # Use math for plain floats as it avoids allocating NumPy scalars
+    if isinstance(degrees, np.ndarray):
+        return np.cos(np.radians(degrees))
+    return math.cos(math.radians(degrees))
+
+
+def gravity_force(gravity: float, force_scale: float) -> tuple:
+    '''
+        Calculate the force of gravity
+
+        Parameters:
+            gravity: Gravitational strength of the environment
+            force_scale: Scale applied to every force
+
+        Returns:
+            force: Horizontal and vertical components of the force
+    '''
+    return 0.0, force_scale * gravity
+
+
+def drag_force(vx, vy, heading, density: float, force_scale: float) -> tuple:
+    '''
+        Calculate the force of drag using: Fd = 0.5 * Cd * A * p * V^2
+
+        The drag coefficient depends on the heading and the area is taken to be 1.
+
+        Parameters:
+            vx: Horizontal velocity
+            vy: Vertical velocity
+            heading: Heading of the body in degrees
+            density: Density of the atmosphere
+            force_scale: Scale applied to every force
+
+        Returns:
+            force: Horizontal and vertical components of the force, opposing the velocity
+    '''
+    cd = 0.5 * _sin(heading) + 0.5
+    k = force_scale * 0.5 * cd * 1 * density
+    return -k * vx * abs(vx), -k * vy * abs(vy)
+
+
+def thrust_force(throttle, heading, force_scale: float) -> tuple:
+    '''
+        Calculate the force of the engine along the heading
+
+        Parameters:
+            throttle: Amount the engine is firing
+            heading: Heading of the body in degrees
+            force_scale: Scale applied to every force
+
+        Returns:
+            force: Horizontal and vertical components of the force
+    '''
+    thrust = -throttle * 12 * force_scale
+    return thrust * _sin(heading), thrust * _cos(heading)
+
+
+def acceleration(vx, vy, mass, throttle, heading, gravity: float, density: float, force_scale: float) -> tuple:
+    '''
+        Calculate the acceleration of a body under gravity, drag and its own thrust
+
+        Parameters:
+            vx: Horizontal velocity
+            vy: Vertical velocity
+            mass: Mass of the body
+            throttle: Amount the engine is firing
+            heading: Heading of the body in degrees
+            gravity: Gravitational strength of the environment
+            density: Density of the atmosphere
+            force_scale: Scale applied to every force
+
+        Returns:
+            acceleration: Horizontal and vertical components of the acceleration
+    '''
+    gx, gy = gravity_force(gravity, force_scale)
+    dx, dy = drag_force(vx, vy, heading, density, force_scale)
+    tx, ty = thrust_force(throttle, heading, force_scale)
+    return (gx + dx + tx) / mass, (gy + dy + ty) / mass
+
+
+def integrate(x, y, vx, vy, fx, fy, mass, dt: float = 1.0) -> tuple:
+    '''
+        Move a body under a constant force using semi-implicit Euler
+
+        Parameters:
+            x: Horizontal position
+            y: Vertical position
+            vx: Horizontal velocity
+            vy: Vertical velocity
+            fx: Horizontal force
+            fy: Vertical force
+            mass: Mass of the body
+            dt: Length of the time step
+
+        Returns:
+            state: New position, velocity and acceleration as (x, y, vx, vy, ax, ay)
+    '''
+    # Calculate acceleration: A = F/M
+    ax, ay = fx / mass, fy / mass
+
+    # Update velocity and then position
+    vx, vy = vx + ax * dt, vy + ay * dt
+    return x + vx * dt, y + vy * dt, vx, vy, ax, ay
+
+
+def _split(x, y, vx, vy, dt, mass, throttle, heading, gravity, density, force_scale):
+    # Move under external forces and then under internal forces, the original update of the simulator
+    gx, gy = gravity_force(gravity, force_scale)
+    dx, dy = drag_force(vx, vy, heading, density, force_scale)
+    x, y, vx, vy, _, _ = integrate(x, y, vx, vy, gx + dx, gy + dy, mass, dt)
+
+    tx, ty = thrust_force(throttle, heading, force_scale)
+    x, y, vx, vy, _, _ = integrate(x, y, vx, vy, tx, ty, mass, dt)
+    return x, y, vx, vy
+
+
+def _euler(x, y, vx, vy, dt, *forces):
+    # Semi-implicit Euler: update velocity first and move with the new velocity
+    ax, ay = acceleration(vx, vy, *forces)
+    vx, vy = vx + ax * dt, vy + ay * dt
+    return x + vx * dt, y + vy * dt, vx, vy
+
+
+def _verlet(x, y, vx, vy, dt, *forces):
+    # Velocity Verlet, re-evaluating the velocity dependent drag at the predicted velocity
+    ax, ay = acceleration(vx, vy, *forces)
+    x, y = x + vx * dt + 0.5 * ax * dt * dt, y + vy * dt + 0.5 * ay * dt * dt
+    bx, by = acceleration(vx + ax * dt, vy + ay * dt, *forces)
+    return x, y, vx + 0.5 * (ax + bx) * dt, vy + 0.5 * (ay + by) * dt
+
+
+def _rk4(x, y, vx, vy, dt, *forces):
+    # Classic fourth order Runge-Kutta over position and velocity
+    k1x, k1y = acceleration(vx, vy, *forces)
+    v2x, v2y = vx + 0.5 * dt * k1x, vy + 0.5 * dt * k1y
+    k2x, k2y = acceleration(v2x, v2y, *forces)
+    v3x, v3y = vx + 0.5 * dt * k2x, vy + 0.5 * dt * k2y
+    k3x, k3y = acceleration(v3x, v3y, *forces)
+    v4x, v4y = vx + dt * k3x, vy + dt * k3y
+    k4x, k4y = acceleration(v4x, v4y, *forces)
+
+    x = x + dt / 6 * (vx + 2 * v2x + 2 * v3x + v4x)
+    y = y + dt / 6 * (vy + 2 * v2y + 2 * v3y + v4y)
+    vx = vx + dt / 6 * (k1x + 2 * k2x + 2 * k3x + k4x)
+    vy = vy + dt / 6 * (k1y + 2 * k2y + 2 * k3y + k4y)
+    return x, y, vx, vy
+
+
+INTEGRATORS = {
+    'split': _split,
+    'euler': _euler,
+    'verlet': _verlet,
+    'rk4': _rk4,
+}
+
+
+def step(
+        x, y, vx, vy, mass, throttle, heading,
+        gravity: float, density: float, force_scale: float,
+        dt: float = 1.0, substeps: int = 1, integrator: str = 'split') -> tuple:
+    '''
+        Move a body under the forces of gravity, drag and its own thrust
+
+        Every state argument may be a float or a NumPy array of the same shape.
+        The mass, throttle and heading are held constant over the step.
+
+        Parameters:
+            x: Horizontal position
+            y: Vertical position
+            vx: Horizontal velocity
+            vy: Vertical velocity
+            mass: Mass of the body
+            throttle: Amount the engine is firing
+            heading: Heading of the body in degrees
+            gravity: Gravitational strength of the environment
+            density: Density of the atmosphere
+            force_scale: Scale applied to every force
+            dt: Length of the step
+            substeps: Number of integration steps to split the step into
+            integrator: Name of the integrator in INTEGRATORS
+
+        Returns:
+            state: New position, velocity and thrust acceleration as (x, y, vx, vy, ax, ay)
+    '''
+    method = INTEGRATORS[integrator]
+    h = dt / substeps
+    for _ in range(substeps):
+        x, y, vx, vy = method(x, y, vx, vy, h, mass, throttle, heading, gravity, density, force_scale)
+
+    # Report the thrust acceleration, used to tell whether the engine is firing
+    tx, ty = thrust_force(throttle, heading, force_scale)
+    return x, y, vx, vy, tx / mass, ty / mass
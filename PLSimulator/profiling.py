@@ -0,0 +1,85 @@
+import numpy as np
+
+
+# Bucket i of a histogram counts durations in [2^(i-1), 2^i) microseconds, the last bucket everything longer
+BUCKETS = 32
+
+
+class PhaseTimer:
+    '''
+        PhaseTimer
+
+        This collects a histogram of the durations of each named phase,
+        using power of two buckets so recording a duration is a few integer operations.
+    '''
+
+    def __init__(self) -> None:
+        '''
+            Initialise the timer with no phases
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        self.histograms = {}
+        self.totals = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        '''
+            Add the duration of a phase to its histogram
+
+            Parameters:
+                phase: Name of the phase
+                seconds: Duration of the phase
+
+            Returns:
+                None
+        '''
+        if phase not in self.histograms:
+            self.histograms[phase] = np.zeros(BUCKETS, dtype=np.int64)
+            self.totals[phase] = 0.0
+
+        self.histograms[phase][min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+        self.totals[phase] += seconds
+
+    def summary(self) -> dict:
+        '''
+            Summarise the duration of each phase
+
+            Parameters:
+                None
+
+            Returns:
+                summary: Count, total seconds, share of the total time, mean and upper bound of the
+                         median and 99th percentile bucket in microseconds for each phase
+        '''
+        total = sum(self.totals.values()) or 1.0
+
+        summary = {}
+        for phase, histogram in self.histograms.items():
+            count = int(histogram.sum())
+            cumulative = np.cumsum(histogram)
+            summary[phase] = {
+                'count': count,
+                'seconds': self.totals[phase],
+                'share': self.totals[phase] / total,
+                'mean_us': self.totals[phase] / count * 1e6,
+                'p50_us': 2 ** int(np.searchsorted(cumulative, 0.5 * count)),
+                'p99_us': 2 ** int(np.searchsorted(cumulative, 0.99 * count)),
+            }
+        return summary
+
+    def reset(self) -> None:
+        '''
+            Forget every recorded duration
+
+            Parameters:
+                None
+
+            Returns:
+                None
+        '''
+        self.histograms.clear()
+        self.totals.clear()
@@ -1,5 +1,7 @@
 import os
 import mock
+import pytest
+import shutil
 import tempfile
 
 from PLSimulator.agents.agent import Agent
@@ -15,28 +17,38 @@ def test_init():
         assert "b" in os.listdir(os.path.join(tmp_dir, "a"))
 
 
-def test_clear():
+def test_step_batch():
     with tempfile.TemporaryDirectory() as tmp_dir:
         with mock.patch('PLSimulator.agents.agent.MODEL_DATA_DIRECTORY', tmp_dir):
             x = Agent("a", "b")
 
-        open(os.path.join(x._model_dir, "f"), "w")
-        assert "f" in os.listdir(x._model_dir)
-        x.clear()
-        assert "f" not in os.listdir(x._model_dir)
+        with mock.patch.object(x, 'step', side_effect=lambda state: [state[0], 0, 0]):
+            assert x.step_batch([[1], [0], [1]]) == [[1, 0, 0], [0, 0, 0], [1, 0, 0]]
 
 
-def test_graph():
+def test_checkpoints():
     with tempfile.TemporaryDirectory() as tmp_dir:
         with mock.patch('PLSimulator.agents.agent.MODEL_DATA_DIRECTORY', tmp_dir):
             x = Agent("a", "b")
 
-        episode_data = [
-            {'min': 0, 'mean': 1, 'max': 2},
-            {'min': 0, 'mean': 1, 'max': 2},
-            {'min': 0, 'mean': 1, 'max': 2},
-            {'min': 0, 'mean': 1, 'max': 2},
-            {'min': 0, 'mean': 1, 'max': 2}
-        ]
-        x.graph(episode_data)
-        assert "rewards_per_episode.png" in os.listdir(x._model_dir)
+        assert x.new_run() == os.path.join(x._model_dir, "run_001")
+        assert x.new_run() == os.path.join(x._model_dir, "run_002")
+
+        for run, number in [("run_001", 1), ("run_001", 2), ("run_002", 1)]:
+            path = os.path.join(x._model_dir, run, f"checkpoint_{number:06d}")
+            os.makedirs(path)
+            open(os.path.join(path, f"checkpoint-{number}"), "w")
+
+        # A checkpoint that is still being written is skipped
+        os.makedirs(os.path.join(x._model_dir, "run_002", "checkpoint_000002"))
+
+        assert len(x.checkpoints()) == 3
+        assert x.find_checkpoint('last') == os.path.join(x._model_dir, "run_002", "checkpoint_000001")
+        assert x.find_checkpoint(2) == os.path.join(x._model_dir, "run_001", "checkpoint_000002")
+        with pytest.raises(FileNotFoundError):
+            x.find_checkpoint(3)
+
+        # Runs pruned from the middle are not numbered again
+        shutil.rmtree(os.path.join(x._model_dir, "run_002"))
+        os.makedirs(os.path.join(x._model_dir, "run_003"))
+        assert x.new_run() == os.path.join(x._model_dir, "run_004")
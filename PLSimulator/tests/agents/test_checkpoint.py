@@ -0,0 +1,28 @@
+import time
+import pytest
+
+from PLSimulator.agents.checkpoint import CheckpointWriter
+
+
+def test_writer():
+    written = []
+
+    def write(n):
+        time.sleep(0.01)
+        written.append(n)
+
+    x = CheckpointWriter()
+    for n in range(3):
+        x.submit(write, n)
+    x.wait()
+    assert written == [0, 1, 2]
+
+
+def test_writer_error():
+    def fail():
+        raise OSError("disk full")
+
+    x = CheckpointWriter()
+    x.submit(fail)
+    with pytest.raises(OSError):
+        x.wait()
@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+from PLSimulator.agents.manifest import Manifest
+
+
+def test_best():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x = Manifest(os.path.join(tmp_dir, "manifest.json"))
+        assert x.best() is None and x.last() is None
+
+        for run, number, reward in [("run_001", 1, -10), ("run_001", 2, 5), ("run_002", 1, 0)]:
+            x.add(os.path.join(tmp_dir, run, f"checkpoint_{number:06d}"), number, {'reward_mean': reward})
+
+        # Without scores the training reward decides
+        assert x.best() == os.path.join(tmp_dir, "run_001", "checkpoint_000002")
+        assert x.last() == os.path.join(tmp_dir, "run_002", "checkpoint_000001")
+
+        scores = {'success_rate': 0.5, 'reward_mean': 1, 'episodes': 100}
+        assert x.score(os.path.join(tmp_dir, "run_001", "checkpoint_000001"), scores, 0, 100)
+        assert not x.score(os.path.join(tmp_dir, "run_003", "checkpoint_000001"), scores, 0, 100)
+        assert x.best() == os.path.join(tmp_dir, "run_001", "checkpoint_000001")
+        assert len(x.unscored(0, 100)) == 2
+
+        x.save()
+        assert Manifest(x.path).entries == x.entries
+
+
+def test_best_compares_matching_scores():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x = Manifest(os.path.join(tmp_dir, "manifest.json"))
+        checkpoints = [os.path.join(tmp_dir, "run_001", f"checkpoint_{n:06d}") for n in range(1, 4)]
+        for n, checkpoint in enumerate(checkpoints, 1):
+            x.add(checkpoint, n)
+
+        # A perfect score on a few easy episodes does not compete with scores on the usual episodes
+        x.score(checkpoints[0], {'success_rate': 1.0, 'reward_mean': 9, 'episodes': 5}, 7, 5)
+        x.score(checkpoints[1], {'success_rate': 0.5, 'reward_mean': 1, 'episodes': 100}, 0, 100)
+        x.score(checkpoints[2], {'success_rate': 0.2, 'reward_mean': 1, 'episodes': 100}, 0, 100)
+
+        assert x.best() == checkpoints[1]
+        assert x.best(0, 100) == checkpoints[1]
+        assert x.best(7, 5) == checkpoints[0]
+        assert x.unscored(0, 100) == [checkpoints[0]]
+        assert x.unscored(7, 5) == checkpoints[1:]
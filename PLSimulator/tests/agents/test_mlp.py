@@ -0,0 +1,64 @@
+import os
+import mock
+import tempfile
+import numpy as np
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.agents.mlp import NumpyAgent, export_policy, policy_layers
+
+
+def weights(rng, framework):
+    sizes = [5, 8, 8, 6]
+    names = ['fc_1', 'fc_2', 'fc_out'] if framework == 'tf' else ['_hidden_layers.0', '_hidden_layers.1', '_logits']
+    result = {}
+    for name, n_in, n_out in zip(names, sizes, sizes[1:]):
+        shape = (n_in, n_out) if framework == 'tf' else (n_out, n_in)
+        result[f'{name}/kernel' if framework == 'tf' else f'{name}.weight'] = rng.normal(size=shape)
+        result[f'{name}/bias' if framework == 'tf' else f'{name}.bias'] = rng.normal(size=n_out)
+
+    # The value branch is not part of the policy
+    result['value_out/kernel' if framework == 'tf' else '_value_branch.weight'] = rng.normal(size=(8, 1))
+    return result
+
+
+def test_policy_layers():
+    rng = np.random.default_rng(0)
+    tf, torch = weights(rng, 'tf'), weights(rng, 'torch')
+
+    assert [w.shape for w, _ in policy_layers(tf)] == [(5, 8), (8, 8), (8, 6)]
+    assert [w.shape for w, _ in policy_layers(torch)] == [(5, 8), (8, 8), (8, 6)]
+    assert np.allclose(policy_layers(torch)[0][0], torch['_hidden_layers.0.weight'].T)
+
+
+def test_numpy_agent_forward_pass():
+    rng = np.random.default_rng(1)
+    layers = policy_layers(weights(rng, 'tf'))
+    states = rng.uniform(-1, 1, size=(4, 5))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = export_policy(os.path.join(tmp_dir, 'policy.npz'), layers, [0, 0, 0], [1, 1, 1])
+        with mock.patch('PLSimulator.agents.agent.MODEL_DATA_DIRECTORY', tmp_dir):
+            x = NumpyAgent(ENV_CONFIG['earth'])
+        x.load(path)
+
+    hidden = np.tanh(np.tanh(states @ layers[0][0] + layers[0][1]) @ layers[1][0] + layers[1][1])
+    mean = (hidden @ layers[2][0] + layers[2][1])[:, :3]
+    expected = (np.clip(mean, -1, 1) + 1) * 0.5
+
+    assert np.allclose(x.step_batch(list(states)), expected, atol=1e-5)
+    assert np.allclose(x.step(states[0]), expected[0], atol=1e-5)
+    assert x.fingerprint() is not None
+
+
+def test_numpy_agent_discrete():
+    rng = np.random.default_rng(2)
+    layers = [(rng.normal(size=(5, 8)).astype(np.float32), np.zeros(8, dtype=np.float32))]
+    states = rng.uniform(-1, 1, size=(4, 5))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = export_policy(os.path.join(tmp_dir, 'policy.npz'), layers, [0, 0, 0], [1, 1, 1], action_mode='discrete')
+        with mock.patch('PLSimulator.agents.agent.MODEL_DATA_DIRECTORY', tmp_dir):
+            x = NumpyAgent(ENV_CONFIG['earth'])
+        x.load(path)
+
+    assert x.step_batch(list(states)) == list(np.argmax(states @ layers[0][0], axis=1))
@@ -0,0 +1,26 @@
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.agents.results import ResultCache, fingerprint
+
+
+def test_fingerprint_tracks_contents(tmp_path):
+    (tmp_path / 'checkpoint').mkdir()
+    (tmp_path / 'checkpoint' / 'weights').write_bytes(b'abc')
+    a = fingerprint(str(tmp_path / 'checkpoint'))
+
+    assert fingerprint(str(tmp_path / 'checkpoint')) == a
+    (tmp_path / 'checkpoint' / 'weights').write_bytes(b'abd')
+    assert fingerprint(str(tmp_path / 'checkpoint')) != a
+
+
+def test_result_cache_round_trip(tmp_path):
+    path = str(tmp_path / 'results.json')
+    x = ResultCache(path)
+    x.put('a', ENV_CONFIG['earth'], 1, {'reward': 10.0})
+    x.save()
+
+    y = ResultCache(path)
+    assert y.get('a', ENV_CONFIG['earth'], 1) == {'reward': 10.0}
+    assert y.get('a', ENV_CONFIG['earth'], 2) is None
+    assert y.get('a', ENV_CONFIG['moon'], 1) is None
+    assert y.get('b', ENV_CONFIG['earth'], 1) is None
+    assert (y.hits, y.misses) == (1, 3)
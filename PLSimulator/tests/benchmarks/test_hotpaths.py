@@ -0,0 +1,24 @@
+import json
+
+from PLSimulator.benchmarks import hotpaths
+
+
+def test_run_measures_every_hot_path():
+    results = hotpaths.run(['moon'], seconds=0.01)
+
+    assert set(results['moon']) == {'step', 'step_collisions', 'polygon', 'collides_with', 'reset', 'state', 'render'}
+    assert all(r['rate'] > 0 and r['bytes'] >= 0 for r in results['moon'].values())
+
+
+def test_regressions_use_threshold():
+    baseline = {'earth': {'step': {'rate': 100.0, 'bytes': 0}, 'state': {'rate': 100.0, 'bytes': 0}}}
+    results = {'earth': {'step': {'rate': 80.0, 'bytes': 0}, 'state': {'rate': 70.0, 'bytes': 0}, 'reset': {'rate': 1}}}
+
+    assert hotpaths.regressions(results, baseline, 0.25) == [('earth', 'state', 70.0, 100.0)]
+
+
+def test_baseline_covers_every_config():
+    with open(hotpaths.BASELINE_FILE) as f:
+        baseline = json.load(f)
+
+    assert set(baseline) == {'earth', 'moon', 'mars'}
@@ -0,0 +1,68 @@
+import mock
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.entities import assets
+from PLSimulator.entities.pencil import RCS
+from PLSimulator.environments.environment import Environment
+
+
+def test_load_asset_is_shared():
+    assets.clear_assets()
+
+    x = RCS(flip_x=True)
+    y = RCS(flip_x=True)
+    z = RCS(flip_x=False)
+
+    assert x.image is y.image
+    assert x.image is not z.image
+    assert x.image.get_size() == (16, 16)
+    assert len(assets._ASSET_CACHE) == 2
+
+
+def test_headless_environment_loads_no_images():
+    assets.clear_assets()
+
+    with mock.patch('pygame.image.load') as load:
+        x = Environment(ENV_CONFIG['earth'])
+        x.reset()
+        for _ in range(10):
+            x.step([1, 0, 1])
+
+    load.assert_not_called()
+    assert len(assets._ASSET_CACHE) == 0
+
+
+def test_rotate_asset_quantizes_and_evicts():
+    assets.clear_assets()
+    assets.configure_rotation_cache(resolution=1.2, max_bytes=32 * 1024 * 1024)
+    key = ('pencil.png', 16, 128, False, False)
+
+    x = assets.rotate_asset(key, 2.4)
+    assert assets.rotate_asset(key, 2.4000001) is x
+    assert assets.rotate_asset(key, 3.6) is not x
+    assert assets.rotation_cache_stats()['hits'] == 1
+    assert assets.rotation_cache_stats()['misses'] == 2
+
+    # A cap smaller than two images keeps only the most recent one
+    assets.configure_rotation_cache(max_bytes=assets.rotation_cache_stats()['bytes'] // 2)
+    assets.rotate_asset(key, 4.8)
+    stats = assets.rotation_cache_stats()
+    assert stats['images'] == 1
+    assert stats['evictions'] == 2
+    assert assets.rotate_asset(key, 2.4) is not x
+
+    assets.clear_assets()
+    assets.configure_rotation_cache(max_bytes=32 * 1024 * 1024)
+
+
+def test_render_reuses_rotated_images():
+    assets.clear_assets()
+
+    x = Environment(ENV_CONFIG['earth'])
+    x.reset()
+    x.render('rgb_array')
+    misses = assets.rotation_cache_stats()['misses']
+    x.render('rgb_array')
+
+    assert assets.rotation_cache_stats()['misses'] == misses
+    assert assets.rotation_cache_stats()['hits'] > 0
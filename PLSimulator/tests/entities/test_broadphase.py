@@ -0,0 +1,14 @@
+from PLSimulator.entities.broadphase import UniformGrid
+
+
+def test_query():
+    x = UniformGrid(10)
+    x.insert("a", (0, 0, 5, 5))
+    x.insert("b", (15, 15, 35, 18))
+    x.insert("c", (-20, -20, -11, -11))
+
+    assert x.query((1, 1, 2, 2)) == ["a"]
+    assert x.query((8, 8, 21, 12)) == ["a", "b"]
+    assert x.query((31, 12, 32, 13)) == ["b"]
+    assert x.query((50, 50, 60, 60)) == []
+    assert x.query((-15, -15, 1, 1)) == ["a", "c"]
@@ -0,0 +1,59 @@
+import pytest
+
+from PLSimulator.entities.collision import obb_corners
+from PLSimulator.entities.collision import obb_intersects
+from PLSimulator.entities.pencil import Pencil
+from PLSimulator.entities.static import Ground
+from PLSimulator.entities.static import LandingPad
+from PLSimulator.entities.static import build_obstacles
+
+
+@pytest.mark.parametrize("this, other, expected", [
+    (((0, 0), (1, 1), 0), ((1.5, 0), (1, 1), 0), True),
+    (((0, 0), (1, 1), 0), ((2, 0), (1, 1), 0), True),
+    (((0, 0), (1, 1), 0), ((2.1, 0), (1, 1), 0), False),
+    (((0, 0), (1, 1), 45), ((2.3, 0), (1, 1), 0), True),
+    (((0, 0), (1, 1), 45), ((2.3, 2.3), (1, 1), 45), False),
+])
+def test_obb_intersects(this, other, expected):
+    assert obb_intersects(obb_corners(*this), obb_corners(*other)) == expected
+
+
+@pytest.mark.parametrize("position", [
+    (320, 700),
+    (320, 798),
+    (320, 799),
+    (320, 815),
+    (180, 815),
+    (40, 815),
+])
+def test_collides_with_matches_shapely(position):
+    pencil, ground, pad = Pencil(), Ground(), LandingPad()
+    pencil.position = list(position)
+
+    for entity in [ground, pad]:
+        obb = set(pencil.collides_with(entity, 'obb'))
+        shapely = set(pencil.collides_with(entity, 'shapely'))
+        assert obb == shapely
+
+
+@pytest.mark.parametrize("angles, offset, expected_obb, expected_aabb", [
+    # Squares of half size 12 turned 45 degrees, offset along their diagonal, separate once the offset
+    # passes 24 / sqrt(2) but their axis-aligned bounds only once it passes 24 * sqrt(2)
+    ((45, 45), 15, True, True),
+    ((45, 45), 25, False, True),
+    ((45, 45), 35, False, False),
+    # An upright square and one turned 45 degrees separate along the diagonal once the offset passes
+    # (12 + 12 * sqrt(2)) / sqrt(2), while their bounds overlap up to 12 + 12 * sqrt(2)
+    ((0, 45), 20, True, True),
+    ((0, 45), 22, False, True),
+])
+def test_collides_with_rotated(angles, offset, expected_obb, expected_aabb):
+    this, other = build_obstacles([
+        {'type': 'debris', 'size': (24, 24), 'position': (500, 500), 'angle': angles[0]},
+        {'type': 'debris', 'size': (24, 24), 'position': (500 + offset, 500 + offset), 'angle': angles[1]},
+    ], 1, 1)
+
+    # The shapely backend tests the axis-aligned bounds of each rotated entity
+    assert bool(this.collides_with(other, 'obb')) == expected_obb
+    assert bool(this.collides_with(other, 'shapely')) == expected_aabb
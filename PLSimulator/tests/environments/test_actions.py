@@ -0,0 +1,48 @@
+import pytest
+import itertools
+import numpy as np
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.environment import Environment
+from PLSimulator.environments.vector import VectorEnvironment
+from PLSimulator.environments.actions import ACTION_MODES, decode_action, decode_actions, encode_action
+
+
+@pytest.mark.parametrize("mode", ACTION_MODES)
+def test_encode_decode(mode):
+    for flags in itertools.product([0, 1], repeat=3):
+        action = encode_action(mode, list(flags))
+        assert decode_action(mode, action) == list(flags)
+        assert decode_actions(mode, [action]).tolist() == [list(flags)]
+
+
+@pytest.mark.parametrize("mode", ["multibinary", "discrete"])
+def test_action_modes_match_box(mode):
+    config = dict(ENV_CONFIG['earth'], agent=dict(ENV_CONFIG['earth']['agent'], action_mode=mode))
+    x, y = Environment(ENV_CONFIG['earth']), Environment(config)
+    x.reset(seed=4)
+    y.reset(seed=4)
+    assert y.action_space.contains(encode_action(mode, [1, 0, 1]))
+
+    for i in range(60):
+        flags = [1, int(i % 3 == 0), int(i % 5 == 0)]
+        a = x.step(list(flags))
+        b = y.step(encode_action(mode, flags))
+        assert np.array_equal(a[0], b[0]) and a[1:3] == b[1:3]
+        assert b[3]["action"] == a[3]["action"]
+        if a[2]:
+            break
+
+
+def test_vector_discrete_actions():
+    config = dict(ENV_CONFIG['moon'], agent=dict(ENV_CONFIG['moon']['agent'], action_mode='discrete'))
+    x = VectorEnvironment(config, num_envs=8)
+    x.vector_reset(seed=1)
+    y = VectorEnvironment(ENV_CONFIG['moon'], num_envs=8)
+    y.vector_reset(seed=1)
+
+    actions = list(range(8))
+    states, rewards, _, _ = x.vector_step(actions)
+    expected_states, expected_rewards, _, _ = y.vector_step([decode_action('discrete', a) for a in actions])
+    assert np.array_equal(np.array(states), np.array(expected_states))
+    assert np.array_equal(rewards, expected_rewards)
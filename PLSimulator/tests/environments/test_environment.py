@@ -1,5 +1,9 @@
+import random
 import pytest
+import tracemalloc
+import numpy as np
 
+from PLSimulator.constants import ENV_CONFIG
 from PLSimulator.entities.pencil import Pencil
 from PLSimulator.entities.static import Ground
 from PLSimulator.entities.static import LandingPad
@@ -41,3 +45,166 @@ def test_init(config):
     assert isinstance(x.pencil, Pencil)
     assert isinstance(x.ground, Ground)
     assert isinstance(x.pad, LandingPad)
+
+
+OBSTACLES = [
+    {'type': 'tower', 'size': (32, 400), 'position': (0.25, 0.78)},
+    {'type': 'debris', 'size': (24, 24), 'position': (0.5, 0.3), 'angle': 30},
+]
+
+
+def test_obstacle_collision():
+    config = dict(ENV_CONFIG['earth'])
+    config['physics'] = dict(config['physics'], entities=OBSTACLES)
+    x = Environment(config)
+    x.reset()
+
+    assert len(x.obstacles) == 2
+    assert x.step([0, 0, 0])[3]["outcome"] == "none"
+
+    x.pencil.position = [320.0, 270.0]
+    assert x.step([0, 0, 0])[3]["outcome"] == "failed"
+
+
+def test_broadphase_matches_brute_force():
+    outcomes = []
+    for broadphase in ["grid", "none"]:
+        config = dict(ENV_CONFIG['earth'])
+        config['physics'] = dict(config['physics'], entities=OBSTACLES, broadphase=broadphase)
+        x = Environment(config)
+        x.reset()
+
+        random.seed(0)
+        outcomes.append([])
+        for _ in range(500):
+            x.pencil.position = [random.uniform(0, 640), random.uniform(0, 900)]
+            x.pencil.angle = random.uniform(-30, 30)
+            outcomes[-1].append(x.step([0, 0, 0])[3]["outcome"])
+
+    assert outcomes[0] == outcomes[1]
+    assert "failed" in outcomes[0]
+
+
+def test_render_rgb_array():
+    x = Environment(ENV_CONFIG['earth'])
+    x.reset()
+    x.step([1, 0, 0])
+    frame = x.render(mode='rgb_array')
+
+    assert frame.shape == (900, 640, 3)
+    assert tuple(frame[0, 0]) == ENV_CONFIG['earth']['window']['colour']
+    assert x.render(mode='rgb_array') is not frame
+
+
+def test_render_dirty_rects_match_full_redraw():
+    config = dict(ENV_CONFIG['earth'])
+    config['physics'] = dict(config['physics'], entities=OBSTACLES)
+
+    x = Environment(config)
+    x.reset()
+    x.render(mode='rgb_array')
+    for i in range(30):
+        x.step([1, i % 2, 0])
+        x.render(mode='rgb_array')
+
+    # Move the pencil onto the pad, which is drawn in front of it
+    x.pencil.position = [x.pad.position[0], x.pad.position[1] - 64]
+    frame = x.render(mode='rgb_array')
+
+    # A fresh window draws everything, so it must agree with the incrementally updated one
+    y = Environment(config)
+    y.pencil = x.pencil
+    y.entities[0] = x.pencil
+
+    assert np.array_equal(frame, y.render(mode='rgb_array'))
+
+
+def test_seeded_reset_is_deterministic():
+    runs = []
+    for _ in range(2):
+        x = Environment(ENV_CONFIG['mars'])
+        trajectory = [x.reset(seed=7).tobytes()]
+        for i in range(50):
+            state, reward, done, info = x.step([1, i % 3 == 0, i % 5 == 0])
+            trajectory.append((state.tobytes(), reward, done, info))
+        trajectory.append(x.reset().tobytes())
+        runs.append(trajectory)
+
+    assert runs[0] == runs[1]
+    assert not np.array_equal(Environment(ENV_CONFIG['mars']).reset(seed=8), runs[0][0])
+
+
+def test_config_seed_differs_per_worker():
+    config = dict(ENV_CONFIG['earth'])
+    config['agent'] = dict(config['agent'], seed=3, min_pos=(0.1, 0.1), max_pos=(0.9, 0.2))
+
+    x, y = Environment(config), Environment(config)
+    assert np.array_equal(x.reset(), y.reset())
+
+    class Context(dict):
+        worker_index = 1
+        vector_index = 0
+
+    z = Environment(Context(config))
+    assert not np.array_equal(Environment(config).reset(), z.reset())
+
+
+def test_step_state_is_after_physics():
+    x = Environment(ENV_CONFIG['earth'])
+    x.reset(seed=3)
+
+    state, _, _, info = x.step([1, 0, 0])
+    assert np.array_equal(state, x.state())
+    assert info["pos"] == tuple(state[0:2]) and info["vel"] == tuple(state[2:4])
+    assert info["ang"] == state[4]
+
+    # The returned state and info are not changed by later steps
+    before, pos = state.copy(), info["pos"]
+    _, _, _, later = x.step([1, 0, 0])
+    assert np.array_equal(state, before)
+    assert later is not info and info["pos"] is pos
+
+
+def test_step_does_not_share_the_action():
+    config = dict(ENV_CONFIG['earth'], agent=dict(ENV_CONFIG['earth']['agent'], min_fuel=0, max_fuel=0))
+    x = Environment(config)
+    x.reset(seed=0)
+
+    # Without fuel the engine is turned off in the applied action, not in the caller's
+    action = np.array([0.8, 0.0, 0.3])
+    _, _, _, info = x.step(action)
+    assert np.array_equal(action, [0.8, 0.0, 0.3])
+    assert info["action"] == [0.0, 0.0, 0.3]
+
+    action[2] = 1.0
+    assert info["action"][2] == 0.3
+
+
+def allocated(function, calls: int = 100) -> float:
+    # Mean peak bytes allocated by each call
+    for _ in range(10):
+        function()
+
+    # Clearing the traces also resets the peak, which works on Python 3.6 unlike reset_peak
+    tracemalloc.start()
+    total = 0
+    for _ in range(calls):
+        tracemalloc.clear_traces()
+        function()
+        total += tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return total / calls
+
+
+def test_step_allocations():
+    x = Environment(ENV_CONFIG['earth'])
+    x.reset(seed=0)
+
+    def step():
+        _, _, done, _ = x.step([1, 0, 0])
+        if done:
+            x.reset()
+
+    # The observation is computed in place, only collision tests allocate in a step
+    assert allocated(x.observe) < 16
+    assert allocated(step) < 1024
@@ -0,0 +1,54 @@
+import numpy as np
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.environment import Environment
+from PLSimulator.environments.recorder import TrajectoryRecorder, load_episode
+
+
+def test_recorder_round_trip(tmp_path):
+    agent = dict(ENV_CONFIG['earth']['agent'], action_mode='discrete', action_repeat=2)
+    config = dict(ENV_CONFIG['earth'], agent=agent)
+    x = Environment(config)
+    recorder = TrajectoryRecorder(str(tmp_path), 'earth', config, chunk_size=16)
+
+    steps = []
+    for _ in range(2):
+        x.reset()
+        recorder.start_episode()
+        done = False
+        while not done:
+            state, reward, done, info = x.step(5)
+            recorder.record(state, info['action'], reward, info, x.pencil.position + [x.pencil.angle])
+        steps.append((state, reward, info["outcome"], x.pencil.position + [x.pencil.angle]))
+        path = recorder.end_episode()
+
+    episode = load_episode(path)
+    state, reward, outcome, pose = steps[-1]
+
+    assert episode['env'] == 'earth'
+    assert episode['config']['agent']['action_mode'] == 'discrete'
+    assert episode['config']['agent']['action_repeat'] == 2
+    assert episode['config']['physics'] == config['physics']
+    assert isinstance(episode['state'], np.memmap)
+    assert len(episode['state']) == len(episode['action']) == len(episode['pose']) > 16
+    assert np.allclose(episode['state'][-1], state)
+    assert np.isclose(episode['reward'][-1], reward)
+    assert episode['outcome'][-1] == ['none', 'success', 'failed'].index(outcome)
+    assert np.allclose(episode['pose'][-1], pose, atol=1e-3)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['episode_00000', 'episode_00001']
+    assert (tmp_path / 'episode_00001' / 'config.json').exists()
+
+
+def test_recorder_keeps_fractional_actions(tmp_path):
+    x = Environment(ENV_CONFIG['earth'])
+    recorder = TrajectoryRecorder(str(tmp_path), 'earth', ENV_CONFIG['earth'], chunk_size=4)
+
+    x.reset(seed=0)
+    recorder.start_episode()
+    actions = [[0.73, 0.25, 0.0], [0.5, 0.0, 0.9], [1.0, 0.1, 0.6]]
+    for action in actions:
+        state, reward, _, info = x.step(action)
+        recorder.record(state, info['action'], reward, info, x.pencil.position + [x.pencil.angle])
+    episode = load_episode(recorder.end_episode())
+
+    assert np.allclose(episode['action'], actions)
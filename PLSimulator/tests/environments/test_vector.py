@@ -0,0 +1,96 @@
+import ray
+import random
+import pytest
+import numpy as np
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.environment import Environment
+from PLSimulator.environments.vector import VectorEnvironment
+
+
+@pytest.mark.parametrize("env, entities", [
+    ("earth", []),
+    ("moon", []),
+    ("mars", []),
+    ("earth", [
+        {'type': 'tower', 'size': (32, 400), 'position': (0.45, 0.78)},
+        {'type': 'debris', 'size': (24, 24), 'position': (0.55, 0.5), 'angle': 30},
+    ]),
+])
+def test_vector_step_matches_environment(env, entities):
+    n, steps = 8, 400
+    random.seed(0)
+    actions = [[[random.randint(0, 1) for _ in range(3)] for _ in range(n)] for _ in range(steps)]
+    config = dict(ENV_CONFIG[env])
+    config['physics'] = dict(config['physics'], entities=entities)
+
+    x = VectorEnvironment(config, num_envs=n)
+    x.vector_reset()
+    y = [Environment(config) for _ in range(n)]
+    for e in y:
+        e.reset()
+
+    finished = np.zeros(n, dtype=bool)
+    for action in actions:
+        states, rewards, dones, infos = x.vector_step(action)
+
+        for i, e in enumerate(y):
+            if finished[i]:
+                continue
+
+            state, reward, done, info = e.step(list(action[i]))
+            assert np.allclose(states[i], state, atol=0.11)
+            assert np.isclose(rewards[i], reward, atol=0.11)
+            assert np.allclose(x.position[i], e.pencil.position)
+            assert np.allclose(x.velocity[i], e.pencil.velocity)
+            assert np.isclose(x.angle[i], e.pencil.angle)
+            assert np.isclose(x.fuel[i], e.pencil.fuel_mass)
+            assert dones[i] == done
+            assert infos[i]["outcome"] == info["outcome"]
+            assert np.allclose(infos[i]["action"], info["action"])
+            finished[i] = done
+
+    assert finished.any()
+
+
+def test_vector_step_resets_finished_members():
+    x = VectorEnvironment(ENV_CONFIG["earth"], num_envs=4)
+    x.vector_reset()
+
+    dones = [False]
+    while not any(dones):
+        _, _, dones, _ = x.vector_step([[0, 0, 0]] * 4)
+
+    x.vector_step([[0, 0, 0]] * 4)
+    assert np.all(x.position[:, 1] < 100)
+
+
+def test_seeded_reset_matches_environment():
+    x = Environment(ENV_CONFIG['moon'])
+    x.reset(seed=11)
+
+    y = VectorEnvironment(ENV_CONFIG['moon'], num_envs=1)
+    y.vector_reset(seed=11)
+
+    assert y.position[0].tolist() == x.pencil.position
+    assert y.velocity[0].tolist() == x.pencil.velocity
+    assert y.angle[0] == x.pencil.angle
+    assert y.fuel[0] == x.pencil.fuel_mass
+
+
+@pytest.mark.skipif(int(ray.__version__.split('.')[0]) >= 2, reason="the environments follow the Ray 1.x env API")
+def test_rllib_accepts_vector_env():
+    from ray.rllib.env import base_env
+
+    config = dict(ENV_CONFIG['earth'], agent=dict(ENV_CONFIG['earth']['agent'], action_mode='discrete'))
+    x = VectorEnvironment(config, num_envs=4)
+
+    # Rollout workers wrap a vector environment as a base env and poll it for observations
+    to_base_env = getattr(base_env, 'convert_to_base_env', None) or base_env.BaseEnv.to_base_env
+    env = to_base_env(x)
+    obs = env.poll()[0]
+    assert len(obs) == 4
+
+    env.send_actions({i: {agent: 1 for agent in obs[i]} for i in obs})
+    obs, rewards = env.poll()[:2]
+    assert len(obs) == 4 and len(rewards) == 4
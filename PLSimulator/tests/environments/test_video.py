@@ -0,0 +1,43 @@
+import os
+import tempfile
+import numpy as np
+import pytest
+from PIL import Image
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.video import VideoWriter
+from PLSimulator.environments.environment import Environment
+
+
+def test_video_writer():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x = VideoWriter(os.path.join(tmp_dir, "a.gif"), fps=10)
+        for i in range(5):
+            x.append(np.full((8, 12, 3), i * 50, dtype=np.uint8))
+        x.close()
+
+        with Image.open(x.path) as image:
+            assert image.n_frames == 5
+            assert image.size == (12, 8)
+
+    with pytest.raises(ValueError):
+        VideoWriter("a.avi")
+
+
+def test_render_save_video(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x = Environment(ENV_CONFIG['earth'])
+        x.reset()
+        x.start_video(tmp_dir, 30)
+        for _ in range(3):
+            x.step([1, 0, 0])
+            x.render(save_video=True)
+        path = x.save_video()
+
+        assert path == os.path.join(tmp_dir, "simulation.gif")
+        assert x.save_video() is None
+        with Image.open(path) as image:
+            assert image.n_frames == 3
+            assert image.size == (640, 900)
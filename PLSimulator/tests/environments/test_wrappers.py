@@ -0,0 +1,43 @@
+import pytest
+import numpy as np
+
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.environment import Environment
+from PLSimulator.environments.wrappers import ActionRepeat, make_environment
+
+
+def test_action_repeat_matches_ticks():
+    x = ActionRepeat(Environment(ENV_CONFIG['earth']), 4)
+    y = Environment(ENV_CONFIG['earth'])
+    x.reset(seed=5)
+    y.reset(seed=5)
+
+    state, reward, done, info = x.step([1, 0, 1])
+    rewards = [y.step([1, 0, 1])[1] for _ in range(4)]
+
+    assert info["ticks"] == 4
+    assert reward == round(sum(rewards), 1)
+    assert np.array_equal(state, y.state())
+    assert x.total_reward == y.total_reward
+
+
+def test_action_repeat_stops_early():
+    x = ActionRepeat(Environment(ENV_CONFIG['mars']), 1000)
+    x.reset(seed=0)
+
+    _, _, done, info = x.step([0, 0, 0])
+    assert done
+    assert 1 <= info["ticks"] < 1000
+
+
+def test_make_environment():
+    x = make_environment(ENV_CONFIG['moon'])
+    x.reset(seed=0)
+    assert isinstance(x, Environment)
+    assert x.step([0, 0, 0])[3]["ticks"] == 1
+
+    config = dict(ENV_CONFIG['moon'], agent=dict(ENV_CONFIG['moon']['agent'], action_repeat=3))
+    assert make_environment(config).repeat == 3
+
+    with pytest.raises(ValueError):
+        ActionRepeat(Environment(ENV_CONFIG['moon']), 0)
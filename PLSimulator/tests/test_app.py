@@ -0,0 +1,77 @@
+import os
+import mock
+import tempfile
+import numpy as np
+
+from PLSimulator import app
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.metrics import read_metrics
+from PLSimulator.agents.agent import Agent
+from PLSimulator.agents.mlp import NumpyAgent, export_policy
+from PLSimulator.environments.wrappers import make_environment
+
+
+def test_evaluate_workers_load_the_same_policy():
+    rng = np.random.default_rng(4)
+    config = ENV_CONFIG['earth']
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # A policy.npz next to the chosen file must not be evaluated in its place
+        for name in ['policy.npz', 'chosen.npz']:
+            layers = [(rng.normal(size=(5, 8)).astype(np.float32), np.zeros(8, dtype=np.float32)),
+                      (rng.normal(size=(8, 6)).astype(np.float32), np.zeros(6, dtype=np.float32))]
+            export_policy(os.path.join(tmp_dir, name), layers, [0, 0, 0], [1, 1, 1])
+
+        with mock.patch('PLSimulator.agents.agent.MODEL_DATA_DIRECTORY', tmp_dir):
+            x = NumpyAgent(config)
+        x.load(os.path.join(tmp_dir, 'chosen.npz'))
+        x.explore = False
+
+        seeds = list(range(8))
+        expected, _ = app.run_episodes(x, [make_environment(config) for _ in range(2)], seeds)
+        results = app.evaluate(x, config, len(seeds), workers=2, batch=2)
+
+    expected = {r['seed']: r['reward'] for r in expected}
+    assert [r['reward'] for r in results] == [expected[s] for s in seeds]
+
+
+class Trainer(Agent):
+    def train(self):
+        return {
+            'training_iteration': 1, 'episode_reward_min': -1.0, 'episode_reward_mean': 0.0,
+            'episode_reward_max': 1.0, 'timesteps_this_iter': 100, 'time_this_iter_s': 0.1,
+        }
+
+    def save(self, metrics=None):
+        pass
+
+    def load(self, number):
+        self._checkpoint = self.find_checkpoint(number)
+
+
+def test_resume_without_checkpoints_starts_a_new_run():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with mock.patch('PLSimulator.agents.agent.MODEL_DATA_DIRECTORY', tmp_dir):
+            x = Trainer("a", "b")
+
+        with mock.patch('ray.init'), mock.patch('ray.shutdown'):
+            app.train(x, 2, resume=True)
+
+        assert x._run_dir == os.path.join(x._model_dir, "run_001")
+        assert os.path.exists(os.path.join(x._run_dir, "metrics.jsonl"))
+
+
+def test_train_iterations_without_episodes():
+    class Unfinished(Trainer):
+        def train(self):
+            return dict(super().train(), episode_reward_min=float('nan'), episode_reward_mean=float('nan'),
+                        episode_reward_max=float('nan'))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with mock.patch('PLSimulator.agents.agent.MODEL_DATA_DIRECTORY', tmp_dir):
+            x = Unfinished("a", "b")
+
+        with mock.patch('ray.init'), mock.patch('ray.shutdown'):
+            app.train(x, 2)
+
+        assert [m['reward_mean'] for m in read_metrics(x._run_dir)] == [None, None]
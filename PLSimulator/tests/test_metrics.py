@@ -0,0 +1,64 @@
+import os
+import json
+import tempfile
+import pytest
+
+from PLSimulator.metrics import MetricsLog, iteration_metrics, read_metrics, plot_metrics
+
+
+RESULT = {
+    'training_iteration': 1,
+    'episode_reward_min': -10.0,
+    'episode_reward_mean': 5.0,
+    'episode_reward_max': 20.0,
+    'episodes_this_iter': 10,
+    'episode_len_mean': 120.0,
+    'custom_metrics': {'success_mean': 0.3, 'failed_mean': 0.6, 'none_mean': 0.1},
+    'timesteps_this_iter': 4000,
+    'timesteps_total': 4000,
+    'time_this_iter_s': 2.0,
+    'timers': {'sample_time_ms': 1500.0, 'learn_time_ms': 500.0},
+}
+
+
+def test_iteration_metrics():
+    x = iteration_metrics(RESULT)
+    assert x['outcomes'] == {'none': 1, 'success': 3, 'failed': 6}
+    assert x['steps_per_sec'] == 2000
+    assert x['sample_ms'] == 1500 and x['learn_ms'] == 500
+
+
+def test_metrics_log():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x = MetricsLog(os.path.join(tmp_dir, "metrics.jsonl"))
+        x.write(iteration_metrics(RESULT))
+        x.write(iteration_metrics(dict(RESULT, training_iteration=2)))
+
+        # Lines are on disk before the log is closed, and a crash mid write only loses the last line
+        with open(x.path, 'a') as f:
+            f.write('{"iteration": 3, "rew')
+        assert [m['iteration'] for m in read_metrics(tmp_dir)] == [1, 2]
+        x.close()
+
+        assert plot_metrics(tmp_dir) == os.path.join(tmp_dir, "metrics.png")
+        assert os.path.exists(os.path.join(tmp_dir, "metrics.png"))
+
+
+def test_no_episodes_ended():
+    nan = float('nan')
+    x = iteration_metrics(dict(RESULT, episode_reward_min=nan, episode_reward_mean=nan, episode_reward_max=nan,
+                               episode_len_mean=nan, episodes_this_iter=0))
+    assert x['reward_mean'] is None and x['episode_length'] is None
+
+    # Only standard JSON is written, so other tools can read the log
+    json.loads(json.dumps(x), parse_constant=lambda c: pytest.fail(f"wrote {c}"))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log = MetricsLog(os.path.join(tmp_dir, "metrics.jsonl"))
+        log.write(x)
+        log.write(iteration_metrics(dict(RESULT, training_iteration=2)))
+        log.close()
+
+        assert read_metrics(tmp_dir)[0]['reward_mean'] is None
+        assert plot_metrics(tmp_dir) == os.path.join(tmp_dir, "metrics.png")
+        assert os.path.exists(os.path.join(tmp_dir, "metrics.png"))
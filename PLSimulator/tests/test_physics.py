@@ -0,0 +1,73 @@
+import sys
+import pytest
+import subprocess
+import numpy as np
+
+from PLSimulator import physics
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.environments.environment import Environment
+
+
+def test_drag_force_opposes_velocity():
+    fx, fy = physics.drag_force(2.0, -3.0, 0, 1.0, 1.0)
+
+    assert fx == -0.5 * 0.5 * 4.0
+    assert fy == 0.5 * 0.5 * 9.0
+    assert physics.drag_force(2.0, -3.0, 0, 0.0, 1.0) == (0.0, 0.0)
+
+
+def test_step_floats_match_arrays():
+    x, y = np.array([10.0, 20.0]), np.array([30.0, 40.0])
+    vx, vy = np.array([1.0, -2.0]), np.array([0.5, 3.0])
+    mass, throttle, heading = np.array([50.0, 40.0]), np.array([1.0, 0.0]), np.array([5.0, -10.0])
+
+    batch = physics.step(x, y, vx, vy, mass, throttle, heading, 9.8, 1.0, 0.35)
+    for i in range(2):
+        single = physics.step(x[i], y[i], vx[i], vy[i], mass[i], throttle[i], heading[i], 9.8, 1.0, 0.35)
+        assert np.allclose([b[i] for b in batch], single)
+
+
+@pytest.mark.parametrize("integrator, substeps, tolerance", [
+    ('euler', 100, 5e-2),
+    ('euler', 1000, 5e-3),
+    ('verlet', 10, 1e-3),
+    ('verlet', 100, 1e-5),
+    ('rk4', 1, 1e-4),
+    ('rk4', 10, 1e-8),
+])
+def test_integrators_converge(integrator, substeps, tolerance):
+    forces = (53.0, 1.0, 10.0, 9.8, 1.0, 0.35)
+    reference = physics.step(0.0, 0.0, 1.0, -2.0, *forces, dt=20, substeps=4000, integrator='rk4')
+    result = physics.step(0.0, 0.0, 1.0, -2.0, *forces, dt=20, substeps=substeps, integrator=integrator)
+
+    assert np.allclose(result[:4], reference[:4], rtol=0, atol=tolerance)
+
+
+@pytest.mark.parametrize("env", ["earth", "moon", "mars"])
+def test_environment_trajectories_agree(env):
+    trajectories = []
+    for dt, substeps, integrator in [(1.0, 20, 'rk4'), (0.5, 10, 'verlet'), (0.25, 50, 'euler')]:
+        config = dict(ENV_CONFIG[env])
+        config['physics'] = dict(config['physics'], dt=dt, substeps=substeps, integrator=integrator)
+
+        x = Environment(config)
+        x.reset()
+        for _ in range(int(10 / dt)):
+            x.step([1, 0, 1])
+        trajectories.append(x.pencil.position + x.pencil.velocity + [x.pencil.angle, x.pencil.fuel_mass])
+
+    assert np.allclose(trajectories[0], trajectories[1], atol=0.05)
+    assert np.allclose(trajectories[0], trajectories[2], atol=0.05)
+
+
+def test_environment_step_does_not_import_pygame():
+    code = (
+        "import sys\n"
+        "from PLSimulator.constants import ENV_CONFIG\n"
+        "from PLSimulator.environments.environment import Environment\n"
+        "x = Environment(ENV_CONFIG['earth'])\n"
+        "x.reset()\n"
+        "x.step([1, 0, 1])\n"
+        "assert 'pygame' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True)
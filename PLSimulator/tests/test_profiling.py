@@ -0,0 +1,40 @@
+from PLSimulator.constants import ENV_CONFIG
+from PLSimulator.profiling import PhaseTimer
+from PLSimulator.environments.environment import Environment
+
+
+def test_phase_timer_histogram():
+    x = PhaseTimer()
+    for _ in range(99):
+        x.record('a', 3e-6)
+    x.record('a', 1e-3)
+    x.record('b', 0.5)
+
+    summary = x.summary()
+    assert summary['a']['count'] == 100
+    assert summary['a']['p50_us'] == 4
+    assert summary['a']['p99_us'] == 4
+    assert summary['b']['p50_us'] == 2 ** 19
+    assert summary['b']['share'] > 0.99
+
+    x.reset()
+    assert x.summary() == {}
+
+
+def test_environment_phases_are_off_by_default():
+    x = Environment(ENV_CONFIG['earth'])
+    x.reset()
+
+    assert x.timer is None
+    assert "phases" not in x.step([1, 0, 0])[3]
+
+
+def test_environment_records_phases():
+    config = dict(ENV_CONFIG['earth'], profile={'phases': True, 'info': True})
+    x = Environment(config)
+    x.reset()
+    for _ in range(5):
+        _, _, _, info = x.step([1, 0, 0])
+
+    assert set(info["phases"]) == {"state", "collisions", "physics", "rewards"}
+    assert all(s['count'] == 5 for s in x.timer.summary().values())
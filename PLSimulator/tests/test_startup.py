@@ -0,0 +1,16 @@
+import sys
+import subprocess
+
+from PLSimulator.benchmarks.startup import HEAVY_MODULES
+
+
+def test_app_imports_no_heavy_modules():
+    code = (
+        "import sys\n"
+        "import PLSimulator.__main__\n"
+        "from PLSimulator import app\n"
+        "from PLSimulator.agents.mlp import NumpyAgent\n"
+        f"heavy = [m for m in {HEAVY_MODULES} if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+    )
+    subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True)